@@ -10,7 +10,10 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # numpy is only used by the batch APIs and the report command; leaving it
+    # out keeps the one-file archive small, which is most of the frozen build's
+    # startup time. run_app.py report exits with a usage error when it is missing
+    excludes=['numpy'],
     noarchive=False,
     optimize=0,
 )
@@ -0,0 +1,147 @@
+"""
+Measure window dragging: motion events handled versus window moves issued.
+
+Replays a drag of steady pointer motion at a given event rate on a simulated
+clock, so Tk timers fire as they would between events. It is run once with
+the old handler, which queried the window position and moved the window on
+every event, and once with the coalescing handler. The handler CPU time gives
+the events per second each can keep up with.
+
+Runs headless against the counting tkinter stand-in in benchmarks/fake_tk.py
+by default; pass --real-tk to drive a real Tk (needs a display).
+
+Run from the project root:
+    python -m benchmarks.bench_drag
+    python -m benchmarks.bench_drag --rate 1000 --seconds 5 --real-tk
+"""
+import argparse
+import heapq
+import time
+
+
+class MotionEvent:
+    """The fields of a Tk <B1-Motion> event the drag handlers read."""
+
+    def __init__(self, x_root: int, y_root: int, origin: tuple):
+        self.x_root = x_root
+        self.y_root = y_root
+        self.x = x_root - origin[0]  # Relative to the window, as on the title bar
+        self.y = y_root - origin[1]
+
+
+class SimulatedTimers:
+    """Stands in for root.after/after_cancel on a simulated clock."""
+
+    def __init__(self):
+        self.now_ms = 0.0
+        self.queue = []
+        self.cancelled = set()
+        self.next_id = 0
+
+    def after(self, ms, func, *args):
+        self.next_id += 1
+        heapq.heappush(self.queue, (self.now_ms + ms, self.next_id, func, args))
+        return self.next_id
+
+    def after_cancel(self, timer_id):
+        self.cancelled.add(timer_id)
+
+    def advance(self, now_ms: float):
+        """Run the timers due by now_ms."""
+        while self.queue and self.queue[0][0] <= now_ms:
+            due_ms, timer_id, func, args = heapq.heappop(self.queue)
+            self.now_ms = due_ms
+            if timer_id not in self.cancelled:
+                func(*args)
+        self.now_ms = now_ms
+
+
+def legacy_drag(app, event):
+    """The old handler: two position queries and a move per motion event."""
+    deltax = event.x - app.x
+    deltay = event.y - app.y
+    x = app.root.winfo_x() + deltax
+    y = app.root.winfo_y() + deltay
+    app.root.geometry(f"+{x}+{y}")
+
+
+def replay_drag(app, handler, rate: int, seconds: float, real_tk: bool) -> dict:
+    """
+    Drag the window diagonally with one motion event every 1/rate seconds.
+
+    Returns:
+        dict: events, geometry calls, position queries and handler seconds
+    """
+    timers = SimulatedTimers()
+    app.root.after = timers.after
+    app.root.after_cancel = timers.after_cancel
+    calls = {'geometry': 0, 'winfo': 0}
+
+    def counted(func, kind):
+        def call(*args):
+            calls[kind] += 1
+            return func(*args)
+        return call
+    app.root.geometry = counted(app.root.geometry, 'geometry')
+    app.root.winfo_x = counted(app.root.winfo_x, 'winfo')
+    app.root.winfo_y = counted(app.root.winfo_y, 'winfo')
+
+    origin = (app.root.winfo_x(), app.root.winfo_y())
+    press = MotionEvent(origin[0] + 20, origin[1] + 5, origin)
+    app.start_drag(press)
+    app.x, app.y = press.x, press.y  # What the old start_drag stored
+    calls['winfo'] = 0
+
+    num_events = int(rate * seconds)
+    handler_seconds = 0.0
+    for i in range(num_events):
+        timers.advance(i * 1000 / rate)
+        event = MotionEvent(press.x_root + i // 4, press.y_root + i // 8, origin)
+        started = time.perf_counter()
+        handler(event)
+        handler_seconds += time.perf_counter() - started
+        if real_tk:
+            app.root.update_idletasks()
+    app.end_drag()
+    timers.advance(float('inf'))
+
+    for name in ('after', 'after_cancel', 'geometry', 'winfo_x', 'winfo_y'):
+        vars(app.root).pop(name, None)
+    return {'events': num_events, 'geometry': calls['geometry'], 'winfo': calls['winfo'],
+            'handler_seconds': handler_seconds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rate', type=int, default=500, help='motion events per second')
+    parser.add_argument('--seconds', type=float, default=4.0, help='length of the drag')
+    parser.add_argument('--real-tk', action='store_true', help='use a real Tk instead of the stand-in')
+    args = parser.parse_args()
+
+    if not args.real_tk:
+        from benchmarks import fake_tk
+        fake_tk.install()
+    from src.calendar_widget import WorkWeekCalendarWidget
+
+    app = WorkWeekCalendarWidget()
+    if args.real_tk:
+        app.root.update()
+
+    print(f"{args.seconds:g} s drag at {args.rate} events/s ({'real Tk' if args.real_tk else 'fake Tk'})")
+    print(f"{'handler':<10} | {'events':>7} | {'geometry':>8} | {'queries':>7} | "
+          f"{'moves/s':>7} | {'us/event':>8} | {'events/s handled':>16}")
+    print("-" * 82)
+    for label, handler in (('per-event', lambda event: legacy_drag(app, event)),
+                           ('coalesced', app.drag)):
+        result = replay_drag(app, handler, args.rate, args.seconds, args.real_tk)
+        per_event = result['handler_seconds'] / result['events']
+        print(f"{label:<10} | {result['events']:>7} | {result['geometry']:>8} | "
+              f"{result['winfo']:>7} | {result['geometry'] / args.seconds:>7.0f} | "
+              f"{per_event * 1e6:>8.2f} | {1 / per_event:>16,.0f}")
+
+    if args.real_tk:
+        app.root.destroy()
+
+
+if __name__ == "__main__":
+    main()
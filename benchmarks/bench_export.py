@@ -0,0 +1,34 @@
+"""
+Measure bulk export throughput in rows per second.
+
+Run from the project root:
+    python -m benchmarks.bench_export
+    python -m benchmarks.bench_export --start-year 1900 --years 300
+"""
+import argparse
+import os
+import time
+
+from src.export import export_work_weeks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--start-year', type=int, default=2000)
+    parser.add_argument('--years', type=int, default=100, help='number of years to export')
+    args = parser.parse_args()
+    end_year = args.start_year + args.years - 1
+    
+    print(f"{args.years} years ({args.start_year}-{end_year}) to {os.devnull}")
+    print(f"{'format':<6} | {'per':<4} | {'rows':>8} | {'seconds':>8} | {'rows/s':>10}")
+    print("-" * 50)
+    for fmt, per in (('csv', 'day'), ('csv', 'week'), ('jsonl', 'day'), ('jsonl', 'week'), ('ics', 'week')):
+        with open(os.devnull, 'w', newline='') as out:
+            started = time.perf_counter()
+            num_rows = export_work_weeks(out, fmt, args.start_year, end_year, per)
+            elapsed = time.perf_counter() - started
+        print(f"{fmt:<6} | {per:<4} | {num_rows:>8} | {elapsed:>8.3f} | {num_rows / elapsed:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Measure holiday file loading and lookups.
+
+Writes synthetic .ics files (one all-day event per day or two, with a few
+multi-day shutdowns), then times parsing, month and work week lookups against
+a linear scan of the events, and reloads: unchanged files, one changed file
+out of two, and a fresh load of both.
+
+Run from the project root:
+    python -m benchmarks.bench_holidays
+    python -m benchmarks.bench_holidays --events 100000 --queries 5000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+
+def write_ics(path: str, num_events: int, start_year: int = 2000, seed: int = 0) -> int:
+    """
+    Write a synthetic calendar of num_events events from start_year on.
+
+    Returns:
+        int: The file size in bytes
+    """
+    rng = random.Random(seed)
+    first = date(start_year, 1, 1).toordinal()
+    with open(path, 'w', newline='') as f:
+        f.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//ww_calendar//bench//EN\r\n")
+        for i in range(num_events):
+            start = date.fromordinal(first + i * 2 // 3 + rng.randrange(3))
+            days = 5 + rng.randrange(10) if i % 200 == 0 else 1  # Occasional shutdown weeks
+            end = start + timedelta(days=days)
+            f.write("BEGIN:VEVENT\r\n"
+                    f"UID:bench-{seed}-{i}@ww-calendar\r\n"
+                    f"DTSTART;VALUE=DATE:{start:%Y%m%d}\r\n"
+                    f"DTEND;VALUE=DATE:{end:%Y%m%d}\r\n"
+                    f"SUMMARY:Team event {i}\\, site {i % 7}\r\n"
+                    "END:VEVENT\r\n")
+        f.write("END:VCALENDAR\r\n")
+    return os.path.getsize(path)
+
+
+def best_of(func, repeat: int = 5) -> float:
+    """Best wall time of func() in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--events', type=int, default=50000, help='events per file')
+    parser.add_argument('--queries', type=int, default=2000, help='month and week lookups')
+    args = parser.parse_args()
+
+    from src.holidays import HolidayCalendar, read_ics_file
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, f"team{i}.ics") for i in range(2)]
+        size = sum(write_ics(path, args.events, seed=i) for i, path in enumerate(paths))
+        print(f"2 files x {args.events:,} events ({size / 1e6:.1f} MB)")
+        print(f"{'operation':<28} | {'ms':>10} | {'note':>24}")
+        print("-" * 68)
+
+        seconds = best_of(lambda: read_ics_file(paths[0]), 3)
+        print(f"{'parse one file':<28} | {seconds * 1000:>10.1f} | "
+              f"{args.events / seconds:>14,.0f} events/s")
+
+        calendar = HolidayCalendar(paths)
+        seconds = best_of(lambda: HolidayCalendar(paths).reload(), 3)
+        calendar.reload()
+        print(f"{'load both files':<28} | {seconds * 1000:>10.1f} | {len(calendar.index):>17,} events")
+
+        seconds = best_of(calendar.reload)
+        print(f"{'reload, unchanged':<28} | {seconds * 1000:>10.3f} | {'stat only':>24}")
+
+        def touch_and_reload():
+            os.utime(paths[1], ns=(time.time_ns(), time.time_ns()))
+            calendar.reload()
+        seconds = best_of(touch_and_reload, 3)
+        print(f"{'reload, 1 of 2 changed':<28} | {seconds * 1000:>10.1f} | {'re-parses one file':>24}")
+
+        index = calendar.index
+        events = index.events + index.long_events
+        rng = random.Random(1)
+        last_year = index.events[-1].start_date.year
+        months = [(rng.randrange(2000, last_year + 1), rng.randrange(1, 13)) for _ in range(args.queries)]
+        weeks = [(rng.randrange(2001, last_year + 1), rng.randrange(1, 53)) for _ in range(args.queries)]
+
+        def linear_month(year, month):
+            first = date(year, month, 1).toordinal()
+            last = first + 30
+            return [event for event in events if event.start <= last and event.end >= first]
+
+        for label, func, items in (('month lookup, indexed', index.events_in_month, months),
+                                   ('month lookup, linear scan', linear_month, months[:50]),
+                                   ('work week lookup, indexed', index.events_in_week, weeks)):
+            seconds = best_of(lambda: [func(*item) for item in items], 3)
+            print(f"{label:<28} | {seconds * 1000 / len(items):>10.4f} | {'per lookup':>24}")
+
+        month = index.events_in_month(*months[0])
+        print(f"\n{months[0][0]}-{months[0][1]:02d} has {len(month)} events; "
+              f"{len(index.covered_days(month[0].start, month[-1].end)) if month else 0} days covered")
+
+
+if __name__ == "__main__":
+    main()
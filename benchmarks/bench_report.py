@@ -0,0 +1,115 @@
+"""
+Measure work week aggregation of 10^7 events.
+
+Adds random timestamps with categories and weights to a WorkWeekReport in
+chunks, then as separately built partial reports merged together, and times
+the rolling window and CSV output. A per-event Python loop over a sample
+gives the baseline rate.
+
+Run from the project root:
+    python -m benchmarks.bench_report
+    python -m benchmarks.bench_report --events 100000000 --chunk 5000000
+"""
+import argparse
+import io
+import time
+from collections import Counter
+from datetime import date
+
+import numpy as np
+
+from src.main import get_first_monday, get_work_week_number
+from src.report import WorkWeekReport
+
+START_YEAR = 2015
+END_YEAR = 2025
+CATEGORIES = np.array(['build', 'deploy', 'incident', 'alert', 'test', 'review', 'release', 'rollback'])
+
+
+def naive_counts(ordinals, categories) -> Counter:
+    """Count (year, work week, category) one event at a time."""
+    counts = Counter()
+    for ordinal, category in zip(ordinals.tolist(), categories.tolist()):
+        day = date.fromordinal(ordinal)
+        week_num = get_work_week_number(day, get_first_monday(day.year))
+        counts[(day.year, week_num, category)] += 1
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--events', type=int, default=10**7)
+    parser.add_argument('--chunk', type=int, default=10**6, help='events per add() call')
+    parser.add_argument('--sample', type=int, default=200000, help='events for the per-event loop')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    first = date(START_YEAR, 1, 1).toordinal()
+    last = date(END_YEAR, 12, 31).toordinal()
+    ordinals = rng.integers(first, last + 1, args.events)
+    categories = CATEGORIES[rng.integers(0, len(CATEGORIES), args.events)]  # Strings
+    weights = rng.exponential(30.0, args.events)
+    chunks = range(0, args.events, args.chunk)
+
+    print(f"{args.events:,} events, {START_YEAR}-{END_YEAR}, {len(CATEGORIES)} categories, "
+          f"{args.chunk:,} per chunk")
+    print(f"{'operation':<34} | {'seconds':>8} | {'events/s':>12}")
+    print("-" * 61)
+
+    def row(label, seconds, events=args.events):
+        rate = f"{events / seconds:>12,.0f}" if events else ''
+        print(f"{label:<34} | {seconds:>8.3f} | {rate:>12}")
+
+    started = time.perf_counter()
+    sample = naive_counts(ordinals[:args.sample], categories[:args.sample])
+    row(f"per-event loop ({args.sample:,} sample)", time.perf_counter() - started, args.sample)
+
+    codes = rng.integers(0, len(CATEGORIES), args.events)
+    for label, kwargs in (('counts', {}), ('counts per category code', {'categories': codes}),
+                          ('counts per category', {'categories': categories}),
+                          ('counts + weights per category', {'categories': categories, 'weights': weights})):
+        report = WorkWeekReport(START_YEAR, END_YEAR)
+        started = time.perf_counter()
+        for start in chunks:
+            report.add(ordinals[start:start + args.chunk],
+                       **{key: value[start:start + args.chunk] for key, value in kwargs.items()})
+        row(label, time.perf_counter() - started)
+    assert report.counts.sum() == args.events
+
+    # The same events as one partial report per chunk, merged at the end
+    started = time.perf_counter()
+    parts = []
+    for start in chunks:
+        part = WorkWeekReport(START_YEAR, END_YEAR)
+        part.add(ordinals[start:start + args.chunk], categories[start:start + args.chunk],
+                 weights[start:start + args.chunk])
+        parts.append(part)
+    built = time.perf_counter()
+    merged = WorkWeekReport(START_YEAR, END_YEAR)
+    for part in parts:
+        merged.merge(part)
+    merged_at = time.perf_counter()
+    row(f"{len(parts)} partial reports", built - started)
+    row(f"merge {len(parts)} partials", merged_at - built, 0)
+    assert (merged.counts == report.counts).all()
+
+    started = time.perf_counter()
+    merged.rolling(4)
+    row("rolling 4-week window", time.perf_counter() - started, 0)
+    out = io.StringIO()
+    started = time.perf_counter()
+    num_rows = merged.write(out, 'csv', window=4)
+    row(f"write CSV ({num_rows:,} rows)", time.perf_counter() - started, 0)
+
+    # The vectorized counts agree with the loop on the sample
+    check = WorkWeekReport(START_YEAR, END_YEAR)
+    check.add(ordinals[:args.sample], categories[:args.sample])
+    assert sum(sample.values()) == check.counts.sum()
+    totals = Counter()  # A wrapped WW1 has its own column; the loop adds it to the year's first
+    for year, week_num, category, count in check.iter_rows():
+        totals[(year, week_num, category)] += count
+    assert all(totals[key] == count for key, count in sample.items())
+
+
+if __name__ == "__main__":
+    main()
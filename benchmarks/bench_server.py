@@ -0,0 +1,117 @@
+"""
+Load-test the local work week service: requests per second and p99 latency.
+
+Starts `python run_app.py serve` on a free port unless --port is given, then
+drives it over keep-alive connections with single-date and 10k-date batch calls.
+
+Run from the project root:
+    python -m benchmarks.bench_server
+    python -m benchmarks.bench_server --connections 16 --requests 20000
+    python -m benchmarks.bench_server --port 8765   # an already running service
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+
+
+async def http_request(reader, writer, method: str, target: str, body: bytes = b''):
+    """Send one request on a kept-alive connection and read the response body."""
+    writer.write(f"{method} {target} HTTP/1.1\r\nHost: localhost\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status_line = await reader.readline()
+    length = 0
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode().partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    payload = await reader.readexactly(length)
+    if b" 200 " not in status_line:
+        raise RuntimeError(f"{status_line!r}: {payload!r}")
+    return payload
+
+
+async def run_load(port: int, connections: int, requests: int, make_request):
+    """Spread requests over kept-alive connections; returns (seconds, latencies)."""
+    latencies = []
+    remaining = [requests]
+
+    async def client():
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            method, target, body = make_request()
+            started = time.perf_counter()
+            await http_request(reader, writer, method, target, body)
+            latencies.append(time.perf_counter() - started)
+        writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(connections)))
+    return time.perf_counter() - started, sorted(latencies)
+
+
+def report(name: str, elapsed: float, latencies):
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    print(f"{name:<13} | {len(latencies):>8} | {len(latencies) / elapsed:>10,.0f} | {p50:>8.2f} | {p99:>8.2f}")
+
+
+def wait_for_port(port: int, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Service did not start on port {port}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--port', type=int, help='use an already running service')
+    parser.add_argument('--connections', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=10000, help='single-date requests')
+    parser.add_argument('--batch-requests', type=int, default=100, help='10k-date batch requests')
+    parser.add_argument('--batch-size', type=int, default=10000)
+    args = parser.parse_args()
+    
+    server = None
+    port = args.port
+    if port is None:
+        with socket.socket() as s:
+            s.bind(('127.0.0.1', 0))
+            port = s.getsockname()[1]
+        server = subprocess.Popen([sys.executable, 'run_app.py', 'serve', '--port', str(port)])
+    try:
+        wait_for_port(port)
+        rng = random.Random(0)
+        days = [(date(2015, 1, 1) + timedelta(days=i)).isoformat() for i in range(365 * 20)]
+        
+        def single():
+            return 'GET', f"/ww?date={rng.choice(days)}", b''
+        
+        def batch():
+            return 'POST', '/ww/batch', json.dumps({'dates': rng.choices(days, k=args.batch_size)}).encode()
+        
+        print(f"{args.connections} keep-alive connections")
+        print(f"{'request':<13} | {'count':>8} | {'req/s':>10} | {'p50 ms':>8} | {'p99 ms':>8}")
+        print("-" * 60)
+        report('single', *asyncio.run(run_load(port, args.connections, args.requests, single)))
+        report(f'batch {args.batch_size}', *asyncio.run(
+            run_load(port, args.connections, args.batch_requests, batch)))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
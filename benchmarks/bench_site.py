@@ -0,0 +1,75 @@
+"""
+Measure static calendar site builds from 1 to N worker processes.
+
+Renders the HTML and SVG pages of a range of years into a fresh directory
+with each worker count and reports the per-year render time (mean and
+slowest), the total wall time and the speedup over one worker. A second
+build of the same site then times the incremental no-op rebuild, and a
+third after one holiday changed. Speedups are bounded by the machine's
+CPU count, which is printed with the results.
+
+Run from the project root:
+    python -m benchmarks.bench_site
+    python -m benchmarks.bench_site --start-year 1900 --end-year 2199 --workers 1 2 4 8
+"""
+import argparse
+import os
+import tempfile
+from datetime import date
+
+from src.calendar_site import build_site
+from src.holidays import Event, HolidayIndex
+
+
+def make_holidays(start_year: int, end_year: int) -> HolidayIndex:
+    """A few fixed holidays and a winter shutdown every year."""
+    events = []
+    for year in range(start_year, end_year + 1):
+        for month, day, summary in ((1, 1, "New Year"), (7, 4, "Independence Day"),
+                                    (11, 11, "Veterans Day")):
+            ordinal = date(year, month, day).toordinal()
+            events.append(Event(ordinal, ordinal, summary))
+        shutdown = date(year, 12, 24).toordinal()
+        events.append(Event(shutdown, shutdown + 8, "Winter shutdown"))
+    return HolidayIndex(events)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--start-year', type=int, default=1900)
+    parser.add_argument('--end-year', type=int, default=2099)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}), help='worker counts to run')
+    parser.add_argument('--rule', default='default')
+    args = parser.parse_args()
+
+    holidays = make_holidays(args.start_year, args.end_year)
+    years = args.end_year - args.start_year + 1
+    print(f"{years} years ({args.start_year}-{args.end_year}), {len(holidays)} holidays, "
+          f"{os.cpu_count()} CPUs")
+    print(f"{'workers':>7} | {'mean ms/year':>12} | {'max ms/year':>11} | {'wall s':>7} | "
+          f"{'speedup':>7} | {'no-op s':>7} | {'1 holiday s':>11}")
+    print("-" * 82)
+    baseline = None
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as out_dir:
+            cold = build_site(out_dir, args.start_year, args.end_year, args.rule, holidays,
+                              workers=workers)
+            noop = build_site(out_dir, args.start_year, args.end_year, args.rule, holidays,
+                              workers=workers)
+            assert not noop.rendered, "a rebuild with the same inputs rendered pages"
+            # Rename one holiday in the middle of the range
+            events = list(holidays.overlapping(0, date(9999, 12, 31).toordinal()))
+            middle = len(events) // 2
+            events[middle] = events[middle]._replace(summary="Moved holiday")
+            edited = build_site(out_dir, args.start_year, args.end_year, args.rule,
+                                HolidayIndex(events), workers=workers)
+        times = list(cold.rendered.values())
+        baseline = baseline or cold.seconds
+        print(f"{workers:>7} | {sum(times) / len(times) * 1000:>12.2f} | {max(times) * 1000:>11.2f} | "
+              f"{cold.seconds:>7.2f} | {baseline / cold.seconds:>6.2f}x | {noop.seconds:>7.3f} | "
+              f"{edited.seconds:>7.3f} ({len(edited.rendered)})")
+
+
+if __name__ == "__main__":
+    main()
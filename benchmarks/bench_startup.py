@@ -0,0 +1,82 @@
+"""
+Measure time to first paint: from launching the app to its first drawn frame.
+
+Each run starts a new process with WW_CALENDAR_FIRST_PAINT_FILE set; the app
+writes the time after drawing its first frame and exits. Runs are made with an
+empty cache (no first-paint snapshot) and with the snapshot of a previous run.
+
+Run from the project root:
+    python -m benchmarks.bench_startup                   # script, counting Tk stand-in
+    python -m benchmarks.bench_startup --real-tk         # script, real Tk (needs a display)
+    python -m benchmarks.bench_startup --frozen dist/WW_Calendar.exe
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Launch run_app.py with the Tk stand-in installed, for machines without a display
+FAKE_TK_LAUNCH = ("import sys; sys.path.insert(0, '.'); "
+                  "from benchmarks import fake_tk; fake_tk.install(); "
+                  "import runpy; runpy.run_path('run_app.py', run_name='__main__')")
+
+
+def startup_command(real_tk: bool = False, frozen: str = None) -> list:
+    """Get the command that launches the app the way a user would."""
+    if frozen:
+        return [os.path.abspath(frozen)]
+    if real_tk:
+        return [sys.executable, 'run_app.py']
+    return [sys.executable, '-c', FAKE_TK_LAUNCH]
+
+
+def measure_first_paint(command: list, cache_dir: str) -> float:
+    """
+    Launch the app once.
+
+    Args:
+        command (list): Command from startup_command
+        cache_dir (str): Cache directory for the first-paint snapshot
+
+    Returns:
+        float: Seconds from starting the process to its first drawn frame
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        marker = os.path.join(tmp, 'first_paint')
+        env = dict(os.environ, WW_CALENDAR_CACHE_DIR=cache_dir,
+                   WW_CALENDAR_FIRST_PAINT_FILE=marker,
+                   WW_CALENDAR_INSTANCE=os.path.join(tmp, 'instance'))
+        started = time.time()
+        subprocess.run(command, cwd=ROOT, env=env, check=True, timeout=60)
+        with open(marker) as f:
+            return float(f.read()) - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=10, help='launches per cache state')
+    parser.add_argument('--real-tk', action='store_true', help='launch with a real Tk (needs a display)')
+    parser.add_argument('--frozen', metavar='EXE', help='launch a PyInstaller build instead of the script')
+    args = parser.parse_args()
+    command = startup_command(args.real_tk, args.frozen)
+
+    print(f"{args.runs} launches of {' '.join(command) if args.frozen or args.real_tk else 'run_app.py (fake Tk)'}")
+    print(f"{'cache':<6} | {'median ms':>10} | {'min ms':>8} | {'max ms':>8}")
+    print("-" * 42)
+    for label in ('cold', 'warm'):
+        timings = []
+        for _ in range(args.runs):
+            with tempfile.TemporaryDirectory() as cache_dir:
+                if label == 'warm':
+                    measure_first_paint(command, cache_dir)  # Leaves a snapshot behind
+                timings.append(measure_first_paint(command, cache_dir) * 1000)
+        print(f"{label:<6} | {statistics.median(timings):>10.1f} | {min(timings):>8.1f} | {max(timings):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Measure CSV tagging throughput in MB/s from 1 to N worker processes.
+
+Writes a synthetic CSV with an ISO timestamp column, then tags it with each
+worker count and reports MB/s and the speedup over one worker. Speedups
+are bounded by the machine's CPU count, which is printed with the results.
+
+Run from the project root:
+    python -m benchmarks.bench_tagger
+    python -m benchmarks.bench_tagger --rows 5000000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from src.tagger import tag_file
+
+
+def write_csv(path: str, num_rows: int, seed: int = 0) -> int:
+    """Write a log-like CSV of num_rows rows; returns its size in bytes."""
+    rng = random.Random(seed)
+    with open(path, 'w', newline='') as f:
+        f.write("id,host,timestamp,latency_ms,status\n")
+        rows = []
+        for i in range(num_rows):
+            rows.append(f"{i},host{i % 50},20{rng.randrange(10, 30)}-{rng.randrange(1, 13):02d}-"
+                        f"{rng.randrange(1, 29):02d}T{i % 24:02d}:{i % 60:02d}:00Z,"
+                        f"{rng.random() * 100:.3f},{200 if i % 17 else 500}\n")
+            if len(rows) == 10000:
+                f.write(''.join(rows))
+                rows.clear()
+        f.write(''.join(rows))
+    return os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=2000000, help='rows in the generated file')
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}), help='worker counts to run')
+    parser.add_argument('--chunk-mb', type=float, default=8, help='megabytes per chunk')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'events.csv')
+        size = write_csv(path, args.rows)
+        print(f"{args.rows:,} rows, {size / 1e6:.1f} MB, {os.cpu_count()} CPUs, "
+              f"{args.chunk_mb:g} MB chunks")
+        print(f"{'workers':>7} | {'seconds':>8} | {'MB/s':>7} | speedup")
+        print("-" * 38)
+        baseline = None
+        for workers in args.workers:
+            with open(os.devnull, 'wb') as out:
+                started = time.perf_counter()
+                tag_file(path, out, column='timestamp', workers=workers,
+                         chunk_bytes=int(args.chunk_mb * 1024 * 1024))
+                seconds = time.perf_counter() - started
+            baseline = baseline or seconds
+            print(f"{workers:>7} | {seconds:>8.2f} | {size / 1e6 / seconds:>7.1f} | {baseline / seconds:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Measure month navigation latency and widget churn in WorkWeekCalendarWidget.
+
+Runs headless against the counting tkinter stand-in in benchmarks/fake_tk.py
+by default; pass --real-tk to drive a real Tk (needs a display, e.g. Xvfb).
+
+Run from the project root:
+    python -m benchmarks.bench_widget_navigation
+    python -m benchmarks.bench_widget_navigation --navigations 5000 --real-tk
+"""
+import argparse
+import statistics
+import time
+
+
+def count_widgets(widget) -> int:
+    """Count a widget and all its descendants."""
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def count_tcl_objects(app, fake) -> int:
+    """Count live Tcl objects: Tcl commands for a real Tk, live widgets for the stand-in."""
+    if fake is not None:
+        return fake.live_widgets
+    return len(app.root.tk.call('info', 'commands'))
+
+
+def navigate(app, navigations: int):
+    """Step 24 months forward, then 24 back, and so on; returns per-step seconds."""
+    timings = []
+    for i in range(navigations):
+        step = app.next_month if (i // 24) % 2 == 0 else app.previous_month
+        started = time.perf_counter()
+        step()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--navigations', type=int, default=2000)
+    parser.add_argument('--real-tk', action='store_true', help='use a real Tk instead of the stand-in')
+    args = parser.parse_args()
+    
+    fake = None
+    if not args.real_tk:
+        from benchmarks import fake_tk
+        fake = fake_tk.install()
+    from src.calendar_widget import WorkWeekCalendarWidget
+    
+    app = WorkWeekCalendarWidget()
+    if args.real_tk:
+        app.root.update()
+    widgets_before = count_widgets(app.root)
+    objects_before = count_tcl_objects(app, fake)
+    counts_before = fake.counts.copy() if fake else None
+    
+    timings = navigate(app, args.navigations)
+    if args.real_tk:
+        app.root.update()
+    
+    widgets_after = count_widgets(app.root)
+    objects_after = count_tcl_objects(app, fake)
+    timings_ms = sorted(t * 1000 for t in timings)
+    
+    print(f"{args.navigations} navigations ({'real Tk' if args.real_tk else 'fake Tk'})")
+    print(f"latency ms: mean {statistics.mean(timings_ms):.3f}, "
+          f"p50 {timings_ms[len(timings_ms) // 2]:.3f}, "
+          f"p99 {timings_ms[int(len(timings_ms) * 0.99)]:.3f}, max {timings_ms[-1]:.3f}")
+    print(f"widgets: {widgets_before} before, {widgets_after} after")
+    print(f"Tcl objects: {objects_before} before, {objects_after} after")
+    if fake is not None:
+        ops = fake.counts - counts_before
+        per_nav = ", ".join(f"{name} {count / args.navigations:.1f}"
+                            for name, count in sorted(ops.items()) if ' ' not in name)
+        print(f"widget operations per navigation: {per_nav}")
+    
+    if args.real_tk:
+        app.root.destroy()
+
+
+if __name__ == "__main__":
+    main()
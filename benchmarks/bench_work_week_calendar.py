@@ -0,0 +1,56 @@
+"""
+Measure text calendar throughput in lines per second.
+
+Run from the project root:
+    python -m benchmarks.bench_work_week_calendar
+    python -m benchmarks.bench_work_week_calendar --years 100 --start-year 1950
+"""
+import argparse
+import os
+import time
+import tracemalloc
+
+from src.main import get_work_week_calendar, write_work_week_calendar
+
+
+def stream(start_year: int, end_year: int) -> int:
+    """Stream the calendar to os.devnull."""
+    with open(os.devnull, 'w') as out:
+        return write_work_week_calendar(out, start_year, end_year)
+
+
+def string(start_year: int, end_year: int) -> int:
+    """Build the calendar as one string."""
+    return get_work_week_calendar(start_year, end_year).count("\n")
+
+
+def bench(render, start_year: int, end_year: int):
+    """Time a render, then run it again under tracemalloc; returns (lines, seconds, peak bytes)."""
+    started = time.perf_counter()
+    num_lines = render(start_year, end_year)
+    elapsed = time.perf_counter() - started
+    
+    tracemalloc.start()
+    render(start_year, end_year)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return num_lines, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--start-year', type=int, default=2000)
+    parser.add_argument('--years', type=int, default=50, help='number of years to render')
+    args = parser.parse_args()
+    end_year = args.start_year + args.years - 1
+    
+    print(f"{args.years} years ({args.start_year}-{end_year})")
+    print(f"{'mode':<7} | {'lines':>8} | {'seconds':>8} | {'lines/s':>10} | peak memory")
+    print("-" * 58)
+    for mode, render in (('stream', stream), ('string', string)):
+        num_lines, elapsed, peak = bench(render, args.start_year, end_year)
+        print(f"{mode:<7} | {num_lines:>8} | {elapsed:>8.3f} | {num_lines / elapsed:>10,.0f} | {peak / 1024:,.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Compare the batch work week calculation against a scalar loop.
+
+Run from the project root:
+    python -m benchmarks.bench_work_week_numbers
+    python -m benchmarks.bench_work_week_numbers --sizes 1000000 --repeat 5
+"""
+import argparse
+import time
+from datetime import date
+
+import numpy as np
+
+from src.main import get_work_week_number, get_work_week_numbers
+
+
+def bench_scalar(ordinals, start_date: date) -> float:
+    """Time get_work_week_number called once per date."""
+    started = time.perf_counter()
+    for ordinal in ordinals.tolist():
+        get_work_week_number(date.fromordinal(ordinal), start_date)
+    return time.perf_counter() - started
+
+
+def bench_batch(ordinals, start_date: date, repeat: int) -> float:
+    """Time get_work_week_numbers over the whole array, best of repeat runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        get_work_week_numbers(ordinals, start_date)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10**6, 10**7],
+                        help='number of dates per run')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='batch runs per size (best time is reported)')
+    args = parser.parse_args()
+    
+    start_date = date(2024, 12, 30)
+    first = date(1990, 1, 1).toordinal()
+    rng = np.random.default_rng(0)
+    
+    print(f"{'dates':>10} | {'scalar s':>9} | {'batch s':>9} | {'batch dates/s':>14} | speedup")
+    print("-" * 62)
+    for size in args.sizes:
+        ordinals = rng.integers(first, first + 365 * 60, size=size, dtype=np.int64)
+        scalar = bench_scalar(ordinals, start_date)
+        batch = bench_batch(ordinals, start_date, args.repeat)
+        print(f"{size:>10} | {scalar:>9.3f} | {batch:>9.4f} | {size / batch:>14,.0f} | {scalar / batch:>6.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Compare working day arithmetic on prefix sums against a day-by-day loop.
+
+Counts working days between random date pairs and adds random numbers of
+working days, once with WorkingDayCalendar and once stepping through the
+dates one at a time. The batch forms are timed on large arrays, next to
+numpy's busday_count/busday_offset for reference.
+
+Run from the project root:
+    python -m benchmarks.bench_working_days
+    python -m benchmarks.bench_working_days --pairs 2000 --span 3650 --batch 1000000
+"""
+import argparse
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from src.main import WorkingDayCalendar
+
+WEEKEND = (5, 6)
+
+
+def naive_count(start: date, end: date, holidays: set) -> int:
+    """Count working days from start up to end one day at a time."""
+    count = 0
+    day = start
+    while day < end:
+        if day.weekday() not in WEEKEND and day not in holidays:
+            count += 1
+        day += timedelta(days=1)
+    return count
+
+
+def naive_add(day: date, num_days: int, holidays: set) -> date:
+    """Step forward num_days working days one day at a time."""
+    while day.weekday() in WEEKEND or day in holidays:
+        day += timedelta(days=1)
+    while num_days > 0:
+        day += timedelta(days=1)
+        if day.weekday() not in WEEKEND and day not in holidays:
+            num_days -= 1
+    return day
+
+
+def timed(func) -> float:
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--pairs', type=int, default=1000, help='scalar calls per operation')
+    parser.add_argument('--span', type=int, default=365, help='largest gap in days between pair dates')
+    parser.add_argument('--batch', type=int, default=10**6, help='dates per batch call')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    # Ten fixed holidays a year
+    holidays = {date(year, month, day) for year in range(2000, 2051)
+                for month, day in ((1, 1), (1, 2), (4, 18), (5, 1), (7, 4), (9, 1),
+                                   (11, 27), (12, 24), (12, 25), (12, 31))}
+    started = time.perf_counter()
+    calendar = WorkingDayCalendar(2000, 2050, WEEKEND, holidays)
+    build = time.perf_counter() - started
+
+    first = date(2001, 1, 1).toordinal()
+    starts = [date.fromordinal(int(o)) for o in rng.integers(first, first + 365 * 40, args.pairs)]
+    ends = [start + timedelta(days=int(gap)) for start, gap in zip(starts, rng.integers(0, args.span, args.pairs))]
+    steps = [int(n) for n in rng.integers(0, args.span * 5 // 7, args.pairs)]
+    assert [calendar.count(s, e) for s, e in zip(starts, ends)] == \
+        [naive_count(s, e, holidays) for s, e in zip(starts, ends)]
+    assert [calendar.add(s, n) for s, n in zip(starts, steps)] == \
+        [naive_add(s, n, holidays) for s, n in zip(starts, steps)]
+
+    print(f"Calendar 2000-2050 built in {build * 1000:.1f} ms ({len(calendar.prefix) * 4 / 1024:.0f} KiB)")
+    print(f"{args.pairs} calls, gaps up to {args.span} days")
+    print(f"{'operation':<12} | {'naive us':>9} | {'prefix us':>9} | speedup")
+    print("-" * 46)
+    for label, naive, fast in (
+            ('count', lambda: [naive_count(s, e, holidays) for s, e in zip(starts, ends)],
+             lambda: [calendar.count(s, e) for s, e in zip(starts, ends)]),
+            ('add', lambda: [naive_add(s, n, holidays) for s, n in zip(starts, steps)],
+             lambda: [calendar.add(s, n) for s, n in zip(starts, steps)])):
+        naive_s = timed(naive)
+        fast_s = min(timed(fast) for _ in range(3))
+        print(f"{label:<12} | {naive_s * 1e6 / args.pairs:>9.2f} | {fast_s * 1e6 / args.pairs:>9.3f} | "
+              f"{naive_s / fast_s:>6.0f}x")
+
+    days = (rng.integers(first, first + 365 * 40, args.batch) - date(1970, 1, 1).toordinal()).astype('datetime64[D]')
+    later = days + rng.integers(0, args.span, args.batch)
+    offsets = rng.integers(0, args.span * 5 // 7, args.batch)
+    holiday_array = np.array(sorted(holidays), dtype='datetime64[D]')
+    print(f"\nBatch of {args.batch:,} dates")
+    print(f"{'operation':<12} | {'numpy busday ms':>15} | {'prefix ms':>9}")
+    print("-" * 44)
+    for label, reference, fast in (
+            ('count_many', lambda: np.busday_count(days, later, holidays=holiday_array),
+             lambda: calendar.count_many(days, later)),
+            ('add_many', lambda: np.busday_offset(days, offsets, roll='forward', holidays=holiday_array),
+             lambda: calendar.add_many(days, offsets))):
+        print(f"{label:<12} | {min(timed(reference) for _ in range(3)) * 1000:>15.1f} | "
+              f"{min(timed(fast) for _ in range(3)) * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Measure scrolling the canvas year view across decades.
+
+Scrolls the view by one scroll unit at a time through the given number of
+years and reports redraw latency, canvas items and memory at the start and
+the end; with virtualized rows the last three stay flat.
+
+Runs headless against the counting tkinter stand-in in benchmarks/fake_tk.py
+by default; pass --real-tk to drive a real Tk (needs a display).
+
+Run from the project root:
+    python -m benchmarks.bench_year_view
+    python -m benchmarks.bench_year_view --years 100 --real-tk
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+from array import array
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--years', type=int, default=50, help='years to scroll through')
+    parser.add_argument('--start-year', type=int, default=2000)
+    parser.add_argument('--real-tk', action='store_true', help='use a real Tk instead of the stand-in')
+    args = parser.parse_args()
+
+    if not args.real_tk:
+        from benchmarks import fake_tk
+        fake_tk.install()
+    import tkinter as tk
+    from src.year_view import MONTHS_PER_ROW, ROW_HEIGHT, SCROLL_UNIT, YearView
+
+    tracemalloc.start()
+    root = tk.Tk()
+    view = YearView(root)
+    view.scroll_to(args.start_year, 1)
+    if args.real_tk:
+        root.update()
+    # Fill the spare slot and the month grid cache (64 grids) first, and
+    # compile the rule's per-year tables (shared engine caches, not part of
+    # the view), so the memory figures show the view alone
+    warm_up_years = 6
+    view.scroll_to(args.start_year - warm_up_years, 1)
+    for year in range(args.start_year - warm_up_years - 1, args.start_year + args.years + 2):
+        view.rule.year_table(year)
+    for _ in range(warm_up_years * 12 // MONTHS_PER_ROW * ROW_HEIGHT // SCROLL_UNIT):
+        view.scroll(1)
+
+    steps = args.years * 12 // MONTHS_PER_ROW * ROW_HEIGHT // SCROLL_UNIT
+    timings = array('d', bytes(8 * steps))  # Preallocated, so timing does not add to memory
+    items_before = view.item_count()
+    memory_before = tracemalloc.get_traced_memory()[0]
+    for step in range(steps):
+        started = time.perf_counter()
+        view.scroll(1)
+        if args.real_tk:
+            root.update_idletasks()
+        timings[step] = time.perf_counter() - started
+    items_after = view.item_count()
+    memory_after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    timings_ms = sorted(t * 1000 for t in timings)
+    print(f"{steps} scroll steps over {args.years} years ({'real Tk' if args.real_tk else 'fake Tk'})")
+    print(f"redraw ms: mean {statistics.mean(timings_ms):.3f}, "
+          f"p50 {timings_ms[len(timings_ms) // 2]:.3f}, "
+          f"p99 {timings_ms[int(len(timings_ms) * 0.99)]:.3f}, max {timings_ms[-1]:.3f}")
+    print(f"canvas items: {items_before} before, {items_after} after "
+          f"({view.num_slots} row slots for {len(view.slots)} rows in view)")
+    print(f"traced memory: {memory_before / 1024:.0f} KiB before, {memory_after / 1024:.0f} KiB after")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+A minimal tkinter stand-in that counts widget operations, for headless runs.
+"""
+import sys
+import types
+from collections import Counter
+
+END = 'end'
+
+
+class TclError(Exception):
+    pass
+
+
+class FakeTkModule(types.ModuleType):
+    """Module object installed as tkinter; all widgets share its counters."""
+
+    def __init__(self):
+        super().__init__('tkinter')
+        self.counts = Counter()
+        self.live_widgets = 0
+        self.END = END
+        self.TclError = TclError
+        module = self
+
+        class Misc:
+            def __init__(self, master=None, **options):
+                self.master = master
+                self.children = []
+                self.options = dict(options)
+                self.bindings = {}
+                if master is not None:
+                    master.children.append(self)
+                module.counts['create'] += 1
+                module.counts['create ' + type(self).__name__] += 1
+                module.live_widgets += 1
+
+            def configure(self, **options):
+                module.counts['configure'] += 1
+                self.options.update(options)
+
+            config = configure
+
+            def cget(self, key):
+                return self.options.get(key)
+
+            def __getitem__(self, key):
+                return self.options.get(key)
+
+            def __setitem__(self, key, value):
+                self.configure(**{key: value})
+
+            def pack(self, **options):
+                module.counts['pack'] += 1
+
+            def pack_propagate(self, flag):
+                pass
+
+            def grid(self, **options):
+                module.counts['grid'] += 1
+                self.grid_options = options
+
+            def grid_remove(self):
+                module.counts['grid_remove'] += 1
+
+            def bind(self, sequence, func, add=None):
+                self.bindings[sequence] = func
+
+            def event_generate(self, sequence, **options):
+                module.counts['event_generate'] += 1
+                handler = self.bindings.get(sequence)
+                if handler is not None:
+                    handler(None)
+
+            def winfo_children(self):
+                return list(self.children)
+
+            def destroy(self):
+                for child in list(self.children):
+                    child.destroy()
+                if self.master is not None and self in self.master.children:
+                    self.master.children.remove(self)
+                module.counts['destroy'] += 1
+                module.live_widgets -= 1
+
+        class Tk(Misc):
+            def __init__(self):
+                super().__init__()
+                self.x = self.y = 0
+                self.pending = {}  # Timer id -> (ms, func, args)
+                self.timers_created = 0
+
+            def title(self, text):
+                pass
+
+            def attributes(self, *args):
+                pass
+
+            def overrideredirect(self, flag):
+                pass
+
+            def after(self, ms, func=None, *args):
+                module.counts['after'] += 1
+                self.timers_created += 1
+                timer_id = f"after#{self.timers_created}"
+                self.pending[timer_id] = (ms, func, args)
+                return timer_id
+
+            def after_idle(self, func, *args):
+                return self.after(0, func, *args)
+
+            def after_cancel(self, ident):
+                module.counts['after_cancel'] += 1
+                self.pending.pop(ident, None)
+
+            def run_timers(self, max_ms=0):
+                """Fire the timers due within max_ms, as if that much time passed; returns how many."""
+                due = [timer_id for timer_id, (ms, _, _) in self.pending.items() if ms <= max_ms]
+                for timer_id in due:
+                    _, func, args = self.pending.pop(timer_id)
+                    func(*args)
+                return len(due)
+
+            def bell(self):
+                module.counts['bell'] += 1
+
+            def withdraw(self):
+                pass
+
+            def deiconify(self):
+                pass
+
+            def lift(self):
+                pass
+
+            def quit(self):
+                pass
+
+            def mainloop(self):
+                # No clock to wait on: run what is due as the loop starts, then return
+                self.run_timers()
+
+            def update_idletasks(self):
+                pass
+
+            def update(self):
+                module.counts['update'] += 1
+
+            def winfo_screenwidth(self):
+                return 1920
+
+            def winfo_x(self):
+                module.counts['winfo_x'] += 1
+                return self.x
+
+            def winfo_y(self):
+                module.counts['winfo_y'] += 1
+                return self.y
+
+            def geometry(self, spec=None):
+                module.counts['geometry'] += 1
+                if spec and spec.startswith('+'):
+                    x, y = spec[1:].split('+')
+                    self.x, self.y = int(x), int(y)
+                return f"300x250+{self.x}+{self.y}"
+
+        class Frame(Misc):
+            pass
+
+        class Label(Misc):
+            pass
+
+        class Button(Misc):
+            def invoke(self):
+                command = self.options.get('command')
+                return command() if command else None
+
+        class Entry(Misc):
+            def __init__(self, master=None, **options):
+                super().__init__(master, **options)
+                self.text = ''
+
+            def get(self):
+                return self.text
+
+            def insert(self, index, text):
+                self.text += text
+
+            def delete(self, first, last=None):
+                self.text = ''
+
+        class Toplevel(Misc):
+            def title(self, text):
+                pass
+
+            def attributes(self, *args):
+                pass
+
+            def protocol(self, name, func):
+                self.bindings[name] = func
+
+        class Scrollbar(Misc):
+            def set(self, first, last):
+                module.counts['scrollbar_set'] += 1
+                self.position = (first, last)
+
+        class Canvas(Misc):
+            """Keeps items as {id: [coords, options, tags]}."""
+
+            def __init__(self, master=None, **options):
+                super().__init__(master, **options)
+                self.items = {}
+                self.tagged = {}
+                self.next_item = 1
+
+            def _create(self, kind, coords, options):
+                module.counts['create_item'] += 1
+                item = self.next_item
+                self.next_item += 1
+                tags = options.pop('tags', ())
+                self.items[item] = [list(coords), dict(options, kind=kind), tuple(tags)]
+                for tag in tags:
+                    self.tagged.setdefault(tag, []).append(item)
+                return item
+
+            def create_text(self, *coords, **options):
+                return self._create('text', coords, options)
+
+            def create_rectangle(self, *coords, **options):
+                return self._create('rectangle', coords, options)
+
+            def _find(self, tag_or_id):
+                if isinstance(tag_or_id, int):
+                    return [tag_or_id] if tag_or_id in self.items else []
+                return [item for item in self.tagged.get(tag_or_id, ()) if item in self.items]
+
+            def itemconfigure(self, tag_or_id, **options):
+                module.counts['itemconfigure'] += 1
+                for item in self._find(tag_or_id):
+                    self.items[item][1].update(options)
+
+            itemconfig = itemconfigure
+
+            def itemcget(self, tag_or_id, option):
+                return self.items[self._find(tag_or_id)[0]][1].get(option)
+
+            def coords(self, tag_or_id):
+                return self.items[self._find(tag_or_id)[0]][0]
+
+            def move(self, tag_or_id, dx, dy):
+                module.counts['move'] += 1
+                for item in self._find(tag_or_id):
+                    coords = self.items[item][0]
+                    for i in range(0, len(coords), 2):
+                        coords[i] += dx
+                        coords[i + 1] += dy
+
+            def delete(self, tag_or_id):
+                module.counts['delete'] += 1
+                for item in self._find(tag_or_id):
+                    del self.items[item]
+
+            def find_all(self):
+                return tuple(self.items)
+
+            def yview_moveto(self, fraction):
+                module.counts['yview_moveto'] += 1
+                self.view_top = fraction
+
+            def tag_bind(self, tag_or_id, sequence, func):
+                self.bindings[(tag_or_id, sequence)] = func
+
+        for cls in (Misc, Tk, Toplevel, Frame, Label, Button, Entry, Scrollbar, Canvas):
+            setattr(self, cls.__name__, cls)
+
+
+def install():
+    """Replace tkinter in sys.modules with a fresh counting stand-in."""
+    module = FakeTkModule()
+    sys.modules['tkinter'] = module
+    return module
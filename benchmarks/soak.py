@@ -0,0 +1,211 @@
+"""
+Soak test: drive the widget through thousands of navigation cycles and day
+rollovers and fail if memory or Tk objects keep growing.
+
+Each cycle steps a number of months forward and back, returns to today,
+moves a fixed clock one day forward so the day change path repaints, and
+runs the hourly refresh wakeup; the year view is opened and closed every
+so often. Once the caches are warm, samples of the tracemalloc total, RSS
+and the Tk widget, Tcl command and image counts are compared with the first
+sample. When a value grows past its limit, the top allocation sites since
+that sample are printed and the exit status is 1.
+
+Runs headless against the counting tkinter stand-in in benchmarks/fake_tk.py
+by default (Tcl commands are then its pending timers); pass --real-tk to
+drive a real Tk (needs a display, e.g. Xvfb).
+
+Run from the project root:
+    python -m benchmarks.soak
+    python -m benchmarks.soak --cycles 20000 --real-tk
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+from typing import List, NamedTuple, Optional
+
+
+class Sample(NamedTuple):
+    cycle: int
+    traced_bytes: int
+    rss_bytes: Optional[int]  # None where it cannot be read
+    widgets: int
+    commands: int
+    images: int
+
+
+class Limits(NamedTuple):
+    """Largest growth allowed from the first sample to the last."""
+    traced_bytes: int = 512 * 1024
+    rss_bytes: int = 16 * 1024 * 1024
+    widgets: int = 0
+    commands: int = 8
+    images: int = 0
+
+
+def get_rss() -> Optional[int]:
+    """Get this process's resident set size in bytes (Linux), else None."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def count_widgets(widget) -> int:
+    """Count a Tk widget and all of its descendants."""
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def take_sample(app, cycle: int, fake) -> Sample:
+    """Measure memory and Tk objects after a full garbage collection."""
+    gc.collect()
+    if fake is not None:
+        commands = len(app.root.pending)
+        images = 0
+    else:
+        commands = len(app.root.tk.splitlist(app.root.tk.call('info', 'commands')))
+        images = len(app.root.tk.splitlist(app.root.tk.call('image', 'names')))
+    return Sample(cycle, tracemalloc.get_traced_memory()[0], get_rss(),
+                  count_widgets(app.root), commands, images)
+
+
+def settle(app, fake, timeout: float = 5.0):
+    """Let the worker jobs finish and apply their results, as the main loop would."""
+    deadline = time.monotonic() + timeout
+    while True:
+        if fake is not None:
+            app.root.run_timers(app.workers.pump_ms)
+        else:
+            app.root.update()
+        if not app.workers.outstanding or time.monotonic() > deadline:
+            return
+        time.sleep(0.001)
+
+
+def run_cycle(app, clock, cycle: int, months: int, year_view_every: int, fake):
+    """One round of navigation, a day rollover and an hourly wakeup."""
+    for _ in range(months):
+        app.next_month()
+    for _ in range(months):
+        app.previous_month()
+    app.go_to_today()
+    clock.advance(1)
+    app.scheduler.check()  # Sees the new date and repaints
+    app.scheduler.stop()  # The capped hourly sleep ending: its timer fires
+    app.scheduler.wake()
+    if year_view_every and cycle % year_view_every == 0:
+        app.toggle_year_view()
+        app.year_view.scroll(40)
+        app.toggle_year_view()
+    settle(app, fake)
+
+
+def find_growth(samples: List[Sample], limits: Limits) -> List[str]:
+    """
+    Compare the last sample with the first.
+
+    Returns:
+        List[str]: One message per value that grew past its limit
+    """
+    first, last = samples[0], samples[-1]
+    problems = []
+    for field in Limits._fields:
+        before, after = getattr(first, field), getattr(last, field)
+        if before is None or after is None:
+            continue
+        if after - before > getattr(limits, field):
+            problems.append(f"{field} grew by {after - before:,} (limit {getattr(limits, field):,}): "
+                            f"{before:,} at cycle {first.cycle}, {after:,} at cycle {last.cycle}")
+    return problems
+
+
+def print_top_allocations(before, after, count: int, out=sys.stdout):
+    """Print the source lines whose allocations grew the most between two snapshots."""
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    stats = after.filter_traces(filters).compare_to(before.filter_traces(filters), 'lineno')
+    print(f"Top {count} allocation sites by growth:", file=out)
+    for stat in stats[:count]:
+        print(f"  {stat}", file=out)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--cycles', type=int, default=3000)
+    parser.add_argument('--warmup', type=int, default=300, help='cycles run before the first sample')
+    parser.add_argument('--sample-every', type=int, default=500)
+    parser.add_argument('--months', type=int, default=3, help='months stepped each way per cycle')
+    parser.add_argument('--year-view-every', type=int, default=100,
+                        help='open and close the year view every N cycles (0: never)')
+    defaults = Limits()
+    parser.add_argument('--max-traced-kb', type=int, default=defaults.traced_bytes // 1024)
+    parser.add_argument('--max-rss-kb', type=int, default=defaults.rss_bytes // 1024)
+    parser.add_argument('--max-widgets', type=int, default=defaults.widgets)
+    parser.add_argument('--max-commands', type=int, default=defaults.commands)
+    parser.add_argument('--max-images', type=int, default=defaults.images)
+    parser.add_argument('--top', type=int, default=15, help='allocation sites printed on failure')
+    parser.add_argument('--real-tk', action='store_true', help='use a real Tk instead of the stand-in')
+    args = parser.parse_args(argv)
+    limits = Limits(args.max_traced_kb * 1024, args.max_rss_kb * 1024, args.max_widgets,
+                    args.max_commands, args.max_images)
+
+    fake = None
+    if not args.real_tk:
+        from benchmarks import fake_tk
+        fake = fake_tk.install()
+    from src.calendar_widget import WorkWeekCalendarWidget
+    from src.clock import FixedClock
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ['WW_CALENDAR_CACHE_DIR'] = cache_dir  # Keep snapshots out of the user's cache
+        clock = FixedClock(date(2025, 1, 1))
+        app = WorkWeekCalendarWidget(clock=clock)
+        if app.scheduler is None:
+            app.finish_startup()
+        tracemalloc.start()
+        started = time.perf_counter()
+        for cycle in range(1, args.warmup + 1):
+            run_cycle(app, clock, cycle, args.months, args.year_view_every, fake)
+        samples = [take_sample(app, args.warmup, fake)]
+        baseline = tracemalloc.take_snapshot()
+
+        print(f"{args.cycles:,} cycles after {args.warmup:,} warm-up "
+              f"({'real Tk' if args.real_tk else 'fake Tk'}), {args.months} months each way")
+        print(f"{'cycle':>7} | {'traced KiB':>10} | {'RSS MiB':>8} | {'widgets':>7} | "
+              f"{'commands':>8} | {'images':>6}")
+        print("-" * 63)
+
+        def show(sample):
+            rss = f"{sample.rss_bytes / 2**20:>8.1f}" if sample.rss_bytes is not None else f"{'-':>8}"
+            print(f"{sample.cycle:>7} | {sample.traced_bytes / 1024:>10.1f} | {rss} | "
+                  f"{sample.widgets:>7} | {sample.commands:>8} | {sample.images:>6}")
+        show(samples[0])
+        for cycle in range(args.warmup + 1, args.warmup + args.cycles + 1):
+            run_cycle(app, clock, cycle, args.months, args.year_view_every, fake)
+            if (cycle - args.warmup) % args.sample_every == 0 or cycle == args.warmup + args.cycles:
+                samples.append(take_sample(app, cycle, fake))
+                show(samples[-1])
+        seconds = time.perf_counter() - started
+        print(f"{seconds:.1f} s, {clock.today()} simulated, "
+              f"{app.scheduler.wakeups:,} wakeups, workers {app.workers.stats()['completed']:,} jobs")
+
+        problems = find_growth(samples, limits)
+        if problems:
+            for problem in problems:
+                print(f"FAIL: {problem}")
+            print_top_allocations(baseline, tracemalloc.take_snapshot(), args.top)
+        else:
+            print("OK: no growth past the limits")
+        tracemalloc.stop()
+        app.workers.shutdown()
+        if args.real_tk:
+            app.root.destroy()
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,347 @@
+"""
+Benchmark suite for the work week engine and the widget render path.
+
+Each benchmark times one operation (best of several runs) and reports seconds
+per operation; lower is better. Results are saved as JSON, and compare fails
+when a metric got slower than a baseline by more than a threshold.
+
+Run from the project root:
+    python -m benchmarks.suite run -o bench.json
+    python -m benchmarks.suite run --real-tk -o bench.json   # needs a display
+    python -m benchmarks.suite compare baseline.json bench.json --threshold 10
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+from datetime import date, timedelta
+
+BENCHMARKS = {}
+REPEAT = 5
+_real_tk = False
+
+
+def benchmark(name):
+    """Register a benchmark; the function returns a zero-argument callable to time."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+@benchmark('work_week_number.scalar')
+def work_week_number_scalar():
+    from src.main import get_work_week_number
+    current_date = date(2025, 3, 14)
+    first_monday = date(2024, 12, 30)
+    return lambda: get_work_week_number(current_date, first_monday)
+
+
+@benchmark('work_week_number.full_year')
+def work_week_number_full_year():
+    from src.main import get_first_monday, get_work_week_number
+    first_monday = get_first_monday(2025)
+    year = [date(2025, 1, 1) + timedelta(days=i) for i in range(365)]
+
+    def run():
+        for current_date in year:
+            get_work_week_number(current_date, first_monday)
+    return run
+
+
+@benchmark('work_week_numbers.batch_1e6')
+def work_week_numbers_batch():
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    from src.main import get_work_week_numbers
+    start = date(2000, 1, 1).toordinal()
+    ordinals = np.arange(start, start + 10**6, dtype=np.int64)
+    return lambda: get_work_week_numbers(ordinals, date(2024, 12, 30))
+
+
+@benchmark('week_rules.iso_full_year')
+def week_rules_iso_full_year():
+    from src.week_rules import get_rule
+    rule = get_rule('iso')
+    year = [date(2025, 1, 1) + timedelta(days=i) for i in range(365)]
+
+    def run():
+        for current_date in year:
+            rule.week_number(current_date)
+    return run
+
+
+@benchmark('working_days.count_and_add')
+def working_days_count_and_add():
+    from src.main import WorkingDayCalendar
+    calendar = WorkingDayCalendar(2000, 2050, holidays=[date(2025, 12, 25), date(2026, 1, 1)])
+    start, end = date(2025, 3, 14), date(2026, 3, 14)
+    return lambda: (calendar.count(start, end), calendar.add(start, 250))
+
+
+@benchmark('report.add_1e6')
+def report_add():
+    import numpy as np
+    from src.report import WorkWeekReport
+    rng = np.random.default_rng(0)
+    ordinals = rng.integers(date(2015, 1, 1).toordinal(), date(2025, 12, 31).toordinal() + 1, 10**6)
+    codes = rng.integers(0, 8, 10**6)
+    return lambda: WorkWeekReport(2015, 2025).add(ordinals, codes)
+
+
+@benchmark('site.render_year')
+def site_render_year():
+    import atexit
+    import shutil
+    import tempfile
+    from src.calendar_site import DEFAULT_TEMPLATE, YearJob, render_year
+    from src.holidays import Event
+    out_dir = tempfile.mkdtemp()
+    atexit.register(shutil.rmtree, out_dir, True)
+    first = date(2025, 1, 1).toordinal()
+    events = tuple(Event(first + i * 30, first + i * 30, f"Holiday {i}") for i in range(12))
+    job = YearJob(2025, 'default', "Work Week Calendar", DEFAULT_TEMPLATE, events, out_dir, 2024, 2026)
+    return lambda: render_year(job)
+
+
+@benchmark('month_grid.build')
+def month_grid_build():
+    from src.main import get_first_monday
+    from src.month_grid import build_month_grid
+    anchor = get_first_monday(2025)
+    return lambda: build_month_grid(2025, 3, anchor)
+
+
+@benchmark('month_grid.cached')
+def month_grid_cached():
+    from src.month_grid import get_month_grid
+    return lambda: get_month_grid(2025, 3)
+
+
+@benchmark('widget.update_calendar')
+def widget_update_calendar():
+    app = _get_widget()
+
+    def run():
+        # Alternate months so every render has cells to change
+        app.next_month()
+        app.previous_month()
+    return run
+
+
+@benchmark('widget.repaint_same_month')
+def widget_repaint_same_month():
+    app = _get_widget()
+    return app.update_calendar
+
+
+@benchmark('widget.drag_frame')
+def widget_drag_frame():
+    from benchmarks.bench_drag import MotionEvent
+    app = _get_widget()
+    origin = (app.root.winfo_x(), app.root.winfo_y())
+    app.start_drag(MotionEvent(origin[0] + 20, origin[1] + 5, origin))
+    events = [MotionEvent(origin[0] + 20 + i, origin[1] + 5 + i, origin) for i in range(8)]
+
+    def run():
+        # One frame's worth of motion at 500 events/s, then the frame's move
+        for event in events:
+            app.drag(event)
+        app.end_drag()
+        app.window_pos = origin
+    return run
+
+
+@benchmark('year_view.scroll_row')
+def year_view_scroll_row():
+    import tkinter as tk
+    from src.year_view import ROW_HEIGHT, SCROLL_UNIT, YearView
+    view = YearView(tk.Tk())
+    view.scroll_to(2025, 1)
+    units = ROW_HEIGHT // SCROLL_UNIT
+
+    def run():
+        # A row scrolls in and out each way, so slots are refilled
+        view.scroll(units)
+        view.scroll(-units)
+    return run
+
+
+@benchmark('holidays.month_lookup')
+def holidays_month_lookup():
+    from src.holidays import Event, HolidayIndex
+    first = date(2000, 1, 1).toordinal()
+    # Two events every three days for ~80 years, with a shutdown week now and then
+    index = HolidayIndex(Event(first + i * 2 // 3, first + i * 2 // 3 + (7 if i % 200 == 0 else 0),
+                               f"Event {i}") for i in range(50000))
+    return lambda: index.events_in_month(2040, 6)
+
+
+@benchmark('startup.first_paint')
+def startup_first_paint():
+    import atexit
+    import shutil
+    import tempfile
+    from benchmarks.bench_startup import measure_first_paint, startup_command
+    command = startup_command(real_tk=_real_tk)
+    cache_dir = tempfile.mkdtemp()
+    atexit.register(shutil.rmtree, cache_dir, True)
+    measure_first_paint(command, cache_dir)  # Save the first-paint snapshot
+    return lambda: measure_first_paint(command, cache_dir)
+
+
+_widget = None
+
+
+def _get_widget():
+    global _widget
+    if _widget is None:
+        import atexit
+        import shutil
+        import tempfile
+        from src.calendar_widget import WorkWeekCalendarWidget
+        # Keep the snapshots renders save out of the user's cache, as soak.py does
+        cache_dir = tempfile.mkdtemp()
+        atexit.register(shutil.rmtree, cache_dir, True)
+        os.environ['WW_CALENDAR_CACHE_DIR'] = cache_dir
+        # Load months in place: worker threads would time their handoff, not the render
+        _widget = WorkWeekCalendarWidget(workers=0)
+        _widget.root.withdraw()
+    return _widget
+
+
+def time_benchmark(run) -> float:
+    """Best seconds per call over REPEAT runs of about 0.2 s each."""
+    timer = timeit.Timer(run)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=REPEAT, number=number)) / number
+
+
+def run_benchmarks(names=None, real_tk: bool = False) -> dict:
+    """
+    Run benchmarks and collect their results.
+
+    Args:
+        names: Benchmark names to run (all by default)
+        real_tk (bool): Render with a real Tk instead of the counting stand-in
+
+    Returns:
+        dict: {"metadata": {...}, "results": {name: {"seconds": ..., "widget_ops": ...}}};
+        widget_ops (Tk calls per operation) is only counted with the stand-in
+    """
+    global _real_tk
+    _real_tk = real_tk
+    if not real_tk:
+        from benchmarks import fake_tk
+        fake_tk.install()
+
+    results = {}
+    for name in names or BENCHMARKS:
+        run = BENCHMARKS[name]()
+        if run is None:
+            print(f"{name:<30} skipped")
+            continue
+        seconds = time_benchmark(run)
+        results[name] = {'seconds': seconds}
+        line = f"{name:<30} {seconds * 1e6:>12.3f} us/op"
+        if not real_tk and name.startswith('widget.'):
+            # Count the Tk calls one operation makes
+            tk = sys.modules['tkinter']
+            before = tk.counts.copy()
+            run()
+            ops = tk.counts - before
+            results[name]['widget_ops'] = sum(count for op, count in ops.items() if ' ' not in op)
+            line += f" {results[name]['widget_ops']:>6} widget ops/op"
+        print(line)
+
+    return {
+        'metadata': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'tk': 'real' if real_tk else 'fake',
+        },
+        'results': results,
+    }
+
+
+def compare_results(baseline: dict, current: dict, threshold: float):
+    """
+    Compare two result sets.
+
+    Args:
+        baseline (dict): Results from run_benchmarks to compare against
+        current (dict): Newer results
+        threshold (float): Allowed slowdown in percent
+
+    Returns:
+        list: (benchmark, metric, baseline, current, change %, regressed) for
+        each metric present in both
+    """
+    rows = []
+    for name, result in current['results'].items():
+        for metric, after in result.items():
+            before = baseline['results'].get(name, {}).get(metric)
+            if before is None:
+                continue
+            if before:
+                change = (after - before) / before * 100
+            else:
+                change = 0.0 if not after else float('inf')
+            rows.append((name, metric, before, after, change, change > threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='run benchmarks and save results as JSON')
+    run.add_argument('-o', '--output', help='write results to this JSON file')
+    run.add_argument('--real-tk', action='store_true', help='render with a real Tk (needs a display)')
+    run.add_argument('names', nargs='*', metavar='name',
+                     help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+
+    compare = commands.add_parser('compare', help='fail if results regressed against a baseline')
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    compare.add_argument('--threshold', type=float, default=10.0,
+                         help='allowed slowdown in percent (default: 10)')
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        unknown = set(args.names) - set(BENCHMARKS)
+        if unknown:
+            parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+        results = run_benchmarks(args.names, args.real_tk)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(results, f, indent=2)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    rows = compare_results(baseline, current, args.threshold)
+    print(f"{'benchmark':<30} | {'metric':<10} | {'baseline':>12} | {'current':>12} | {'change':>8}")
+    print("-" * 85)
+    for name, metric, before, after, change, regressed in rows:
+        if metric == 'seconds':
+            metric, before, after = 'us', before * 1e6, after * 1e6
+        flag = '  REGRESSED' if regressed else ''
+        print(f"{name:<30} | {metric:<10} | {before:>12.3f} | {after:>12.3f} | {change:>+7.1f}%{flag}")
+    regressions = [f"{row[0]} ({row[1]})" for row in rows if row[5]]
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than {args.threshold}%: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
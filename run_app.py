@@ -1,176 +1,263 @@
-import tkinter as tk
-from datetime import date, timedelta
-import calendar
+import os
+import sys
+from src.clock import today
 
-def get_work_week_number(current_date: date, start_date: date) -> int:
-    start_weekday = start_date.weekday()
-    adjusted_start = start_date - timedelta(days=start_weekday)
-    current_weekday = current_date.weekday()
-    adjusted_current = current_date - timedelta(days=current_weekday)
-    weeks_diff = (adjusted_current - adjusted_start).days // 7
-    week_num = weeks_diff + 1
-    return ((week_num - 1) % 52) + 1
 
-class WorkWeekCalendarWidget:
-    def __init__(self):
-        self.root = tk.Tk()
-        self.root.title("Work Week Calendar")
-        self.current_view = date.today()
-        self.root.attributes('-topmost', True)
-        self.root.overrideredirect(True)
-        
-        # Create main frame
-        self.frame = tk.Frame(self.root, bg='white', relief='solid', borderwidth=1)
-        self.frame.pack(padx=2, pady=2)
-        
-        # Add title bar
-        self.title_bar = tk.Frame(self.frame, bg='lightgray', relief='raised', height=20)
-        self.title_bar.pack(fill='x')
-        self.title_bar.pack_propagate(False)
-        
-        # Add title and close button
-        self.title_label = tk.Label(self.title_bar, text="Work Week Calendar", bg='lightgray')
-        self.title_label.pack(side='left', padx=5)
-        self.close_button = tk.Button(self.title_bar, text='×', command=self.root.quit,
-                                    bg='lightgray', bd=0, padx=5)
-        self.close_button.pack(side='right')
-        
-        # Calendar frame
-        self.calendar_frame = tk.Frame(self.frame, bg='white')
-        self.calendar_frame.pack(padx=10, pady=5)
-        
-        # Navigation frame
-        self.nav_frame = tk.Frame(self.frame, bg='white')
-        self.nav_frame.pack(fill='x', padx=5, pady=5)
-        
-        # Navigation buttons
-        self.prev_month = tk.Button(self.nav_frame, text="◀", command=self.previous_month,
-                                  bg='white', bd=1, width=4)
-        self.prev_month.pack(side='left', padx=2)
-        
-        self.today_button = tk.Button(self.nav_frame, text="Today", command=self.go_to_today,
-                                    bg='white', bd=1)
-        self.today_button.pack(side='left', padx=2, expand=True)
-        
-        self.next_month = tk.Button(self.nav_frame, text="▶", command=self.next_month,
-                                  bg='white', bd=1, width=4)
-        self.next_month.pack(side='right', padx=2)
-        
-        # Bind dragging
-        self.title_bar.bind('<Button-1>', self.start_drag)
-        self.title_bar.bind('<B1-Motion>', self.drag)
-        
-        self.update_calendar()
-        self.root.after(3600000, self.update_calendar)  # Update every hour
+def parse_args(argv=None):
+    import argparse
     
-    def start_drag(self, event):
-        self.x = event.x
-        self.y = event.y
+    parser = argparse.ArgumentParser(description="Work Week Calendar")
+    parser.add_argument('--rule', default='default',
+                        help="work week numbering: default, iso, 4-4-5, 4-5-4 or fiscal:MM-DD")
+    parser.add_argument('--new-instance', action='store_true',
+                        help='open another window even if one is already running')
+    holidays_help = ('.ics file of holidays to shade (repeatable; defaults to the '
+                     'WW_CALENDAR_HOLIDAYS path list)')
+    parser.add_argument('--holidays', action='append', metavar='ICS', help=holidays_help)
+    commands = parser.add_subparsers(dest='command')
+    # Subcommands repeat --rule and --holidays so they can also follow the
+    # subcommand; SUPPRESS keeps their defaults from replacing values given before it
 
-    def drag(self, event):
-        deltax = event.x - self.x
-        deltay = event.y - self.y
-        x = self.root.winfo_x() + deltax
-        y = self.root.winfo_y() + deltay
-        self.root.geometry(f"+{x}+{y}")
+    # Headless export: no Tk window or display needed
+    export = commands.add_parser('export', help='write work weeks to a file instead of showing the calendar')
+    export.add_argument('--format', choices=('csv', 'jsonl', 'ics'), default='csv')
+    export.add_argument('--per', choices=('day', 'week'), default='day',
+                        help='one row per date or per work week (ics is always per week)')
+    export.add_argument('--start-year', type=int, default=today().year)
+    export.add_argument('--end-year', type=int, help='defaults to --start-year')
+    export.add_argument('-o', '--output', help='output file (defaults to stdout)')
+    export.add_argument('--rule', default=argparse.SUPPRESS, help='work week numbering rule')
+    export.add_argument('--holidays', action='append', metavar='ICS', default=argparse.SUPPRESS,
+                        help='add a holidays column from an .ics file (repeatable)')
+
+    # Local HTTP/JSON service answering the same queries as the widget
+    serve = commands.add_parser('serve', help='run the local work week HTTP/JSON service')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--unix', metavar='PATH', help='listen on a Unix socket instead of TCP')
+    serve.add_argument('--holidays', action='append', metavar='ICS', default=argparse.SUPPRESS,
+                       help='report holidays from an .ics file (repeatable)')
+
+    # Add a work week column to a large CSV or log file
+    tag = commands.add_parser('tag', help='append a work week column to a CSV or log file')
+    tag.add_argument('input', help='file to tag')
+    tag.add_argument('-o', '--output', help='output file (defaults to stdout)')
+    tag.add_argument('--column', default='0',
+                     help='date/timestamp column: header name or 0-based index (default 0)')
+    tag.add_argument('--delimiter', default=',', help="field separator, e.g. '\\t' or ' ' for logs")
+    tag.add_argument('--no-header', dest='header', action='store_false',
+                     help='the first line is data (logs); --column must be an index')
+    tag.add_argument('--name', default='work_week', help='header of the added column')
+    tag.add_argument('--rule', default=argparse.SUPPRESS, help='work week numbering rule')
+    tag.add_argument('--workers', type=int, help='worker processes (defaults to the CPU count)')
+    tag.add_argument('--chunk-mb', type=float, default=8, help='megabytes per chunk')
+    tag.add_argument('--stats', action='store_true', help='print lines and MB/s to stderr')
+
+    # Count the events of a CSV or log file per work week
+    report = commands.add_parser('report', help='count events per work week (and category)')
+    report.add_argument('input', help='CSV or log file with a header line')
+    report.add_argument('--column', default='0', help='date/timestamp column: name or 0-based index')
+    report.add_argument('--category', help='column to count separately, e.g. host or status')
+    report.add_argument('--weight', help='numeric column to sum per week, e.g. duration')
+    report.add_argument('--start-year', type=int, default=today().year)
+    report.add_argument('--end-year', type=int, help='defaults to --start-year')
+    report.add_argument('--window', type=int, help='add a rolling sum over this many weeks')
+    report.add_argument('--format', choices=('csv', 'json'), default='csv')
+    report.add_argument('--delimiter', default=',', help="field separator, e.g. '\\t'")
+    report.add_argument('--rule', default=argparse.SUPPRESS, help='work week numbering rule')
+    report.add_argument('--workers', type=int, help='worker processes (defaults to the CPU count)')
+    report.add_argument('-o', '--output', help='output file (defaults to stdout)')
+
+    # Printable HTML/SVG calendars, one page per year
+    site = commands.add_parser('site', help='render a static HTML/SVG work week calendar site')
+    site.add_argument('-o', '--output', required=True, help='output directory')
+    site.add_argument('--start-year', type=int, default=today().year)
+    site.add_argument('--end-year', type=int, help='defaults to --start-year')
+    site.add_argument('--rule', default=argparse.SUPPRESS, help='work week numbering rule')
+    site.add_argument('--holidays', action='append', metavar='ICS', default=argparse.SUPPRESS,
+                      help='shade and list the holidays in an .ics file (repeatable)')
+    site.add_argument('--template', help='HTML page template with $title, $year, $months, ... placeholders')
+    site.add_argument('--title', default='Work Week Calendar', help='page title, e.g. the site name')
+    site.add_argument('--workers', type=int, help='worker processes (defaults to the CPU count)')
+    site.add_argument('--force', action='store_true', help='render every year, even if unchanged')
+
+    # Commands for the running window, e.g. from scripts or hotkeys
+    send = commands.add_parser('send', help='send a command to the running calendar window')
+    send.add_argument('words', nargs='+', metavar='command',
+                      help='show, today, next [N], prev [N], month YYYY-MM, week [YYYY] N, ping or quit')
+
+    args = parser.parse_args(argv)
+    for path in getattr(args, 'holidays', None) or ():
+        if not os.path.isfile(path):
+            parser.error(f"No such holiday file: {path}")
+    if args.command is None:
+        from src.week_rules import get_rule
+        try:
+            get_rule(args.rule)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.command == 'export':
+        if args.end_year is None:
+            args.end_year = args.start_year
+        if args.end_year < args.start_year:
+            parser.error("--end-year must not be before --start-year")
+        if args.output is None and sys.stdout is None:
+            parser.error("-o/--output is required when there is no console")
+    if args.command == 'report':
+        from importlib.util import find_spec
+        if find_spec('numpy') is None:
+            # WW_Calendar.spec leaves numpy out of the frozen build
+            parser.error("report needs numpy, which this build does not include; "
+                         "run it from Python instead: pip install numpy, then python run_app.py report")
+        args.delimiter = args.delimiter.encode().decode('unicode_escape')
+        if args.end_year is None:
+            args.end_year = args.start_year
+        if args.end_year < args.start_year:
+            parser.error("--end-year must not be before --start-year")
+        if args.window is not None and args.window < 1:
+            parser.error("--window must be at least 1")
+        if not os.path.isfile(args.input):
+            parser.error(f"No such file: {args.input}")
+    if args.command == 'site':
+        if args.end_year is None:
+            args.end_year = args.start_year
+        if args.end_year < args.start_year:
+            parser.error("--end-year must not be before --start-year")
+        if args.template is not None and not os.path.isfile(args.template):
+            parser.error(f"No such template: {args.template}")
+    if args.command in ('export', 'tag', 'report', 'site'):
+        from src.week_rules import get_rule
+        try:
+            get_rule(args.rule)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.command == 'tag':
+        args.delimiter = args.delimiter.encode().decode('unicode_escape')
+        if not os.path.isfile(args.input):
+            parser.error(f"No such file: {args.input}")
+        if not args.header and not args.column.isdigit():
+            parser.error("--no-header needs --column as a 0-based index")
+    if args.command in ('tag', 'report') and args.output is None and sys.stdout is None:
+        parser.error("-o/--output is required when there is no console")
+    if args.command == 'send':
+        from src.single_instance import parse_command
+        args.line = ' '.join(args.words)
+        try:
+            parse_command(args.line)
+        except ValueError as e:
+            parser.error(str(e))
+    return args
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv:
+        # Plain launch (e.g. at logon): raise the running window if there is
+        # one, before loading tkinter; otherwise show ours without argparse
+        from src.single_instance import notify_running_instance
+        if notify_running_instance():
+            return
+        from src.calendar_widget import main as run_calendar
+        run_calendar()
+        return
     
-    def previous_month(self):
-        year = self.current_view.year
-        month = self.current_view.month
-        if month == 1:
-            year -= 1
-            month = 12
+    args = parse_args(argv)
+    if args.command == 'export':
+        from src.export import export_work_weeks
+        from src.holidays import HolidayCalendar, get_holiday_paths
+        holidays = None
+        paths = get_holiday_paths(args.holidays)
+        if paths:
+            calendar = HolidayCalendar(paths)
+            calendar.reload()
+            holidays = calendar.index
+        if args.output is None:
+            export_work_weeks(sys.stdout, args.format, args.start_year, args.end_year, args.per,
+                              holidays, args.rule)
         else:
-            month -= 1
-        self.current_view = self.current_view.replace(year=year, month=month, day=1)
-        self.update_calendar()
-    
-    def next_month(self):
-        year = self.current_view.year
-        month = self.current_view.month
-        if month == 12:
-            year += 1
-            month = 1
+            with open(args.output, 'w', newline='', encoding='utf-8') as out:
+                export_work_weeks(out, args.format, args.start_year, args.end_year, args.per,
+                                  holidays, args.rule)
+        return
+    if args.command == 'site':
+        from src.calendar_site import build_site
+        from src.holidays import HolidayCalendar, get_holiday_paths
+        holidays = None
+        paths = get_holiday_paths(args.holidays)
+        if paths:
+            calendar = HolidayCalendar(paths)
+            calendar.reload()
+            holidays = calendar.index
+        template = None
+        if args.template is not None:
+            with open(args.template, encoding='utf-8') as f:
+                template = f.read()
+        report = build_site(args.output, args.start_year, args.end_year, args.rule, holidays,
+                            template, args.title, args.workers, args.force)
+        for year, seconds in sorted(report.rendered.items()):
+            print(f"{year}: {seconds * 1000:.1f} ms")
+        print(f"{len(report.rendered)} years rendered, {len(report.skipped)} unchanged, "
+              f"{report.seconds:.2f} s with {report.workers} workers")
+        return
+    if args.command == 'tag':
+        import time
+        from src.tagger import tag_file
+        started = time.perf_counter()
+        options = dict(column=args.column, delimiter=args.delimiter, header=args.header,
+                       rule=args.rule, workers=args.workers, name=args.name,
+                       chunk_bytes=int(args.chunk_mb * 1024 * 1024))
+        try:
+            if args.output is None:
+                stats = tag_file(args.input, sys.stdout.buffer, **options)
+            else:
+                with open(args.output, 'wb') as out:
+                    stats = tag_file(args.input, out, **options)
+        except ValueError as e:
+            sys.exit(str(e))
+        if args.stats:
+            seconds = time.perf_counter() - started
+            print(f"{stats.lines} lines ({stats.untagged} without a date), "
+                  f"{stats.bytes_read / 1e6:.1f} MB in {seconds:.2f} s, "
+                  f"{stats.bytes_read / 1e6 / seconds:.1f} MB/s", file=sys.stderr)
+        return
+    if args.command == 'report':
+        from src.report import aggregate_file
+        try:
+            result = aggregate_file(args.input, args.start_year, args.end_year, args.column,
+                                    args.category, args.weight, args.delimiter, args.rule,
+                                    args.workers)
+        except ValueError as e:
+            sys.exit(str(e))
+        if args.output is None:
+            result.write(sys.stdout, args.format, args.window)
         else:
-            month += 1
-        self.current_view = self.current_view.replace(year=year, month=month, day=1)
-        self.update_calendar()
-    
-    def go_to_today(self):
-        self.current_view = date.today()
-        self.update_calendar()
+            with open(args.output, 'w', newline='', encoding='utf-8') as out:
+                result.write(out, args.format, args.window)
+        return
+    if args.command == 'send':
+        from src.single_instance import send_command
+        try:
+            reply = send_command(args.line)
+        except (OSError, ValueError):
+            sys.exit("No calendar window is running")
+        print(reply)
+        sys.exit(0 if reply == 'ok' else 1)
+    if args.command == 'serve':
+        from src.server import serve
+        from src.holidays import get_holiday_paths
+        serve(args.host, args.port, args.unix, get_holiday_paths(args.holidays))
+        return
+
+    from src.calendar_widget import main as run_calendar
+    run_calendar(args.rule, single_instance=not args.new_instance, holidays=args.holidays)
 
-    def update_calendar(self):
-        for widget in self.calendar_frame.winfo_children():
-            widget.destroy()
-        
-        today = date.today()
-        year = self.current_view.year
-        month = self.current_view.month
-        
-        # Get first Monday of the year
-        year_start = date(year, 1, 1)
-        first_monday = year_start - timedelta(days=year_start.weekday())
-        
-        # Headers
-        days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-        for i, day in enumerate(days):
-            tk.Label(self.calendar_frame, text=day, bg='white',
-                    width=4).grid(row=0, column=i+1)
-        tk.Label(self.calendar_frame, text='WW', bg='white',
-                width=4).grid(row=0, column=0)
-        
-        # Calendar
-        cal = calendar.monthcalendar(year, month)
-        
-        # Previous month info
-        if month == 1:
-            prev_month = 12
-            prev_year = year - 1
-        else:
-            prev_month = month - 1
-            prev_year = year
-        prev_month_days = calendar.monthrange(prev_year, prev_month)[1]
-        
-        # Display calendar
-        for week_idx, week in enumerate(cal):
-            if any(week):
-                # Get work week number
-                for day in week:
-                    if day != 0:
-                        week_date = date(year, month, day)
-                        ww = get_work_week_number(week_date, first_monday)
-                        break
-                
-                tk.Label(self.calendar_frame, text=f"WW{ww}",
-                        bg='white').grid(row=week_idx+1, column=0)
-                
-                for day_idx, day in enumerate(week):
-                    if day == 0:
-                        if day_idx < week.index(next(iter([d for d in week if d != 0]), 0)):
-                            prev_day = prev_month_days - (week.index(next(iter([d for d in week if d != 0]), 0)) - day_idx - 1)
-                            text = str(prev_day)
-                            bg_color = 'lightgray'
-                        else:
-                            next_day = day_idx - week.index(next(iter([d for d in week if d != 0][::-1]), 0))
-                            text = str(next_day)
-                            bg_color = 'lightgray'
-                    else:
-                        text = str(day)
-                        bg_color = 'lightblue' if (day == today.day and 
-                                                 month == today.month and 
-                                                 year == today.year) else 'white'
-                    
-                    tk.Label(self.calendar_frame, text=text, bg=bg_color,
-                            width=4).grid(row=week_idx+1, column=day_idx+1)
-        
-        # Month/year header
-        month_name = calendar.month_name[month]
-        tk.Label(self.calendar_frame, text=f"{month_name} {year}",
-                bg='white', font=('Arial', 10, 'bold')).grid(row=7, column=0, columnspan=8)
 
 if __name__ == "__main__":
-    app = WorkWeekCalendarWidget()
-    screen_width = app.root.winfo_screenwidth()
-    app.root.geometry(f"+{screen_width-300}+50")
-    app.root.mainloop()
\ No newline at end of file
+    if getattr(sys, 'frozen', False):
+        # tag, report and site start worker processes, which re-run this
+        # executable; let them run their task instead of the command line.
+        # Only imported when frozen: multiprocessing adds ~25 ms to startup
+        import multiprocessing
+        multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,318 @@
+"""
+Static HTML and SVG work week calendars, one printable page per year.
+
+Each year is rendered from the same MonthGrid model as the widget: an HTML
+page of twelve month tables with a WW column, and an SVG drawing of the
+same months for printing. Years are rendered in parallel worker processes,
+each writing its own files.
+
+A manifest in the output directory keeps a content hash of every year's
+inputs: the numbering rule, the holidays overlapping the year, the page
+template and the site title. The next build only renders the years whose
+hash changed or whose files are missing, so editing one holiday rebuilds
+the year it falls in and nothing else.
+"""
+import hashlib
+import html
+import json
+import os
+import time
+from datetime import date
+from string import Template
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from src.theme import (BLOCK_HEIGHT, BLOCK_WIDTH, CELL_HEIGHT, CELL_WIDTH, HOLIDAY_COLOR, MARGIN,
+                       MONTHS_PER_ROW, OTHER_MONTH_COLOR, TITLE_HEIGHT)
+
+GENERATOR_VERSION = 1  # Bump when the rendered output changes, to rebuild every year
+MANIFEST_FILE = 'manifest.json'
+INDEX_FILE = 'index.html'
+
+_WEEKDAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+_MONTH_NAMES = ('January', 'February', 'March', 'April', 'May', 'June', 'July', 'August',
+                'September', 'October', 'November', 'December')
+
+# Placeholders: $title, $year, $rule, $nav, $months, $svg and $holidays
+DEFAULT_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>$title $year</title>
+<style>
+body { font-family: Arial, sans-serif; margin: 1em; }
+nav a { margin-right: 1em; }
+.months { display: grid; grid-template-columns: repeat(3, max-content); gap: 1em 2em; }
+table { border-collapse: collapse; font-size: 10pt; }
+caption { font-weight: bold; padding: 4px; }
+th, td { width: 2.2em; text-align: center; padding: 1px; }
+th.ww { color: #555; }
+td.other { background: lightgray; }
+td.holiday { background: mistyrose; }
+@media print { nav { display: none; } .months { gap: 0.5em 1em; } }
+</style>
+</head>
+<body>
+<h1>$title $year</h1>
+<nav>$nav</nav>
+<p>Work weeks: $rule rule. <a href="$svg">Printable SVG</a></p>
+<div class="months">
+$months
+</div>
+$holidays
+</body>
+</html>
+"""
+
+
+class YearJob(NamedTuple):
+    """Everything a worker needs to render one year; picklable."""
+    year: int
+    rule: str  # Rule name, see src/week_rules.py
+    title: str
+    template: str
+    events: Tuple  # Holiday Events overlapping the year's month grids
+    out_dir: str
+    prev_year: Optional[int]  # Neighbouring years on the site, for the page links
+    next_year: Optional[int]
+
+
+class SiteReport(NamedTuple):
+    rendered: Dict[int, float]  # Year -> seconds spent rendering it
+    skipped: List[int]  # Years whose inputs did not change
+    seconds: float  # Wall time of the whole build
+    workers: int
+
+
+def year_span(year: int) -> Tuple[int, int]:
+    """Get the ordinals of the first and last day shown in a year's month grids."""
+    first = date(year, 1, 1)
+    last = date(year, 12, 31)
+    return first.toordinal() - first.weekday(), last.toordinal() + 6 - last.weekday()
+
+
+def year_files(year: int) -> Tuple[str, str]:
+    return f"{year}.html", f"{year}.svg"
+
+
+def year_hash(job: YearJob) -> str:
+    """Hash the inputs of a year's pages."""
+    inputs = [GENERATOR_VERSION, job.year, job.rule, job.title, job.template,
+              [list(event) for event in job.events], job.prev_year, job.next_year]
+    return hashlib.sha256(json.dumps(inputs).encode()).hexdigest()
+
+
+def _month_grids(year: int, rule: str):
+    from src.month_grid import get_month_grid
+    from src.week_rules import get_rule
+
+    rule = get_rule(rule)
+    return [get_month_grid(year, month, rule=rule) for month in range(1, 13)]
+
+
+def _cell_classes(grid, holidays, week_idx: int, day_idx: int) -> Tuple[str, List[str]]:
+    """Get a cell's CSS class ('other', 'holiday' or '') and holiday names."""
+    if not grid.in_month[week_idx][day_idx]:
+        return 'other', []
+    names = holidays.summaries(grid.date_at(week_idx, day_idx))
+    return ('holiday' if names else ''), names
+
+
+def render_month_table(grid, holidays) -> str:
+    """Render a month grid as an HTML table with a WW column."""
+    lines = [f"<table class=\"month\"><caption>{_MONTH_NAMES[grid.month - 1]} {grid.year}</caption>",
+             "<tr><th>WW</th>" + "".join(f"<th>{name}</th>" for name in _WEEKDAYS) + "</tr>"]
+    for week_idx, days in enumerate(grid.days):
+        cells = [f"<th class=\"ww\">WW{grid.week_nums[week_idx]}</th>"]
+        for day_idx, day in enumerate(days):
+            css, names = _cell_classes(grid, holidays, week_idx, day_idx)
+            attributes = f" class=\"{css}\"" if css else ''
+            if names:
+                attributes += f" title=\"{html.escape('; '.join(names))}\""
+            cells.append(f"<td{attributes}>{day}</td>")
+        lines.append("<tr>" + "".join(cells) + "</tr>")
+    lines.append("</table>")
+    return "\n".join(lines)
+
+
+def render_svg(grids, holidays, title: str) -> str:
+    """Draw a year's month grids as an SVG, three months per row."""
+    rows = (len(grids) + MONTHS_PER_ROW - 1) // MONTHS_PER_ROW
+    width = MONTHS_PER_ROW * BLOCK_WIDTH + (MONTHS_PER_ROW + 1) * MARGIN
+    height = TITLE_HEIGHT + rows * (BLOCK_HEIGHT + MARGIN) + MARGIN
+    parts = [f"<svg xmlns=\"http://www.w3.org/2000/svg\" width=\"{width}\" height=\"{height}\" "
+             f"viewBox=\"0 0 {width} {height}\" font-family=\"Arial, sans-serif\" font-size=\"10\">",
+             f"<rect width=\"{width}\" height=\"{height}\" fill=\"white\"/>",
+             f"<text x=\"{MARGIN}\" y=\"{TITLE_HEIGHT - 6}\" font-size=\"14\" "
+             f"font-weight=\"bold\">{html.escape(title)}</text>"]
+    for index, grid in enumerate(grids):
+        left = MARGIN + (index % MONTHS_PER_ROW) * (BLOCK_WIDTH + MARGIN)
+        top = TITLE_HEIGHT + MARGIN + (index // MONTHS_PER_ROW) * (BLOCK_HEIGHT + MARGIN)
+        parts.append(f"<text x=\"{left + BLOCK_WIDTH // 2}\" y=\"{top + TITLE_HEIGHT - 8}\" "
+                     f"text-anchor=\"middle\" font-weight=\"bold\">"
+                     f"{_MONTH_NAMES[grid.month - 1]} {grid.year}</text>")
+        y = top + TITLE_HEIGHT
+        for column, name in enumerate(('WW',) + _WEEKDAYS):
+            parts.append(f"<text x=\"{left + column * CELL_WIDTH + CELL_WIDTH // 2}\" "
+                         f"y=\"{y + CELL_HEIGHT - 5}\" text-anchor=\"middle\" fill=\"#555\">{name}</text>")
+        for week_idx, days in enumerate(grid.days):
+            y = top + TITLE_HEIGHT + (week_idx + 1) * CELL_HEIGHT
+            parts.append(f"<text x=\"{left + CELL_WIDTH // 2}\" y=\"{y + CELL_HEIGHT - 5}\" "
+                         f"text-anchor=\"middle\" fill=\"#555\">{grid.week_nums[week_idx]}</text>")
+            for day_idx, day in enumerate(days):
+                x = left + (day_idx + 1) * CELL_WIDTH
+                css, names = _cell_classes(grid, holidays, week_idx, day_idx)
+                fill = {'other': OTHER_MONTH_COLOR, 'holiday': HOLIDAY_COLOR}.get(css)
+                if fill:
+                    tooltip = f"<title>{html.escape('; '.join(names))}</title>" if names else ''
+                    parts.append(f"<rect x=\"{x}\" y=\"{y}\" width=\"{CELL_WIDTH}\" "
+                                 f"height=\"{CELL_HEIGHT}\" fill=\"{fill}\">{tooltip}</rect>")
+                parts.append(f"<text x=\"{x + CELL_WIDTH // 2}\" y=\"{y + CELL_HEIGHT - 5}\" "
+                             f"text-anchor=\"middle\">{day}</text>")
+    parts.append("</svg>")
+    return "\n".join(parts) + "\n"
+
+
+def render_holiday_list(events) -> str:
+    """List a year's holidays as HTML."""
+    if not events:
+        return ''
+    items = []
+    for event in events:
+        when = event.start_date.isoformat()
+        if event.end > event.start:
+            when += f" &ndash; {event.end_date.isoformat()}"
+        items.append(f"<li>{when}: {html.escape(event.summary)}</li>")
+    return "<h2>Holidays</h2>\n<ul>\n" + "\n".join(items) + "\n</ul>"
+
+
+def render_year(job: YearJob) -> Tuple[int, float]:
+    """
+    Render and write one year's HTML and SVG pages (run in worker processes).
+
+    Returns:
+        Tuple[int, float]: The year and the seconds it took
+    """
+    from src.holidays import HolidayIndex
+
+    started = time.perf_counter()
+    holidays = HolidayIndex(job.events, presorted=True)
+    grids = _month_grids(job.year, job.rule)
+    html_file, svg_file = year_files(job.year)
+    nav = []
+    if job.prev_year is not None:
+        nav.append(f"<a href=\"{job.prev_year}.html\">&larr; {job.prev_year}</a>")
+    nav.append(f"<a href=\"{INDEX_FILE}\">All years</a>")
+    if job.next_year is not None:
+        nav.append(f"<a href=\"{job.next_year}.html\">{job.next_year} &rarr;</a>")
+    page = Template(job.template).safe_substitute(
+        title=html.escape(job.title), year=job.year, rule=html.escape(job.rule), nav=" ".join(nav),
+        months="\n".join(render_month_table(grid, holidays) for grid in grids), svg=svg_file,
+        holidays=render_holiday_list(job.events))
+    _write_file(os.path.join(job.out_dir, html_file), page)
+    _write_file(os.path.join(job.out_dir, svg_file),
+                render_svg(grids, holidays, f"{job.title} {job.year}"))
+    return job.year, time.perf_counter() - started
+
+
+def _write_file(path: str, text: str):
+    """Write a file atomically, so a reader never sees half a page."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def load_manifest(out_dir: str) -> dict:
+    """Read the manifest of a previous build; empty if there is none or it is unreadable."""
+    try:
+        with open(os.path.join(out_dir, MANIFEST_FILE), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def build_site(out_dir: str, start_year: int, end_year: int, rule=None, holidays=None,
+               template: Optional[str] = None, title: str = "Work Week Calendar",
+               workers: Optional[int] = None, force: bool = False) -> SiteReport:
+    """
+    Render the years of a calendar site whose inputs changed since the last build.
+
+    Args:
+        out_dir (str): Output directory, created if needed
+        start_year (int): First year
+        end_year (int): Last year
+        rule: Numbering rule or its name (see src/week_rules.py)
+        holidays (HolidayIndex): Holidays to shade and list
+        template (str): Page template (see DEFAULT_TEMPLATE for the placeholders)
+        title (str): Site title, e.g. the site or team name
+        workers (int): Worker processes; 1 renders in this process, None uses all CPUs
+        force (bool): Render every year, even if unchanged
+
+    Returns:
+        SiteReport: Per-year render times, the years skipped and the wall time
+
+    Raises:
+        ValueError: If end_year is before start_year or the rule is unknown
+    """
+    from src.week_rules import get_rule
+
+    if end_year < start_year:
+        raise ValueError(f"end_year {end_year} is before start_year {start_year}")
+    started = time.perf_counter()
+    rule_name = get_rule(rule).name
+    template = DEFAULT_TEMPLATE if template is None else template
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(out_dir, exist_ok=True)
+    built = load_manifest(out_dir)
+    built_years = built.get('years', {}) if built.get('version') == GENERATOR_VERSION else {}
+
+    years = list(range(start_year, end_year + 1))
+    hashes = {}
+    jobs = []
+    skipped = []
+    for year in years:
+        events = tuple(holidays.overlapping(*year_span(year))) if holidays else ()
+        job = YearJob(year, rule_name, title, template, events, out_dir,
+                      year - 1 if year > start_year else None, year + 1 if year < end_year else None)
+        hashes[year] = year_hash(job)
+        entry = built_years.get(str(year), {})
+        if (not force and entry.get('hash') == hashes[year]
+                and all(os.path.exists(os.path.join(out_dir, name)) for name in year_files(year))):
+            skipped.append(year)
+        else:
+            jobs.append(job)
+
+    rendered = {}
+    if workers == 1 or len(jobs) <= 1:
+        for job in jobs:
+            year, seconds = render_year(job)
+            rendered[year] = seconds
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(min(workers, len(jobs))) as pool:
+            for year, seconds in pool.map(render_year, jobs):
+                rendered[year] = seconds
+
+    # Years outside this build's range keep their entries, so sites can be built in parts
+    manifest_years = dict(built_years)
+    for year in years:
+        seconds = rendered.get(year, built_years.get(str(year), {}).get('render_s'))
+        manifest_years[str(year)] = {'hash': hashes[year], 'files': list(year_files(year)),
+                                     'render_s': seconds}
+    _write_file(os.path.join(out_dir, INDEX_FILE),
+                render_index(title, sorted(int(year) for year in manifest_years)))
+    _write_file(os.path.join(out_dir, MANIFEST_FILE),
+                json.dumps({'version': GENERATOR_VERSION, 'rule': rule_name, 'title': title,
+                            'years': manifest_years}, indent=1, sort_keys=True))
+    return SiteReport(rendered, skipped, time.perf_counter() - started, workers)
+
+
+def render_index(title: str, years: Sequence[int]) -> str:
+    """Render the page linking to every year."""
+    links = "\n".join(f"<li><a href=\"{year}.html\">{year}</a> "
+                      f"(<a href=\"{year}.svg\">SVG</a>)</li>" for year in years)
+    return (f"<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n<meta charset=\"utf-8\">\n"
+            f"<title>{html.escape(title)}</title>\n</head>\n<body>\n<h1>{html.escape(title)}</h1>\n"
+            f"<ul>\n{links}\n</ul>\n</body>\n</html>\n")
@@ -1,18 +1,54 @@
 import tkinter as tk
-from datetime import date, timedelta
-import calendar
-from main import get_work_week_number
+from datetime import date
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.clock import get_clock
+from src.first_paint import get_cache_dir, load_snapshot, save_snapshot
+from src.theme import HOLIDAY_COLOR, MAX_WEEKS, OTHER_MONTH_COLOR, TODAY_COLOR
+from src.workers import WORKER_THREADS, WorkerPool
+
+# The calendar modules (month_grid, week_rules, refresh_scheduler) are imported
+# where they are first used, so a cached month can be painted before they load
+
+DRAG_FRAME_MS = 16  # Apply at most one window move per frame (~60 Hz)
+PROFILED_METHODS = ('update_calendar', 'drag', 'move_window', 'previous_month', 'next_month')
+PROFILE_RENDERS = 20  # Renders captured with cProfile by the hidden key
+STATS_INTERVAL_MS = 60000  # Default period of WW_CALENDAR_STATS snapshots
+HOLIDAY_CHECK_MS = 60000  # How often the holiday files are checked for changes
+COMMAND_EVENT = '<<InstanceCommand>>'  # Sent when another launch queued a command
 
 class WorkWeekCalendarWidget:
-    def __init__(self):
+    def __init__(self, rule=None, holidays=None, workers=WORKER_THREADS, clock=None):
         self.root = tk.Tk()
         self.root.title("Work Week Calendar")
         
-        # Initialize current view date
-        self.current_view = date.today()
+        # Today's date is read from the clock (see src/clock.py), so tests can fix it
+        self.clock = clock or get_clock()
+        
+        # Months and holiday files are loaded on worker threads; their results
+        # are applied from the main loop (workers=0 loads them in place)
+        self.workers = WorkerPool(self.root.after, self.root.after_cancel, workers)
+        
+        # Initialize current view date and work week numbering rule
+        self.current_view = self.clock.today()
+        self.rule_spec = rule
+        self._rule = None
+        self.rule_name = getattr(rule, 'name', rule) or 'default'
+        self.snapshot_month = None
+        self.scheduler = None
+        self.profiler = None
+        self.year_window = None
+        self.year_view = None
+        self.holiday_paths = holidays
+        self.holiday_calendar = None
+        self.holidays = None
+        self.drag_offset = (0, 0)
+        self.drag_target = None
+        self.drag_after_id = None
+        self.window_pos = None
+        self.drag_events = 0
+        self.geometry_calls = 0
         
         # Make window stay on top
         self.root.attributes('-topmost', True)
@@ -41,46 +77,226 @@ class WorkWeekCalendarWidget:
         # Create calendar display
         self.calendar_frame = tk.Frame(self.frame, bg='white')
         self.calendar_frame.pack(padx=10, pady=5)
+        self.create_calendar_grid()
         
         # Create navigation frame
         self.nav_frame = tk.Frame(self.frame, bg='white')
         self.nav_frame.pack(fill='x', padx=5, pady=5)
         
         # Add navigation buttons
-        self.prev_month = tk.Button(self.nav_frame, text="◀", command=self.previous_month,
-                                  bg='white', bd=1, width=4)
-        self.prev_month.pack(side='left', padx=2)
+        self.prev_button = tk.Button(self.nav_frame, text="◀", bg='white', bd=1, width=4)
+        self.prev_button.pack(side='left', padx=2)
         
         self.today_button = tk.Button(self.nav_frame, text="Today", command=self.go_to_today,
                                     bg='white', bd=1)
         self.today_button.pack(side='left', padx=2, expand=True)
         
-        self.next_month = tk.Button(self.nav_frame, text="▶", command=self.next_month,
-                                  bg='white', bd=1, width=4)
-        self.next_month.pack(side='right', padx=2)
+        # Work week entry: type "37" or "2026 WW37" and press Enter to jump
+        self.week_entry = tk.Entry(self.nav_frame, width=8, bg='white', bd=1)
+        self.week_entry.pack(side='left', padx=2)
+        self.week_entry.bind('<Return>', self.on_week_entry)
+        
+        self.next_button = tk.Button(self.nav_frame, text="▶", bg='white', bd=1, width=4)
+        self.next_button.pack(side='right', padx=2)
+        
+        # Year-at-a-glance window, drawn on a canvas
+        self.year_button = tk.Button(self.nav_frame, text="Year", command=self.toggle_year_view,
+                                   bg='white', bd=1)
+        self.year_button.pack(side='right', padx=2)
+        
+        # Connect navigation and dragging
+        self.bind_events()
+        
+        # Hidden keys: Ctrl+Alt+S turns profiling on, then saves its stats;
+        # Ctrl+Alt+P profiles the next renders with cProfile
+        self.root.bind('<Control-Alt-s>', self.on_stats_key)
+        self.root.bind('<Control-Alt-p>', self.on_profile_key)
+        
+        # WW_CALENDAR_STATS=path writes the stats there every
+        # WW_CALENDAR_STATS_INTERVAL seconds (default 60)
+        stats_path = os.environ.get('WW_CALENDAR_STATS')
+        if stats_path:
+            self.enable_profiling()
+            interval_s = float(os.environ.get('WW_CALENDAR_STATS_INTERVAL') or STATS_INTERVAL_MS / 1000)
+            self.root.after(int(interval_s * 1000), self.write_stats_periodically,
+                            stats_path, int(interval_s * 1000))
+        # WW_CALENDAR_FIRST_PAINT_FILE=path records when the main loop draws
+        # the first frame there, then exits (benchmarks/bench_startup.py)
+        first_paint_path = os.environ.get('WW_CALENDAR_FIRST_PAINT_FILE')
+        if first_paint_path:
+            from src.profiling import record_first_paint
+            self.root.after(0, record_first_paint, self.root, first_paint_path)
         
-        # Bind mouse events for dragging
+        # Paint the month saved by the last run if it is still this month; the
+        # calendar modules are loaded and the month recomputed once Tk is idle
+        snapshot = load_snapshot(self.current_view.year, self.current_view.month, self.rule_name)
+        if snapshot is not None:
+            self.paint(snapshot, snapshot.title)
+            self.root.after_idle(self.finish_startup)
+        else:
+            self.finish_startup()
+    
+    @property
+    def rule(self):
+        """The work week numbering rule, resolved on first use."""
+        if self._rule is None:
+            from src.week_rules import get_rule
+            self._rule = get_rule(self.rule_spec)
+        return self._rule
+    
+    def finish_startup(self):
+        """Render the current month and start the day change timer."""
+        from src.refresh_scheduler import DayChangeScheduler
+        
+        # The first paint does not wait for a worker
+        self.update_calendar(background=False)
+        
+        # Refresh when the date changes; also re-check on mouse enter, which
+        # catches up right away after a suspend/resume
+        self.scheduler = DayChangeScheduler(self.root.after, self.root.after_cancel,
+                                            self.on_day_change, now=self.clock.now)
+        if self.profiler is not None:
+            self.profiler.instrument(self.scheduler, ('wake', 'check'), 'scheduler.')
+        self.scheduler.start()
+        self.frame.bind('<Enter>', lambda event: self.scheduler.check())
+        
+        # Holiday files (--holidays or WW_CALENDAR_HOLIDAYS) load in the background
+        from src.holidays import HolidayCalendar, get_holiday_paths
+        paths = get_holiday_paths(self.holiday_paths)
+        if paths:
+            self.holiday_calendar = HolidayCalendar(paths)
+            self.check_holidays()
+    
+    def check_holidays(self):
+        """Reload changed holiday files off the Tk thread, then check again later."""
+        if not self.workers.is_pending('holidays'):
+            self.workers.submit(self.holiday_calendar.reload, key='holidays',
+                                on_done=self.on_holidays_reloaded)
+        self.root.after(HOLIDAY_CHECK_MS, self.check_holidays)
+    
+    def on_holidays_reloaded(self, changed):
+        """Apply a finished holiday reload."""
+        if changed:
+            self.set_holidays(self.holiday_calendar.index)
+    
+    def set_holidays(self, index):
+        """Shade the days of a new HolidayIndex."""
+        self.holidays = index
+        self.update_calendar()
+        if self.year_view is not None:
+            self.year_view.set_holidays(index)
+    
+    def bind_events(self):
+        """Connect the buttons and drag bindings to the current handlers."""
+        # Called again when profiling wraps the handlers, since Tk keeps the
+        # callables it was given
+        self.prev_button.configure(command=self.previous_month)
+        self.next_button.configure(command=self.next_month)
         self.title_bar.bind('<Button-1>', self.start_drag)
         self.title_bar.bind('<B1-Motion>', self.drag)
+        self.title_bar.bind('<ButtonRelease-1>', self.end_drag)
+    
+    def enable_profiling(self):
+        """Start timing the event handlers and the refresh timer."""
+        if self.profiler is not None:
+            return
+        from src.profiling import Profiler
         
-        # Update calendar
-        self.update_calendar()
+        self.profiler = Profiler()
+        self.profiler.instrument(self, PROFILED_METHODS)
+        if self.scheduler is not None:
+            self.profiler.instrument(self.scheduler, ('wake', 'check'), 'scheduler.')
+        self.bind_events()
+    
+    def disable_profiling(self):
+        """Stop timing and restore the plain handlers."""
+        if self.profiler is None:
+            return
+        self.profiler.remove()
+        self.profiler = None
+        self.bind_events()
+    
+    def write_stats(self, path=None):
+        """
+        Write the profiling stats as JSON.
+        
+        Args:
+            path (str): Output file (defaults to stats.json in the cache directory)
+        
+        Returns:
+            str: The file written
+        """
+        from src.profiling import count_widgets
         
-        # Set up auto-refresh every hour
-        self.root.after(3600000, self.update_calendar)  # 3600000 ms = 1 hour
+        path = path or os.path.join(get_cache_dir(), 'stats.json')
+        self.profiler.write_snapshot(path, widgets=count_widgets(self.root),
+                                     workers=self.workers.stats())
+        return path
+    
+    def write_stats_periodically(self, path, interval_ms):
+        """Timer callback for WW_CALENDAR_STATS."""
+        if self.profiler is None:
+            return
+        try:
+            self.write_stats(path)
+        except OSError:
+            pass
+        self.root.after(interval_ms, self.write_stats_periodically, path, interval_ms)
+    
+    def show_status(self, text, ms=3000):
+        """Show a short message in the title bar."""
+        self.title_label.configure(text=text)
+        self.root.after(ms, lambda: self.title_label.configure(text="Work Week Calendar"))
+    
+    def on_stats_key(self, event=None):
+        """Hidden key: start profiling, or save the stats collected so far."""
+        if self.profiler is None:
+            self.enable_profiling()
+            self.show_status("Profiling on")
+            return
+        try:
+            self.write_stats()
+            self.show_status("Stats saved")
+        except OSError:
+            self.root.bell()
+    
+    def on_profile_key(self, event=None):
+        """Hidden key: profile the next renders with cProfile."""
+        self.enable_profiling()
+        path = os.path.join(get_cache_dir(), 'renders.prof')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.profiler.capture('update_calendar', PROFILE_RENDERS, path)
+        self.show_status(f"Profiling {PROFILE_RENDERS} renders")
     
     def start_drag(self, event):
         """Store initial position for drag operation."""
-        self.x = event.x
-        self.y = event.y
+        # Ask the window manager where the window is once per drag; motion
+        # events then place it relative to the pointer without round-trips
+        self.window_pos = (self.root.winfo_x(), self.root.winfo_y())
+        self.drag_offset = (event.x_root - self.window_pos[0], event.y_root - self.window_pos[1])
 
     def drag(self, event):
         """Handle window dragging."""
-        deltax = event.x - self.x
-        deltay = event.y - self.y
-        x = self.root.winfo_x() + deltax
-        y = self.root.winfo_y() + deltay
-        self.root.geometry(f"+{x}+{y}")
+        # Only remember where the window should go; motion events arriving
+        # within one frame are coalesced into a single move
+        self.drag_events += 1
+        self.drag_target = (event.x_root - self.drag_offset[0], event.y_root - self.drag_offset[1])
+        if self.drag_after_id is None:
+            self.drag_after_id = self.root.after(DRAG_FRAME_MS, self.move_window)
+    
+    def end_drag(self, event=None):
+        """Move the window to where the drag ended without waiting for the next frame."""
+        if self.drag_after_id is not None:
+            self.root.after_cancel(self.drag_after_id)
+            self.move_window()
+    
+    def move_window(self):
+        """Apply the latest drag position."""
+        self.drag_after_id = None
+        if self.drag_target is not None and self.drag_target != self.window_pos:
+            self.window_pos = self.drag_target
+            self.root.geometry(f"+{self.window_pos[0]}+{self.window_pos[1]}")
+            self.geometry_calls += 1
     
     def previous_month(self):
         """Go to previous month."""
@@ -108,24 +324,111 @@ class WorkWeekCalendarWidget:
     
     def go_to_today(self):
         """Return to current month."""
-        self.current_view = date.today()
+        self.current_view = self.clock.today()
+        self.update_calendar()
+
+    def show_month(self, year, month):
+        """Go to a month."""
+        self.current_view = date(year, month, 1)
         self.update_calendar()
+    
+    def handle_command(self, name, args):
+        """Run a command from another launch or a script (see src/single_instance.py)."""
+        if name == 'show':
+            self.root.deiconify()
+            self.root.lift()
+            self.go_to_today()
+        elif name == 'today':
+            self.go_to_today()
+        elif name in ('next', 'prev'):
+            from src.month_grid import shift_month
+            delta = args[0] if name == 'next' else -args[0]
+            self.show_month(*shift_month(self.current_view.year, self.current_view.month, delta))
+        elif name == 'month':
+            self.show_month(*args)
+        elif name == 'week':
+            year, week_num = args
+            self.jump_to_week(year or self.current_view.year, week_num)
+        elif name == 'quit':
+            self.root.quit()
+
+    def watch_commands(self, server):
+        """
+        Run the commands queued by the single-instance listener when it wakes us,
+        and once when the main loop starts for any that arrived before.
+        """
+        self.root.bind(COMMAND_EVENT, lambda event: server.poll(self.handle_command))
+        # Generated on the listener thread: tkinter runs it on this one
+        server.wake = lambda: self.root.event_generate(COMMAND_EVENT, when='tail')
+        self.root.after_idle(server.poll, self.handle_command)
 
-    def update_calendar(self):
-        """Update the calendar display."""
-        # Clear existing calendar
-        for widget in self.calendar_frame.winfo_children():
-            widget.destroy()
-        
-        # Get current date info
-        today = date.today()
+    def toggle_year_view(self):
+        """Open the scrollable year view at the month shown, or close it."""
+        if self.year_window is not None:
+            self.close_year_view()
+            return
+        from src.year_view import YearView
+        
+        self.year_window = tk.Toplevel(self.root)
+        self.year_window.title("Work Weeks")
+        self.year_window.attributes('-topmost', True)
+        self.year_window.protocol('WM_DELETE_WINDOW', self.close_year_view)
+        self.year_view = YearView(self.year_window, self.rule, on_select=self.show_month,
+                                  holidays=self.holidays, clock=self.clock)
+        self.year_view.scroll_to(self.current_view.year, self.current_view.month)
+    
+    def close_year_view(self):
+        """Close the year view window."""
+        if self.year_window is not None:
+            self.year_window.destroy()
+            self.year_window = None
+            self.year_view = None
+    
+    def on_day_change(self, old_today, new_today):
+        """Move the today highlight, repainting only the affected cells."""
+        if self.year_view is not None:
+            self.year_view.refresh()
         year = self.current_view.year
         month = self.current_view.month
+        if (old_today.year, old_today.month) == (year, month) != (new_today.year, new_today.month):
+            # The view was following today into a new month
+            self.go_to_today()
+            return
         
-        # Get first Monday of the year for work week calculation
-        year_start = date(year, 1, 1)
-        first_monday = year_start - timedelta(days=year_start.weekday())
-        
+        from src.month_grid import get_month_grid
+        grid = get_month_grid(year, month, rule=self.rule)
+        old_color = HOLIDAY_COLOR if old_today.toordinal() in self.holiday_days(grid) else 'white'
+        for day, bg_color in ((old_today, old_color), (new_today, TODAY_COLOR)):
+            cell = grid.today_cell(day)
+            if cell is not None:
+                week_idx, day_idx = cell
+                self.set_cell(week_idx, day_idx+1, str(grid.days[week_idx][day_idx]), bg_color)
+
+    def jump_to_week(self, year, week_num):
+        """Go straight to the month showing the given work week."""
+        # Show the month of the week's first day numbered as week_num of year;
+        # e.g. WW1 may start in December but is numbered WW1 from January 1st
+        target = self.rule.first_date(year, week_num)
+        if target is None:
+            self.root.bell()
+            return
+        self.current_view = target.replace(day=1)
+        self.update_calendar()
+    
+    def on_week_entry(self, event=None):
+        """Jump to the work week typed into the entry box."""
+        import re
+        match = re.fullmatch(r'\s*(?:(\d{4})\s*[-/ ]?\s*)?(?:ww)?\s*(\d{1,2})\s*',
+                             self.week_entry.get(), re.IGNORECASE)
+        if not match or not 1 <= int(match.group(2)) <= 53:
+            self.root.bell()
+            return
+        year = int(match.group(1)) if match.group(1) else self.current_view.year
+        self.jump_to_week(year, int(match.group(2)))
+        self.week_entry.delete(0, tk.END)
+
+    def create_calendar_grid(self):
+        """Create the calendar cells once; update_calendar only reconfigures them."""
         # Create headers
         days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
         for i, day in enumerate(days):
@@ -134,75 +437,147 @@ class WorkWeekCalendarWidget:
         tk.Label(self.calendar_frame, text='WW', bg='white',
                 width=4).grid(row=0, column=0)
         
-        # Get calendar for current month
-        cal = calendar.monthcalendar(year, month)
+        # One row per week (a month spans at most 6): WW cell, then Mon-Sun
+        self.cells = []
+        self.cell_values = []
+        for week_idx in range(MAX_WEEKS):
+            row = [tk.Label(self.calendar_frame, text='', bg='white')]
+            row += [tk.Label(self.calendar_frame, text='', bg='white', width=4)
+                    for _ in range(7)]
+            for column, cell in enumerate(row):
+                cell.grid(row=week_idx+1, column=column)
+            self.cells.append(row)
+            self.cell_values.append([('', 'white')] * 8)
+        self.visible_weeks = MAX_WEEKS
         
-        # Calculate previous month's last day
-        if month == 1:
-            prev_month = 12
-            prev_year = year - 1
-        else:
-            prev_month = month - 1
-            prev_year = year
-        prev_month_days = calendar.monthrange(prev_year, prev_month)[1]
+        # Add month/year header
+        self.month_label = tk.Label(self.calendar_frame, text='', bg='white',
+                                    font=('Arial', 10, 'bold'))
+        self.month_label.grid(row=7, column=0, columnspan=8)
+    
+    def set_cell(self, week_idx, column, text, bg_color):
+        """Show text in a calendar cell, touching the widget only if it changed."""
+        if self.cell_values[week_idx][column] != (text, bg_color):
+            self.cells[week_idx][column].configure(text=text, bg=bg_color)
+            self.cell_values[week_idx][column] = (text, bg_color)
+    
+    def show_weeks(self, num_weeks):
+        """Show the first num_weeks week rows and hide the rest."""
+        for week_idx in range(num_weeks, self.visible_weeks):
+            for cell in self.cells[week_idx]:
+                cell.grid_remove()
+        for week_idx in range(self.visible_weeks, num_weeks):
+            for cell in self.cells[week_idx]:
+                cell.grid()
+        self.visible_weeks = num_weeks
+
+    def update_calendar(self, background=True):
+        """
+        Update the calendar display.
         
-        # Calculate next month's first day
-        if month == 12:
-            next_month = 1
-            next_year = year + 1
-        else:
-            next_month = month + 1
-            next_year = year
+        Args:
+            background (bool): Build a month that is not cached on a worker and
+                show it when ready, instead of building it here
+        """
+        from src.month_grid import cached_month_grid, get_month_grid
+        
+        year = self.current_view.year
+        month = self.current_view.month
+        
+        # Get the month layout (work weeks count from the first Monday of the year)
+        grid = cached_month_grid(year, month, rule=self.rule)
+        if grid is None and background:
+            # A later click cancels this request if the month is not built yet
+            self.workers.submit(get_month_grid, year, month, rule=self.rule, key='month',
+                                on_done=self.show_grid)
+            return
+        self.workers.cancel('month')
+        self.show_grid(grid or get_month_grid(year, month, rule=self.rule))
+    
+    def show_grid(self, grid):
+        """Paint a built month grid if it is still the month in view."""
+        import calendar
+        
+        today = self.clock.today()
+        year, month = grid.year, grid.month
+        if (year, month) != (self.current_view.year, self.current_view.month):
+            return
+        title = f"{calendar.month_name[month]} {year}"
+        self.paint(grid, title)
+        
+        # Keep this month for the next startup's first paint
+        if (year, month) == (today.year, today.month) and self.snapshot_month != (year, month):
+            save_snapshot(grid, self.rule_name, title)
+            self.snapshot_month = (year, month)
+        
+        # Build the neighbouring months on a worker so stepping to them only paints
+        self.workers.submit(prefetch_adjacent_months, year, month, self.rule, key='prefetch')
+    
+    def paint(self, grid, title):
+        """Show a month grid (a MonthGrid or a first-paint Snapshot) and its title."""
+        today = self.clock.today()
+        self.show_weeks(grid.num_weeks)
+        today_cell = grid.today_cell(today)
+        holiday_days = self.holiday_days(grid)
         
         # Display calendar with work weeks
-        for week_idx, week in enumerate(cal):
-            if any(week):  # Only show weeks with days
-                # Get the first day of this week
-                for day in week:
-                    if day != 0:
-                        week_date = date(year, month, day)
-                        ww = get_work_week_number(week_date, first_monday)
-                        break
-                
-                # Show work week number
-                tk.Label(self.calendar_frame, text=f"WW{ww}",
-                        bg='white').grid(row=week_idx+1, column=0)
-                
-                # Show days
-                for day_idx, day in enumerate(week):
-                    if day == 0:
-                        # Calculate the date for blank spaces
-                        if day_idx < week.index(next(iter([d for d in week if d != 0]), 0)):
-                            # This is a day from previous month
-                            prev_day = prev_month_days - (week.index(next(iter([d for d in week if d != 0]), 0)) - day_idx - 1)
-                            text = str(prev_day)
-                            bg_color = 'lightgray'  # Different background for previous/next month
-                        else:
-                            # This is a day from next month
-                            next_day = day_idx - week.index(next(iter([d for d in week if d != 0][::-1]), 0))
-                            text = str(next_day)
-                            bg_color = 'lightgray'  # Different background for previous/next month
-                    else:
-                        text = str(day)
-                        # Highlight today
-                        bg_color = 'lightblue' if (day == today.day and 
-                                                 month == today.month and 
-                                                 year == today.year) else 'white'
-                    
-                    tk.Label(self.calendar_frame, text=text, bg=bg_color,
-                            width=4).grid(row=week_idx+1, column=day_idx+1)
+        for week_idx in range(grid.num_weeks):
+            self.set_cell(week_idx, 0, f"WW{grid.week_nums[week_idx]}", 'white')
+            for day_idx, day in enumerate(grid.days[week_idx]):
+                if not grid.in_month[week_idx][day_idx]:
+                    bg_color = OTHER_MONTH_COLOR  # Different background for previous/next month
+                elif (week_idx, day_idx) == today_cell:
+                    bg_color = TODAY_COLOR  # Highlight today
+                elif grid.first_ordinal + week_idx * 7 + day_idx in holiday_days:
+                    bg_color = HOLIDAY_COLOR
+                else:
+                    bg_color = 'white'
+                self.set_cell(week_idx, day_idx+1, str(day), bg_color)
         
-        # Add month/year header
-        month_name = calendar.month_name[month]
-        tk.Label(self.calendar_frame, text=f"{month_name} {year}",
-                bg='white', font=('Arial', 10, 'bold')).grid(row=7, column=0, columnspan=8)
+        # Update month/year header
+        if self.month_label.cget('text') != title:
+            self.month_label.configure(text=title)
+    
+    def holiday_days(self, grid):
+        """Get the ordinals of the holidays shown in a month grid."""
+        if not self.holidays:
+            return ()
+        return self.holidays.covered_days(grid.first_ordinal,
+                                          grid.first_ordinal + grid.num_weeks * 7 - 1)
+    
+def prefetch_adjacent_months(year, month, rule):
+    """Compute the previous and next month grids ahead of navigation (run on a worker)."""
+    from src.month_grid import get_month_grid, shift_month
+    
+    for delta in (-1, 1):
+        get_month_grid(*shift_month(year, month, delta), rule=rule)
 
-def main():
-    app = WorkWeekCalendarWidget()
+def main(rule=None, single_instance=True, holidays=None):
+    server = None
+    if single_instance:
+        from src.single_instance import InstanceServer, notify_running_instance
+        
+        # Taking the endpoint decides which launch runs; the others hand over to it
+        server = InstanceServer()
+        if not server.start():
+            # Show the window that is already running instead of opening another one
+            notify_running_instance(server.path)
+            return
+    
+    app = WorkWeekCalendarWidget(rule, holidays)
     # Position window in top-right corner initially
     screen_width = app.root.winfo_screenwidth()
     app.root.geometry(f"+{screen_width-300}+50")
-    app.root.mainloop()
+    if server is not None:
+        # Commands arrive on the listener thread; Tk calls must stay on this one
+        app.watch_commands(server)
+    
+    try:
+        app.root.mainloop()
+    finally:
+        app.workers.shutdown()
+        if server is not None:
+            server.stop()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
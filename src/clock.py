@@ -0,0 +1,92 @@
+"""
+Where "today" comes from.
+
+get_current_work_week, the widget and the command line defaults read the
+date from the current clock instead of calling date.today() themselves, so
+tests and simulations can swap in a FixedClock and sweep any number of days
+as a plain loop, without patching the datetime module.
+"""
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+from typing import Iterator, Union
+
+
+class SystemClock:
+    """The local wall clock."""
+
+    def today(self) -> date:
+        return date.today()
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+
+class FixedClock:
+    """
+    A clock that stays on a set date and time until moved, or moves forward by
+    step every time it is read, e.g. one day per call to sweep a year.
+    """
+
+    def __init__(self, start: Union[date, datetime], step: timedelta = timedelta(0)):
+        """
+        Args:
+            start (date or datetime): The first date (at midnight) or time read
+            step (timedelta): How far each read of today() or now() moves the clock
+        """
+        self.current = start if isinstance(start, datetime) else datetime.combine(start, time())
+        self.step = step
+
+    def set(self, when: Union[date, datetime]):
+        """Move the clock to a date (at midnight) or time."""
+        self.current = when if isinstance(when, datetime) else datetime.combine(when, time())
+
+    def advance(self, days: int = 0, **delta):
+        """Move the clock forward, e.g. advance(1) or advance(hours=6)."""
+        self.current += timedelta(days=days, **delta)
+
+    def now(self) -> datetime:
+        current = self.current
+        self.current += self.step
+        return current
+
+    def today(self) -> date:
+        return self.now().date()
+
+
+_clock = SystemClock()
+
+
+def get_clock():
+    """Get the clock that today's date is read from."""
+    return _clock
+
+
+def set_clock(clock=None):
+    """
+    Read today's date from another clock.
+
+    Args:
+        clock: An object with today() and now(); None restores the system clock
+
+    Returns:
+        The previous clock
+    """
+    global _clock
+    previous = _clock
+    _clock = clock if clock is not None else SystemClock()
+    return previous
+
+
+def today() -> date:
+    """Get today's date from the current clock."""
+    return _clock.today()
+
+
+@contextmanager
+def use_clock(clock) -> Iterator:
+    """Read today's date from clock inside a with block."""
+    previous = set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
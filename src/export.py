@@ -0,0 +1,216 @@
+"""
+Bulk export of work week numbers to CSV, JSON Lines or iCalendar.
+
+Rows are generated lazily and written in large chunks, so exporting many
+years runs in constant memory. Weeks are numbered by the default rule unless
+another WeekRule is given. Given a HolidayIndex, CSV and JSON Lines rows
+also name the holidays on each day or in each week. Nothing here imports
+tkinter.
+"""
+import json
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, Iterator, TextIO, Tuple
+
+from src.main import get_first_monday
+
+DAY_FIELDS = ('date', 'weekday', 'year', 'work_week')
+WEEK_FIELDS = ('year', 'work_week', 'start', 'end')
+HOLIDAY_FIELD = 'holidays'
+FORMATS = ('csv', 'jsonl', 'ics')
+CHUNK_LINES = 8192  # Lines joined per write() call
+
+_WEEKDAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+
+
+def iter_week_rows(start_year: int, end_year: int, rule=None) -> Iterator[Tuple[int, int, str, str]]:
+    """
+    Generate one row per work week: (year, work_week, start, end).
+    A year's weeks run from its first Monday up to the next year's first
+    Monday, so a wrapped week 53 appears as a second WW1 in that year.
+    Under another rule, year is the year the week is numbered in.
+
+    Args:
+        start_year (int): First year to export
+        end_year (int): Last year to export
+        rule (WeekRule): The numbering rule (defaults to the default rule)
+
+    Yields:
+        Tuple[int, int, str, str]: Year, work week and ISO Monday/Sunday dates
+    """
+    if rule is not None and rule.name != 'default':
+        # The same Monday-Sunday weeks, each numbered as its Sunday is
+        sunday = get_first_monday(start_year).toordinal() + 6
+        last_sunday = date(end_year, 12, 31).toordinal()
+        while sunday <= last_sunday:
+            end = date.fromordinal(sunday)
+            year, week_num = rule.fiscal_week(end)[:2]
+            yield year, week_num, date.fromordinal(sunday - 6).isoformat(), end.isoformat()
+            sunday += 7
+        return
+    for year in range(start_year, end_year + 1):
+        monday = get_first_monday(year)
+        next_first_monday = get_first_monday(year + 1)
+        week_num = 1
+        while monday < next_first_monday:
+            yield year, week_num, monday.isoformat(), (monday + timedelta(days=6)).isoformat()
+            monday += timedelta(weeks=1)
+            week_num = week_num % 52 + 1
+
+
+def iter_day_rows(start_year: int, end_year: int, rule=None) -> Iterator[Tuple[str, str, int, int]]:
+    """
+    Generate one row per day: (date, weekday, year, work_week).
+    Each day is numbered from its own year's first Monday, as in the widget;
+    under another rule, year is the year the day's week is numbered in.
+
+    Args:
+        start_year (int): First year to export
+        end_year (int): Last year to export
+        rule (WeekRule): The numbering rule (defaults to the default rule)
+
+    Yields:
+        Tuple[str, str, int, int]: ISO date, weekday name, year and work week
+    """
+    if rule is not None and rule.name != 'default':
+        for year in range(start_year, end_year + 1):
+            first_ordinal, weeks = rule.year_table(year)
+            for ordinal in range(date(year, 1, 1).toordinal(), date(year, 12, 31).toordinal() + 1):
+                day = date.fromordinal(ordinal)
+                week = weeks[(ordinal - first_ordinal) // 7]
+                yield day.isoformat(), _WEEKDAYS[day.weekday()], week.year, week.week
+        return
+    for year in range(start_year, end_year + 1):
+        first_ordinal = date(year, 1, 1).toordinal()
+        last_ordinal = date(year, 12, 31).toordinal()
+        # The year starts part way into WW1's Monday-Sunday week
+        weekday = date.fromordinal(first_ordinal).weekday()
+        week_num = 1
+        for ordinal in range(first_ordinal, last_ordinal + 1):
+            yield date.fromordinal(ordinal).isoformat(), _WEEKDAYS[weekday], year, week_num
+            weekday += 1
+            if weekday == 7:
+                weekday = 0
+                week_num = week_num % 52 + 1
+
+
+def iter_holiday_rows(rows: Iterable[tuple], holidays, per: str = 'day',
+                      quote: bool = False) -> Iterator[tuple]:
+    """
+    Append the names of the holidays overlapping each row's day or week, joined by '; '.
+
+    Args:
+        rows: Rows from iter_day_rows or iter_week_rows
+        holidays (HolidayIndex): The holidays
+        per (str): 'day' or 'week', the kind of rows
+        quote (bool): Quote names for CSV where needed
+
+    Yields:
+        tuple: The row with the names added ('' if none)
+    """
+    for row in rows:
+        if per == 'day':
+            first = last = date.fromisoformat(row[0]).toordinal()
+        else:
+            first = date.fromisoformat(row[2]).toordinal()
+            last = first + 6
+        names = '; '.join(dict.fromkeys(event.summary for event in holidays.overlapping(first, last)))
+        if quote and any(char in names for char in ',"\n'):
+            names = '"' + names.replace('"', '""') + '"'
+        yield row + (names,)
+
+
+def format_csv(rows: Iterable[tuple], fields: Tuple[str, ...]) -> Iterator[str]:
+    """Format rows as CSV lines with a header."""
+    yield ",".join(fields) + "\n"
+    for row in rows:
+        yield ",".join(map(str, row)) + "\n"
+
+
+def format_jsonl(rows: Iterable[tuple], fields: Tuple[str, ...]) -> Iterator[str]:
+    """Format rows as JSON Lines, one object per row."""
+    for row in rows:
+        yield json.dumps(dict(zip(fields, row))) + "\n"
+
+
+def format_ics(week_rows: Iterable[tuple]) -> Iterator[str]:
+    """Format week rows as an iCalendar file of all-day "WWnn" events."""
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    yield ("BEGIN:VCALENDAR\r\n"
+           "VERSION:2.0\r\n"
+           "PRODID:-//ww_calendar//Work Week Calendar//EN\r\n"
+           "CALSCALE:GREGORIAN\r\n")
+    for year, week_num, start, end in week_rows:
+        first_day = start.replace('-', '')
+        # DTEND is exclusive, so the event ends on the next Monday
+        next_monday = (date.fromisoformat(end) + timedelta(days=1)).strftime('%Y%m%d')
+        yield ("BEGIN:VEVENT\r\n"
+               f"UID:ww{week_num:02d}-{first_day}@ww-calendar\r\n"
+               f"DTSTAMP:{stamp}\r\n"
+               f"DTSTART;VALUE=DATE:{first_day}\r\n"
+               f"DTEND;VALUE=DATE:{next_monday}\r\n"
+               f"SUMMARY:WW{week_num}\r\n"
+               "TRANSP:TRANSPARENT\r\n"
+               "END:VEVENT\r\n")
+    yield "END:VCALENDAR\r\n"
+
+
+def write_chunked(out: TextIO, lines: Iterable[str], chunk_lines: int = CHUNK_LINES) -> int:
+    """
+    Write lines to a file in chunks of chunk_lines lines.
+
+    Returns:
+        int: The number of lines written
+    """
+    num_lines = 0
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) == chunk_lines:
+            out.write("".join(chunk))
+            num_lines += len(chunk)
+            chunk.clear()
+    out.write("".join(chunk))
+    return num_lines + len(chunk)
+
+
+def export_work_weeks(out: TextIO, fmt: str, start_year: int, end_year: int,
+                      per: str = 'day', holidays=None, rule=None) -> int:
+    """
+    Export work week numbers for a range of years.
+
+    Args:
+        out (TextIO): The file to write to; open CSV files with newline=''
+        fmt (str): 'csv', 'jsonl' or 'ics' (ics always has one event per week)
+        start_year (int): First year to export
+        end_year (int): Last year to export
+        per (str): 'day' for one row per date, 'week' for one row per work week
+        holidays (HolidayIndex): Adds a holidays column (CSV and JSON Lines only)
+        rule: A WeekRule or rule name (defaults to the default rule)
+
+    Returns:
+        int: The number of rows (or events) written
+
+    Raises:
+        ValueError: If fmt, per or the rule is not supported
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format {fmt!r}, expected one of {', '.join(FORMATS)}")
+    if per not in ('day', 'week'):
+        raise ValueError(f"Unsupported row type {per!r}, expected 'day' or 'week'")
+    if rule is not None:
+        from src.week_rules import get_rule
+        rule = get_rule(rule)
+
+    if fmt == 'ics':
+        return write_chunked(out, format_ics(iter_week_rows(start_year, end_year, rule))) - 2
+
+    if per == 'day':
+        rows, fields = iter_day_rows(start_year, end_year, rule), DAY_FIELDS
+    else:
+        rows, fields = iter_week_rows(start_year, end_year, rule), WEEK_FIELDS
+    if holidays is not None:
+        rows = iter_holiday_rows(rows, holidays, per, quote=fmt == 'csv')
+        fields += (HOLIDAY_FIELD,)
+    if fmt == 'csv':
+        return write_chunked(out, format_csv(rows, fields)) - 1
+    return write_chunked(out, format_jsonl(rows, fields))
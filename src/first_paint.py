@@ -0,0 +1,102 @@
+"""
+Snapshot of the last rendered month, used to paint the widget at startup
+before the calendar modules are imported.
+
+Only the standard library is imported here. The snapshot is a small JSON file
+in the user's cache directory (or WW_CALENDAR_CACHE_DIR) and is used only when
+its month and numbering rule match what the widget is about to show.
+"""
+import json
+import os
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_FILE = 'first_paint.json'
+
+
+def get_cache_dir() -> str:
+    """Get the directory for cache files."""
+    cache_dir = os.environ.get('WW_CALENDAR_CACHE_DIR')
+    if cache_dir:
+        return cache_dir
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'ww_calendar')
+
+
+class Snapshot:
+    """The cells of one rendered month, with the same fields the widget paints from a MonthGrid."""
+
+    __slots__ = ('year', 'month', 'rule_name', 'title', 'first_ordinal', 'days', 'in_month',
+                 'week_nums')
+
+    def __init__(self, year, month, rule_name, title, first_ordinal, days, in_month, week_nums):
+        self.year = year
+        self.month = month
+        self.rule_name = rule_name
+        self.title = title
+        self.first_ordinal = first_ordinal
+        self.days = days
+        self.in_month = in_month
+        self.week_nums = week_nums
+
+    @property
+    def num_weeks(self) -> int:
+        return len(self.days)
+
+    def today_cell(self, today):
+        """Find the (week_idx, day_idx) cell to highlight as today, or None."""
+        offset = today.toordinal() - self.first_ordinal
+        if not 0 <= offset < len(self.days) * 7:
+            return None
+        week_idx, day_idx = divmod(offset, 7)
+        return (week_idx, day_idx) if self.in_month[week_idx][day_idx] else None
+
+
+def save_snapshot(grid, rule_name: str, title: str, path: str = None):
+    """
+    Save a rendered month for the next startup. Errors are ignored; the
+    snapshot is only a cache.
+
+    Args:
+        grid: The MonthGrid that was rendered
+        rule_name (str): Name of the numbering rule it was rendered with
+        title (str): The month title shown above the grid
+        path (str): Snapshot file (defaults to first_paint.json in the cache directory)
+    """
+    if path is None:
+        path = os.path.join(get_cache_dir(), SNAPSHOT_FILE)
+    data = {'version': SNAPSHOT_VERSION, 'year': grid.year, 'month': grid.month,
+            'rule': rule_name, 'title': title, 'first_ordinal': grid.first_ordinal,
+            'days': grid.days, 'in_month': grid.in_month, 'week_nums': grid.week_nums}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def load_snapshot(year: int, month: int, rule_name: str, path: str = None) -> Snapshot:
+    """
+    Load the saved month if it matches the month and rule about to be shown.
+
+    Returns:
+        Snapshot: The saved cells, or None if there is no matching snapshot
+    """
+    if path is None:
+        path = os.path.join(get_cache_dir(), SNAPSHOT_FILE)
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        if (data['version'], data['year'], data['month'], data['rule']) != \
+                (SNAPSHOT_VERSION, year, month, rule_name):
+            return None
+        return Snapshot(year, month, rule_name, data['title'], data['first_ordinal'],
+                        [tuple(week) for week in data['days']],
+                        [tuple(week) for week in data['in_month']], data['week_nums'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
@@ -0,0 +1,306 @@
+"""
+Holidays and other all-day events read from iCalendar (.ics) files.
+
+Files are parsed as a stream, one line at a time, into Events spanning whole
+days (date ordinals, end inclusive). A HolidayIndex keeps the events sorted by
+start day, so the events overlapping a day range (a month, a work week) are
+found by bisection; merged day ranges answer "is this day a holiday" the same
+way, for single dates or numpy arrays of them.
+
+A HolidayCalendar watches a set of files and re-parses only the files whose
+modification time or size changed. The widget calls reload() on its worker
+pool, so the Tk event loop never waits for a parse. Recurrence rules (RRULE)
+are not expanded; every VEVENT counts once.
+"""
+import heapq
+import os
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+LONG_EVENT_DAYS = 62  # Longer events are kept apart so they don't widen every lookup
+
+
+class Event(NamedTuple):
+    """An all-day event; start and end are date ordinals, both inclusive."""
+    start: int
+    end: int
+    summary: str
+    uid: str = ''
+
+    @property
+    def start_date(self) -> date:
+        return date.fromordinal(self.start)
+
+    @property
+    def end_date(self) -> date:
+        return date.fromordinal(self.end)
+
+
+def _unescape(text: str) -> str:
+    return (text.replace('\\n', ' ').replace('\\N', ' ').replace('\\,', ',')
+            .replace('\\;', ';').replace('\\\\', '\\'))
+
+
+def _parse_ics_date(value: str) -> Tuple[int, bool]:
+    """Get the date ordinal of a DATE or DATE-TIME value, and whether it is midnight."""
+    day = date(int(value[0:4]), int(value[4:6]), int(value[6:8]))
+    return day.toordinal(), value[9:15] in ('', '000000')
+
+
+def _parse_duration_days(value: str) -> int:
+    """Whole days of a DURATION such as P3D, P2W or P1DT12H (hours are dropped)."""
+    days = 0
+    number = ''
+    for char in value.split('T')[0].lstrip('+P'):
+        if char.isdigit():
+            number += char
+        elif char in 'DW' and number:
+            days += int(number) * (7 if char == 'W' else 1)
+            number = ''
+    return days
+
+
+def _unfold(lines: Iterable[str]) -> Iterator[str]:
+    """Join folded content lines (continuations start with a space or tab)."""
+    current = None
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if line[:1] in (' ', '\t'):
+            if current is not None:
+                current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+
+def iter_ics_events(lines: Iterable[str]) -> Iterator[Event]:
+    """
+    Parse the VEVENTs of an iCalendar stream.
+
+    Args:
+        lines: Lines of the file, e.g. an open text file
+
+    Yields:
+        Event: Each event with a valid DTSTART, as whole days
+    """
+    props = None
+    for line in _unfold(lines):
+        if line == 'BEGIN:VEVENT':
+            props = {}
+        elif line == 'END:VEVENT':
+            if props is not None and 'DTSTART' in props:
+                try:
+                    yield _make_event(props)
+                except ValueError:
+                    pass  # Skip events with malformed dates
+            props = None
+        elif props is not None and line[:1] in 'DSUdsu':
+            name_params, _, value = line.partition(':')
+            name = name_params.split(';', 1)[0].upper()
+            if name in ('DTSTART', 'DTEND', 'DURATION', 'SUMMARY', 'UID') and name not in props:
+                props[name] = (name_params, value)
+
+
+def _make_event(props: Dict[str, Tuple[str, str]]) -> Event:
+    start_params, start_value = props['DTSTART']
+    start, _ = _parse_ics_date(start_value)
+    all_day = 'VALUE=DATE' in start_params.upper() or len(start_value) == 8
+    if 'DTEND' in props:
+        end, at_midnight = _parse_ics_date(props['DTEND'][1])
+        # DTEND is exclusive: a date, or a date-time at midnight, ends the day before
+        if (all_day or at_midnight) and end > start:
+            end -= 1
+    elif 'DURATION' in props:
+        end = start + max(_parse_duration_days(props['DURATION'][1]) - 1, 0)
+    else:
+        end = start
+    summary = _unescape(props['SUMMARY'][1]) if 'SUMMARY' in props else ''
+    uid = props['UID'][1] if 'UID' in props else ''
+    return Event(start, max(start, end), summary, uid)
+
+
+def read_ics_file(path: str) -> List[Event]:
+    """Read the events of an .ics file, sorted by start and end day."""
+    with open(path, encoding='utf-8', errors='replace') as f:
+        return sorted(iter_ics_events(f))
+
+
+class HolidayIndex:
+    """Events sorted by day for logarithmic range lookups."""
+
+    def __init__(self, events: Iterable[Event] = (), presorted: bool = False):
+        """
+        Args:
+            events: The events
+            presorted (bool): The events are already sorted (Events sort by start day)
+        """
+        self.events = []
+        self.long_events = []
+        self.starts = []
+        self.max_span = 0
+        # Days covered by any event, as disjoint (start, end) ranges
+        self.range_starts = []
+        self.range_ends = []
+        range_end = None
+        for event in (events if presorted else sorted(events)):
+            start, end = event.start, event.end
+            span = end - start
+            if span < LONG_EVENT_DAYS:
+                self.events.append(event)
+                self.starts.append(start)
+                if span > self.max_span:
+                    self.max_span = span
+            else:
+                self.long_events.append(event)
+            if range_end is not None and start <= range_end + 1:
+                if end > range_end:
+                    range_end = self.range_ends[-1] = end
+            else:
+                self.range_starts.append(start)
+                self.range_ends.append(end)
+                range_end = end
+
+    def __len__(self):
+        return len(self.events) + len(self.long_events)
+
+    def overlapping(self, first_ordinal: int, last_ordinal: int) -> List[Event]:
+        """Get the events overlapping a range of date ordinals (inclusive), by start day."""
+        lo = bisect_left(self.starts, first_ordinal - self.max_span)
+        hi = bisect_right(self.starts, last_ordinal)
+        found = [event for event in self.events[lo:hi] if event.end >= first_ordinal]
+        if self.long_events:
+            found += [event for event in self.long_events
+                      if event.start <= last_ordinal and event.end >= first_ordinal]
+            found.sort()
+        return found
+
+    def events_between(self, first: date, last: date) -> List[Event]:
+        """Get the events overlapping the days from first to last."""
+        return self.overlapping(first.toordinal(), last.toordinal())
+
+    def events_in_month(self, year: int, month: int) -> List[Event]:
+        """Get the events overlapping a month."""
+        first = date(year, month, 1)
+        last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+        return self.events_between(first, last)
+
+    def events_in_week(self, year: int, week_num: int, rule=None) -> List[Event]:
+        """
+        Get the events overlapping a work week.
+
+        Args:
+            year (int): The year the week is numbered in
+            week_num (int): The work week number
+            rule (WeekRule): Numbering rule; by default, weeks count from the
+                year's first Monday (a wrapped WW1 has two ranges)
+
+        Returns:
+            List[Event]: The events, by start day
+        """
+        if rule is None:
+            from src.main import get_work_week_ranges
+            ranges = [(week.start, week.end) for week in get_work_week_ranges(year, week_num)]
+        else:
+            first = rule.first_date(year, week_num)
+            if first is None:
+                return []
+            ranges = [(first, first + timedelta(days=6 - first.weekday()))]
+        found = set()
+        for first, last in ranges:
+            found.update(self.events_between(first, last))
+        return sorted(found)
+
+    def covered_days(self, first_ordinal: int, last_ordinal: int) -> Set[int]:
+        """Get the ordinals of the days in a range covered by any event."""
+        days = set()
+        idx = max(bisect_right(self.range_starts, first_ordinal) - 1, 0)
+        while idx < len(self.range_starts) and self.range_starts[idx] <= last_ordinal:
+            days.update(range(max(self.range_starts[idx], first_ordinal),
+                              min(self.range_ends[idx], last_ordinal) + 1))
+            idx += 1
+        return days
+
+    def is_holiday(self, day: date) -> bool:
+        """Check whether any event covers a day."""
+        ordinal = day.toordinal()
+        idx = bisect_right(self.range_starts, ordinal) - 1
+        return idx >= 0 and ordinal <= self.range_ends[idx]
+
+    def covered(self, dates):
+        """
+        Check many dates at once, like get_work_week_numbers.
+
+        Args:
+            dates: A numpy datetime64 array or an integer array of date ordinals
+
+        Returns:
+            numpy.ndarray: bool array, True where an event covers the date
+        """
+        import numpy as np
+        from src.main import _as_ordinals
+
+        ordinals = _as_ordinals(dates)
+        range_starts = np.array(self.range_starts, dtype=np.int64)
+        range_ends = np.array(self.range_ends, dtype=np.int64)
+        idx = np.searchsorted(range_starts, ordinals, side='right') - 1
+        if not len(range_ends):
+            return np.zeros(ordinals.shape, dtype=bool)
+        return (idx >= 0) & (ordinals <= range_ends[np.maximum(idx, 0)])
+
+    def summaries(self, day: date) -> List[str]:
+        """Get the names of the events on a day."""
+        ordinal = day.toordinal()
+        return [event.summary for event in self.overlapping(ordinal, ordinal)]
+
+
+class HolidayCalendar:
+    """The combined events of several .ics files, reloaded when the files change."""
+
+    def __init__(self, paths: Sequence[str]):
+        self.paths = list(paths)
+        self.index = HolidayIndex()
+        self.files: Dict[str, Tuple[Tuple[int, int], List[Event]]] = {}
+        self.reloads = 0  # Files parsed so far
+
+    def reload(self) -> bool:
+        """
+        Re-read the files whose modification time or size changed.
+
+        Missing or unreadable files contribute no events. The index is rebuilt
+        from the per-file sorted lists, which are merged rather than re-sorted.
+
+        Returns:
+            bool: True if the index changed
+        """
+        changed = False
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+                key = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                key = None
+            cached = self.files.get(path)
+            if cached is not None and cached[0] == key:
+                continue
+            try:
+                events = read_ics_file(path) if key is not None else []
+            except OSError:
+                events = []
+            self.files[path] = (key, events)
+            self.reloads += 1
+            changed = True
+        if changed:
+            merged = heapq.merge(*(events for _, events in self.files.values()))
+            self.index = HolidayIndex(merged, presorted=True)
+        return changed
+
+
+def get_holiday_paths(paths: Optional[Sequence[str]] = None) -> List[str]:
+    """Get the .ics files to use: paths if given, else WW_CALENDAR_HOLIDAYS (os.pathsep separated)."""
+    if paths:
+        return list(paths)
+    return [path for path in os.environ.get('WW_CALENDAR_HOLIDAYS', '').split(os.pathsep) if path]
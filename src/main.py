@@ -1,11 +1,66 @@
 import calendar
+import os
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
 from datetime import datetime, timedelta, date
+from itertools import accumulate
+from typing import Iterable, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+
+from src.clock import get_clock
+
+# date(1970, 1, 1).toordinal(); numpy counts datetime64[D] days from here
+_EPOCH_ORDINAL = 719163
+TABLE_AFTER_CALCULATIONS = 64  # Uses of a start date before a lookup table is built for it
+_MAX_COUNTED_STARTS = 1024
+
+_tables = OrderedDict()  # start_date -> WorkWeekTable, least recently used first
+_tables_lock = threading.Lock()
+_calculations = {}  # start_date -> calculations so far, for start dates without a table
+
+class WorkWeekRange(NamedTuple):
+    """The Monday-Sunday dates of one work week."""
+    week_num: int
+    start: date
+    end: date
+    months: Tuple[Tuple[int, int], ...]  # (year, month) pairs the week spans
+
+def get_first_monday(year: int) -> date:
+    """
+    Get the Monday of the week containing January 1st, which starts WW1.
+    
+    Args:
+        year (int): The calendar year
+        
+    Returns:
+        date: The first Monday used for the year's work week numbers
+    """
+    year_start = date(year, 1, 1)
+    return year_start - timedelta(days=year_start.weekday())
+
+def greet(name: str) -> str:
+    """
+    Return a greeting message.
+    
+    Args:
+        name (str): The name to greet
+        
+    Returns:
+        str: The greeting message
+    """
+    return f"Hello, {name}!"
 
 def get_work_week_number(current_date: date, start_date: date) -> int:
     """
     Calculate the work week number starting from a specific date.
     Work weeks wrap back to 1 after week 52.
     
+    Start dates used over and over, such as each year's first Monday, get a
+    precomputed table from src/work_week_table.py after
+    TABLE_AFTER_CALCULATIONS uses; their dates in the table's span are then
+    one index operation. The most recently used tables are kept.
+    
     Args:
         current_date (date): The date to calculate the work week for
         start_date (date): The date to start counting from (WW1)
@@ -13,6 +68,41 @@ def get_work_week_number(current_date: date, start_date: date) -> int:
     Returns:
         int: The work week number (1-52)
     """
+    table = _tables.get(start_date)
+    if table is not None:
+        try:
+            _tables.move_to_end(start_date)
+        except KeyError:  # Evicted by another thread meanwhile
+            pass
+        offset = current_date.toordinal() - table.first_ordinal
+        if 0 <= offset < len(table.data):
+            return table.data[offset]
+    else:
+        count = _calculations.get(start_date, 0) + 1
+        if count >= TABLE_AFTER_CALCULATIONS:
+            _add_table(start_date)
+        else:
+            if len(_calculations) >= _MAX_COUNTED_STARTS:
+                _calculations.clear()  # Many one-off start dates; start counting again
+            _calculations[start_date] = count
+    return _calculate_work_week_number(current_date, start_date)
+
+def _add_table(start_date: date):
+    """Answer a start date's lookups from a table, evicting the least recently used."""
+    from src.work_week_table import TABLE_CACHE_SIZE, get_work_week_table
+    
+    try:
+        table = get_work_week_table(start_date, table_dir=os.environ.get('WW_TABLE_DIR'))
+    except OSError:  # Unusable WW_TABLE_DIR; keep the table in memory
+        table = get_work_week_table(start_date)
+    with _tables_lock:
+        _calculations.pop(start_date, None)
+        _tables[start_date] = table
+        while len(_tables) > TABLE_CACHE_SIZE:
+            _tables.popitem(last=False)
+
+def _calculate_work_week_number(current_date: date, start_date: date) -> int:
+    """get_work_week_number without lookup tables."""
     # Get to the Monday of the week containing the start_date
     start_weekday = start_date.weekday()
     adjusted_start = start_date - timedelta(days=start_weekday)
@@ -26,4 +116,341 @@ def get_work_week_number(current_date: date, start_date: date) -> int:
     week_num = weeks_diff + 1
     
     # Wrap week number back to 1 if it exceeds 52
-    return ((week_num - 1) % 52) + 1 
\ No newline at end of file
+    return ((week_num - 1) % 52) + 1 
+
+def get_current_work_week(clock=None) -> str:
+    """
+    Describe today's date and work week.
+    
+    Args:
+        clock: Where today's date is read from (defaults to src.clock.get_clock())
+    
+    Returns:
+        str: e.g. "Today is 2025-03-14, Work Week 11 of 2025"
+    """
+    today = (clock or get_clock()).today()
+    week_num = get_work_week_number(today, get_first_monday(today.year))
+    return f"Today is {today.strftime('%Y-%m-%d')}, Work Week {week_num} of {today.year}"
+
+def iter_work_week_calendar(start_year: int, end_year: Optional[int] = None) -> Iterator[str]:
+    """
+    Generate a text calendar of work weeks, one month block at a time.
+    Each block has the month title, a header row and one row per week with
+    the work week number and the Monday-Friday dates. Only one month is built
+    at a time, so long ranges can be streamed in constant memory.
+    
+    Args:
+        start_year (int): First year of the calendar
+        end_year (int): Last year of the calendar (defaults to start_year)
+        
+    Yields:
+        str: One month block, ending with a newline
+    """
+    if end_year is None:
+        end_year = start_year
+    
+    for year in range(start_year, end_year + 1):
+        first_monday = get_first_monday(year)
+        for month in range(1, 13):
+            lines = [f"{calendar.month_name[month]} {year}", "WW   Mon Tue Wed Thu Fri"]
+            for week in calendar.monthcalendar(year, month):
+                weekdays = week[:5]
+                if not any(weekdays):
+                    continue  # Weekend-only row
+                first_day = next(day for day in week if day != 0)
+                week_num = get_work_week_number(date(year, month, first_day), first_monday)
+                days = " ".join(f"{day:>3}" if day else "   " for day in weekdays)
+                lines.append(f"WW{week_num:<2} {days}".rstrip())
+            yield "\n".join(lines) + "\n"
+
+def write_work_week_calendar(out: TextIO, start_year: int, end_year: Optional[int] = None) -> int:
+    """
+    Stream a work week calendar to a file, with a blank line between months.
+    
+    Args:
+        out (TextIO): The file to write to, e.g. sys.stdout
+        start_year (int): First year of the calendar
+        end_year (int): Last year of the calendar (defaults to start_year)
+        
+    Returns:
+        int: The number of lines written
+    """
+    num_lines = 0
+    for i, block in enumerate(iter_work_week_calendar(start_year, end_year)):
+        if i:
+            out.write("\n")
+            num_lines += 1
+        out.write(block)
+        num_lines += block.count("\n")
+    return num_lines
+
+def get_work_week_calendar(start_year: int, end_year: Optional[int] = None) -> str:
+    """
+    Build a work week calendar as a single string.
+    See iter_work_week_calendar for the format; prefer write_work_week_calendar
+    for long ranges.
+    
+    Args:
+        start_year (int): First year of the calendar
+        end_year (int): Last year of the calendar (defaults to start_year)
+        
+    Returns:
+        str: The calendar text, with a blank line between months
+    """
+    return "\n".join(iter_work_week_calendar(start_year, end_year))
+
+def _as_ordinals(dates):
+    """Convert a datetime64 array or integer ordinals to a new int64 array of ordinals."""
+    import numpy as np
+    
+    values = np.asarray(dates)
+    if np.issubdtype(values.dtype, np.datetime64):
+        ordinals = values.astype('datetime64[D]').astype(np.int64)
+        ordinals += _EPOCH_ORDINAL
+    elif np.issubdtype(values.dtype, np.integer):
+        ordinals = values.astype(np.int64)
+    else:
+        raise TypeError(f"Expected datetime64 or integer ordinals, got {values.dtype}")
+    return ordinals
+
+def get_work_week_numbers(dates, start_date: date):
+    """
+    Calculate work week numbers for a whole array of dates at once.
+    Uses the same Monday alignment and wrap-after-52 rule as
+    get_work_week_number, without creating a date object per element.
+    
+    Args:
+        dates: A numpy datetime64 array (any unit) or an integer array of
+            date ordinals as returned by date.toordinal()
+        start_date (date): The date to start counting from (WW1)
+        
+    Returns:
+        numpy.ndarray: uint8 array of work week numbers (1-52), same shape as dates
+    """
+    import numpy as np
+    
+    ordinals = _as_ordinals(dates)
+    
+    # Ordinal 1 (0001-01-01) is a Monday, so (ordinal - 1) // 7 counts
+    # Monday-aligned weeks directly
+    ordinals -= 1
+    np.floor_divide(ordinals, 7, out=ordinals)
+    ordinals -= (start_date.toordinal() - 1) // 7
+    
+    # Wrap week number back to 1 if it exceeds 52
+    np.remainder(ordinals, 52, out=ordinals)
+    week_nums = ordinals.astype(np.uint8)
+    week_nums += 1
+    return week_nums
+
+def get_work_week_ranges(year: int, week_num: int) -> List[WorkWeekRange]:
+    """
+    Find the dates of a work week in a year, the reverse of get_work_week_number.
+    Counting starts from get_first_monday(year). When the year has 53 weeks
+    before the next year's WW1, week 53 wraps back to WW1, so WW1 then has
+    two date ranges.
+    
+    Args:
+        year (int): The calendar year
+        week_num (int): The work week number (1-52)
+        
+    Returns:
+        List[WorkWeekRange]: The matching weeks in date order
+        
+    Raises:
+        ValueError: If week_num is not between 1 and 52
+    """
+    if not 1 <= week_num <= 52:
+        raise ValueError(f"Work week must be between 1 and 52, got {week_num}")
+    
+    first_monday = get_first_monday(year)
+    # Ordinal of the Monday of the week containing next January 1st; as an
+    # ordinal it also exists for 9999
+    last_day = date(year, 12, 31)
+    next_first_monday = last_day.toordinal() + 1 - (last_day.weekday() + 1) % 7
+    
+    ranges = []
+    for weeks in (week_num - 1, week_num - 1 + 52):
+        if first_monday.toordinal() + weeks * 7 >= next_first_monday:
+            break
+        start = first_monday + timedelta(weeks=weeks)
+        end = start + timedelta(days=6)
+        months = ((start.year, start.month),)
+        if (end.year, end.month) != months[0]:
+            months += ((end.year, end.month),)
+        ranges.append(WorkWeekRange(week_num, start, end, months))
+    return ranges
+
+
+class WorkingDayCalendar:
+    """
+    Working day arithmetic over a span of years, skipping weekends and holidays.
+    
+    prefix[i] counts the working days before the i-th day of the span, so the
+    working days between two dates are one subtraction, and the date N working
+    days away is a bisection of the prefix sums.
+    """
+    
+    def __init__(self, start_year: int, end_year: int, weekend: Iterable[int] = (5, 6),
+                 holidays: Iterable = ()):
+        """
+        Args:
+            start_year (int): First year covered (from January 1st)
+            end_year (int): Last year covered (to December 31st)
+            weekend: Weekdays that are never working days (Monday is 0)
+            holidays: Dates or date ordinals that are not working days, or a
+                HolidayIndex from src/holidays.py
+            
+        Raises:
+            ValueError: If the years are reversed or every weekday is a weekend day
+        """
+        if end_year < start_year:
+            raise ValueError(f"end_year {end_year} is before start_year {start_year}")
+        self.weekend = frozenset(weekend)
+        if not self.weekend < frozenset(range(7)):
+            raise ValueError(f"Weekend must be some but not all of the weekdays 0-6, got {sorted(self.weekend)}")
+        self.first_ordinal = date(start_year, 1, 1).toordinal()
+        self.last_ordinal = date(end_year, 12, 31).toordinal()
+        
+        if hasattr(holidays, 'covered_days'):
+            closed = holidays.covered_days(self.first_ordinal, self.last_ordinal)
+        else:
+            closed = {day if isinstance(day, int) else day.toordinal() for day in holidays}
+        
+        # Ordinal 1 is a Monday, so ordinal % 7 - 1 is the weekday (mod 7)
+        workdays = [(weekday - 1) % 7 not in self.weekend for weekday in range(7)]
+        flags = (workdays[ordinal % 7] and ordinal not in closed
+                 for ordinal in range(self.first_ordinal, self.last_ordinal + 1))
+        self.prefix = array('i', accumulate(flags, initial=0))
+        self._prefix_array = None
+    
+    def _index(self, day: date) -> int:
+        index = day.toordinal() - self.first_ordinal
+        if not 0 <= index < len(self.prefix) - 1:
+            raise ValueError(f"{day} is outside {date.fromordinal(self.first_ordinal)}"
+                             f" to {date.fromordinal(self.last_ordinal)}")
+        return index
+    
+    def is_working_day(self, day: date) -> bool:
+        """Check whether a date is a working day."""
+        index = self._index(day)
+        return self.prefix[index + 1] != self.prefix[index]
+    
+    def count(self, start: date, end: date) -> int:
+        """
+        Count the working days from start up to, but not including, end.
+        Like numpy.busday_count, the count is negative if end is before start.
+        
+        Args:
+            start (date): First date counted
+            end (date): Date after the last one counted (may be the day after the span)
+            
+        Returns:
+            int: The number of working days
+        """
+        end_index = end.toordinal() - self.first_ordinal
+        if end_index != len(self.prefix) - 1:
+            self._index(end)
+        return self.prefix[end_index] - self.prefix[self._index(start)]
+    
+    def add(self, day: date, num_days: int) -> date:
+        """
+        Find the date num_days working days after day (before it if negative).
+        A day that is not a working day first moves to the next working day,
+        or to the previous one when going backwards, so add(day, 0) is the
+        working day itself or the next one.
+        
+        Args:
+            day (date): The date to start from
+            num_days (int): Working days to move
+            
+        Returns:
+            date: The resulting working day
+            
+        Raises:
+            ValueError: If day or the result is outside the calendar's years
+        """
+        index = self._index(day)
+        position = self.prefix[index]  # Working days before day
+        if num_days < 0 and self.prefix[index + 1] == position:
+            position -= 1  # Roll back to the previous working day
+        position += num_days
+        if not 0 <= position < self.prefix[-1]:
+            raise ValueError(f"{num_days} working days from {day} is outside the calendar")
+        # The working day with position working days before it is the last
+        # index whose prefix sum is still position
+        return date.fromordinal(self.first_ordinal + bisect_right(self.prefix, position) - 1)
+    
+    def _prefix(self):
+        import numpy as np
+        
+        if self._prefix_array is None:
+            self._prefix_array = np.frombuffer(self.prefix, dtype=np.int32)
+        return self._prefix_array
+    
+    def _indices(self, dates, allow_end: bool = False):
+        import numpy as np
+        
+        indices = _as_ordinals(dates)
+        indices -= self.first_ordinal
+        limit = len(self.prefix) - (1 if allow_end else 2)
+        if indices.size and (indices.min() < 0 or indices.max() > limit):
+            raise ValueError("Dates are outside the calendar's years")
+        return indices
+    
+    def working_days_mask(self, dates):
+        """
+        Check many dates at once.
+        
+        Args:
+            dates: A numpy datetime64 array or an integer array of date ordinals
+            
+        Returns:
+            numpy.ndarray: bool array, True for working days
+        """
+        prefix = self._prefix()
+        indices = self._indices(dates)
+        return prefix[indices + 1] != prefix[indices]
+    
+    def count_many(self, starts, ends):
+        """
+        Count working days for whole arrays of ranges, as count does for one.
+        
+        Args:
+            starts: datetime64 or ordinal array of first dates counted
+            ends: datetime64 or ordinal array of dates after the last ones counted
+            
+        Returns:
+            numpy.ndarray: int64 array of counts, broadcast from starts and ends
+        """
+        prefix = self._prefix()
+        return (prefix[self._indices(ends, allow_end=True)].astype('int64')
+                - prefix[self._indices(starts)])
+    
+    def add_many(self, dates, num_days):
+        """
+        Move whole arrays of dates by working days, as add does for one.
+        
+        Args:
+            dates: A numpy datetime64 array or an integer array of date ordinals
+            num_days: Working days to move, an int or an array broadcast with dates
+            
+        Returns:
+            numpy.ndarray: The resulting working days as datetime64[D] if dates
+            was datetime64, otherwise as ordinals
+        """
+        import numpy as np
+        
+        prefix = self._prefix()
+        indices = self._indices(dates)
+        num_days = np.asarray(num_days, dtype=np.int64)
+        positions = prefix[indices].astype(np.int64)
+        positions -= (num_days < 0) & (prefix[indices + 1] == prefix[indices])
+        positions += num_days
+        if positions.size and (positions.min() < 0 or positions.max() >= prefix[-1]):
+            raise ValueError("Results are outside the calendar's years")
+        ordinals = np.searchsorted(prefix, positions, side='right') - 1
+        ordinals += self.first_ordinal
+        if np.issubdtype(np.asarray(dates).dtype, np.datetime64):
+            return (ordinals - _EPOCH_ORDINAL).astype('datetime64[D]')
+        return ordinals
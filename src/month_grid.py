@@ -0,0 +1,172 @@
+"""
+Tk-free model of one month as shown by the calendar widget.
+
+A month is laid out as 4-6 Monday-Sunday week rows. Cells before the 1st and
+after the last day show the neighbouring months' days. Grids are memoized, so
+repainting or revisiting a month does not redo the layout math; the cache is
+shared by the Tk thread and the widget's background workers.
+"""
+import calendar
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Optional, Tuple
+
+from src.main import get_first_monday, get_work_week_number
+from src.week_rules import WeekRule
+
+MONTH_GRID_CACHE_SIZE = 64
+
+
+class MonthGrid:
+    """Day numbers, in-month flags and work week numbers for one month's rows."""
+
+    __slots__ = ('year', 'month', 'anchor', 'rule', 'first_ordinal', 'days', 'in_month',
+                 'week_nums')
+
+    def __init__(self, year: int, month: int, anchor: Optional[date], rule: Optional[WeekRule],
+                 first_ordinal: int, days: Tuple[Tuple[int, ...], ...],
+                 in_month: Tuple[Tuple[bool, ...], ...], week_nums: Tuple[int, ...]):
+        self.year = year
+        self.month = month
+        self.anchor = anchor
+        self.rule = rule
+        self.first_ordinal = first_ordinal  # Ordinal of the Monday in the first row
+        self.days = days
+        self.in_month = in_month
+        self.week_nums = week_nums
+
+    def __repr__(self):
+        if self.rule is not None:
+            return f"MonthGrid({self.year}, {self.month}, rule={self.rule.name!r})"
+        return f"MonthGrid({self.year}, {self.month}, anchor={self.anchor})"
+
+    @property
+    def num_weeks(self) -> int:
+        return len(self.days)
+
+    def date_at(self, week_idx: int, day_idx: int) -> date:
+        """Get the date shown in a cell."""
+        return date.fromordinal(self.first_ordinal + week_idx * 7 + day_idx)
+
+    def cell_of(self, day: date) -> Optional[Tuple[int, int]]:
+        """
+        Find the (week_idx, day_idx) cell showing a date, e.g. to mark today.
+
+        Returns:
+            Tuple[int, int]: The cell, or None if the date is not in the grid
+        """
+        offset = day.toordinal() - self.first_ordinal
+        if not 0 <= offset < len(self.days) * 7:
+            return None
+        return divmod(offset, 7)
+
+    def today_cell(self, today: date) -> Optional[Tuple[int, int]]:
+        """Find the cell to highlight as today; days of other months are never highlighted."""
+        cell = self.cell_of(today)
+        if cell is None or not self.in_month[cell[0]][cell[1]]:
+            return None
+        return cell
+
+
+def shift_month(year: int, month: int, delta: int) -> Tuple[int, int]:
+    """Move delta months forward (or back if negative) from year/month."""
+    year, month_idx = divmod(year * 12 + month - 1 + delta, 12)
+    return year, month_idx + 1
+
+
+def build_month_grid(year: int, month: int, anchor: Optional[date] = None,
+                     rule: Optional[WeekRule] = None) -> MonthGrid:
+    """
+    Lay out a month in Monday-Sunday rows.
+
+    Args:
+        year (int): The calendar year
+        month (int): The month (1-12)
+        anchor (date): The date work weeks are counted from (WW1)
+        rule (WeekRule): Number weeks with a rule instead of from an anchor;
+            each row is numbered by its first day in the month
+
+    Returns:
+        MonthGrid: The month's grid
+    """
+    first_weekday, num_days = calendar.monthrange(year, month)
+    prev_month_days = calendar.monthrange(*shift_month(year, month, -1))[1]
+    num_weeks = (first_weekday + num_days + 6) // 7
+    month_ordinal = date(year, month, 1).toordinal()
+    first_ordinal = month_ordinal - first_weekday
+
+    days = []
+    in_month = []
+    week_nums = []
+    for week_idx in range(num_weeks):
+        week_days = []
+        week_in_month = []
+        for day_idx in range(7):
+            # Days since the 1st of the month
+            offset = week_idx * 7 + day_idx - first_weekday
+            if offset < 0:
+                week_days.append(prev_month_days + offset + 1)
+                week_in_month.append(False)
+            elif offset >= num_days:
+                week_days.append(offset - num_days + 1)
+                week_in_month.append(False)
+            else:
+                week_days.append(offset + 1)
+                week_in_month.append(True)
+        days.append(tuple(week_days))
+        in_month.append(tuple(week_in_month))
+        if rule is not None:
+            first_day = date.fromordinal(max(first_ordinal + week_idx * 7, month_ordinal))
+            week_nums.append(rule.week_number(first_day))
+        else:
+            monday = date.fromordinal(first_ordinal + week_idx * 7)
+            week_nums.append(get_work_week_number(monday, anchor))
+
+    return MonthGrid(year, month, anchor, rule, first_ordinal, tuple(days), tuple(in_month),
+                     tuple(week_nums))
+
+
+def get_month_grid(year: int, month: int, anchor: Optional[date] = None,
+                   rule: Optional[WeekRule] = None) -> MonthGrid:
+    """
+    Get a month's grid, reusing one of the most recently used grids.
+
+    Args:
+        year (int): The calendar year
+        month (int): The month (1-12)
+        anchor (date): The date work weeks are counted from; defaults to
+            get_first_monday(year), as the widget uses
+        rule (WeekRule): Number weeks with a rule instead of from an anchor
+
+    Returns:
+        MonthGrid: The cached grid
+    """
+    if anchor is None and rule is None:
+        anchor = get_first_monday(year)
+    grid = cached_month_grid(year, month, anchor, rule)
+    if grid is None:
+        # Built outside the lock; two threads may build the same month once each
+        grid = build_month_grid(year, month, anchor, rule)
+        with _grids_lock:
+            _grids[(year, month, anchor, rule)] = grid
+            if len(_grids) > MONTH_GRID_CACHE_SIZE:
+                _grids.popitem(last=False)
+    return grid
+
+
+def cached_month_grid(year: int, month: int, anchor: Optional[date] = None,
+                      rule: Optional[WeekRule] = None) -> Optional[MonthGrid]:
+    """Get a month's grid if it is cached, without building it (see get_month_grid)."""
+    if anchor is None and rule is None:
+        anchor = get_first_monday(year)
+    key = (year, month, anchor, rule)
+    with _grids_lock:
+        grid = _grids.get(key)
+        if grid is not None:
+            _grids.move_to_end(key)
+        return grid
+
+
+_grids = OrderedDict()  # (year, month, anchor, rule) -> MonthGrid, least recently used first
+_grids_lock = threading.Lock()
@@ -0,0 +1,164 @@
+"""
+Opt-in profiling of event handlers.
+
+A Profiler replaces chosen methods of an object with timed wrappers, set as
+instance attributes, and removes them again when done. Nothing is wrapped
+until profiling is enabled, so a disabled profiler costs nothing per call.
+
+Each call adds one (name, start, seconds) entry to a fixed-size ring buffer
+and updates the call count, total and maximum time of its name. The next N
+calls of a method can also be run under cProfile. record_first_paint times
+the startup for benchmarks/bench_startup.py.
+"""
+import json
+import os
+import time
+from collections import deque
+
+RING_SIZE = 1024  # Most recent calls kept with their timings
+
+
+class Profiler:
+    """Times calls of instrumented methods."""
+
+    def __init__(self, ring_size: int = RING_SIZE, clock=time.perf_counter):
+        """
+        Args:
+            ring_size (int): Number of recent calls to keep
+            clock: Returns seconds, used to time calls
+        """
+        self.clock = clock
+        self.calls = {}  # name -> [count, total seconds, max seconds]
+        self.recent = deque(maxlen=ring_size)
+        self.started = clock()
+        self.instrumented = []
+        self.capture_name = None
+        self.capture_left = 0
+        self.capture_path = None
+        self.capture_profile = None
+
+    def instrument(self, obj, names, prefix: str = ''):
+        """
+        Time calls of obj's methods from now on.
+
+        Only calls made through the attribute are timed: callbacks already
+        handed to Tk keep calling the original method until rebound.
+
+        Args:
+            obj: Object whose methods to time
+            names: Method names
+            prefix (str): Prefix for the recorded names, e.g. 'scheduler.'
+        """
+        for name in names:
+            if name in vars(obj):
+                continue  # Already instrumented
+            setattr(obj, name, self._wrap(prefix + name, getattr(obj, name)))
+            self.instrumented.append((obj, name))
+
+    def remove(self):
+        """Restore the original methods; the collected stats are kept."""
+        for obj, name in self.instrumented:
+            vars(obj).pop(name, None)
+        self.instrumented = []
+
+    def _wrap(self, name: str, func):
+        stats = self.calls.setdefault(name, [0, 0.0, 0.0])
+        recent = self.recent
+        clock = self.clock
+
+        def timed(*args, **kwargs):
+            if self.capture_name == name:
+                return self._run_captured(name, func, args, kwargs)
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                seconds = clock() - start
+                stats[0] += 1
+                stats[1] += seconds
+                if seconds > stats[2]:
+                    stats[2] = seconds
+                recent.append((name, start, seconds))
+        timed.__wrapped__ = func
+        return timed
+
+    def capture(self, name: str, num_calls: int, path: str):
+        """
+        Run the next calls of an instrumented method under cProfile; these
+        calls are left out of the timings.
+
+        Args:
+            name (str): Recorded name of the method, e.g. 'update_calendar'
+            num_calls (int): Number of calls to profile
+            path (str): Where to write the pstats file; a readable summary
+                sorted by cumulative time is written to path + '.txt'
+        """
+        import cProfile
+
+        self.capture_profile = cProfile.Profile()
+        self.capture_name = name
+        self.capture_left = num_calls
+        self.capture_path = path
+
+    def _run_captured(self, name: str, func, args, kwargs):
+        import pstats
+
+        profile = self.capture_profile
+        self.capture_name = None  # A nested call of the same method is not captured again
+        try:
+            return profile.runcall(func, *args, **kwargs)
+        finally:
+            self.capture_left -= 1
+            if self.capture_left > 0:
+                self.capture_name = name
+            else:
+                self.capture_profile = None
+                profile.dump_stats(self.capture_path)
+                with open(self.capture_path + '.txt', 'w') as f:
+                    pstats.Stats(profile, stream=f).sort_stats('cumulative').print_stats(30)
+
+    def snapshot(self, **extra) -> dict:
+        """
+        Get the stats collected so far.
+
+        Args:
+            **extra: More values to include, e.g. widgets=count_widgets(root)
+
+        Returns:
+            dict: Uptime, per-name counts and times in milliseconds, and the
+            recent calls, oldest first
+        """
+        return {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'uptime_s': round(self.clock() - self.started, 3),
+            **extra,
+            'calls': {name: {'count': count, 'total_ms': total * 1000, 'max_ms': longest * 1000,
+                             'mean_ms': total * 1000 / count if count else 0.0}
+                      for name, (count, total, longest) in self.calls.items()},
+            'recent': [{'name': name, 'at_s': round(start - self.started, 6), 'ms': seconds * 1000}
+                       for name, start, seconds in self.recent],
+        }
+
+    def write_snapshot(self, path: str, **extra):
+        """Write snapshot() as JSON, replacing the file atomically."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.snapshot(**extra), f, indent=2)
+        os.replace(tmp_path, path)
+
+
+def record_first_paint(root, path: str):
+    """
+    Draw the first frame, write the time it was drawn to path and leave the
+    main loop; used by benchmarks/bench_startup.py through WW_CALENDAR_FIRST_PAINT_FILE.
+    """
+    root.update()
+    with open(path, 'w') as f:
+        f.write(repr(time.time()))
+    root.quit()
+
+
+def count_widgets(widget) -> int:
+    """Count a Tk widget and all of its descendants."""
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
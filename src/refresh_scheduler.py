@@ -0,0 +1,103 @@
+"""
+Refresh scheduling aligned to day boundaries.
+
+Instead of polling, the scheduler sleeps until just after the next local
+midnight (which is also when a new work week starts on Mondays). Each wakeup
+compares the wall clock with a monotonic clock to notice clock jumps (resume,
+DST, manual changes) and reschedule from the new time.
+
+Sleeps are capped at MAX_SLEEP_MS because a timer counts elapsed time, not
+the wall clock: a machine suspended across midnight, or a clock or time zone
+changed while the timer runs, reaches the new date before the timer fires.
+check() catches this as soon as the window is used, but a window nobody
+touches would show the old date until the timer fires, up to a day late.
+The cap bounds that to an hour, for at most 24 wakeups a day.
+"""
+import time
+from datetime import datetime, timedelta
+
+MAX_SLEEP_MS = 3600000  # Longest single sleep (1 hour), see above
+MIDNIGHT_MARGIN_MS = 500  # Wake slightly after midnight, never just before
+JUMP_TOLERANCE_S = 5.0  # Wall vs monotonic drift treated as a clock jump
+
+
+class DayChangeScheduler:
+    """Calls on_day_change(old_date, new_date) when the local date changes."""
+
+    def __init__(self, after, after_cancel, on_day_change, now=datetime.now,
+                 monotonic=time.monotonic, max_sleep_ms: int = MAX_SLEEP_MS):
+        """
+        Args:
+            after: Timer function like Tk's root.after(ms, callback), returning an id
+            after_cancel: Function cancelling a timer id, like root.after_cancel
+            on_day_change: Called with the previous and the new date
+            now: Returns the current local datetime
+            monotonic: Returns monotonic seconds, used to detect clock jumps
+            max_sleep_ms (int): Longest time to sleep between date checks
+        """
+        self.after = after
+        self.after_cancel = after_cancel
+        self.on_day_change = on_day_change
+        self.now = now
+        self.monotonic = monotonic
+        self.max_sleep_ms = max_sleep_ms
+        self.timer_id = None
+        self.today = None
+        self.wakeups = 0
+        self.clock_jumps = 0
+
+    def start(self):
+        """Remember today's date and sleep until the next midnight."""
+        self.today = self.now().date()
+        self.schedule()
+
+    def stop(self):
+        """Cancel the pending wakeup, if any."""
+        if self.timer_id is not None:
+            self.after_cancel(self.timer_id)
+            self.timer_id = None
+
+    def next_delay_ms(self, now: datetime) -> int:
+        """Milliseconds to sleep from now: until just after midnight, at most max_sleep_ms."""
+        next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        delay_ms = int((next_midnight - now).total_seconds() * 1000) + MIDNIGHT_MARGIN_MS
+        return min(delay_ms, self.max_sleep_ms)
+
+    def schedule(self):
+        """(Re)schedule the next wakeup from the current time."""
+        self.stop()
+        now = self.now()
+        self.mark_wall = now
+        self.mark_monotonic = self.monotonic()
+        self.timer_id = self.after(self.next_delay_ms(now), self.wake)
+
+    def wake(self):
+        """Timer callback: check the date and go back to sleep."""
+        self.timer_id = None
+        self.wakeups += 1
+        self.check()
+        if self.timer_id is None:
+            self.schedule()
+
+    def check(self) -> bool:
+        """
+        Check the date now, e.g. on user activity after a resume.
+        Reschedules the wakeup if the date changed or the clock jumped.
+
+        Returns:
+            bool: True if the date changed
+        """
+        now = self.now()
+        wall_elapsed = (now - self.mark_wall).total_seconds()
+        monotonic_elapsed = self.monotonic() - self.mark_monotonic
+        jumped = abs(wall_elapsed - monotonic_elapsed) > JUMP_TOLERANCE_S
+        if jumped:
+            self.clock_jumps += 1
+
+        changed = now.date() != self.today
+        if changed:
+            old_today, self.today = self.today, now.date()
+            self.on_day_change(old_today, self.today)
+        if changed or jumped:
+            self.schedule()
+        return changed
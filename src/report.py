@@ -0,0 +1,368 @@
+"""
+Count events per work week, and per work week and category, over many years.
+
+A WorkWeekReport holds a grid with one row per category and one column per
+work week of its span, in date order. Each batch of timestamps is added in
+one vectorized pass: a per-day lookup table turns dates into grid columns and
+np.bincount accumulates counts (and weights) for all categories at once.
+Reports over the same span and rule merge by adding their grids, so a file
+can be split into chunks aggregated in separate processes.
+"""
+import csv
+import json
+import mmap
+import os
+from datetime import date
+from typing import Iterator, List, NamedTuple, Optional, TextIO, Tuple
+
+import numpy as np
+
+from src.main import _as_ordinals
+from src.week_rules import get_rule
+
+FORMATS = ('csv', 'json')
+
+
+class WorkWeekReport:
+    """Event counts and weight sums per (category, year, work week)."""
+
+    def __init__(self, start_year: int, end_year: int, rule=None):
+        """
+        Args:
+            start_year (int): First calendar year of the events
+            end_year (int): Last calendar year of the events
+            rule: Numbering rule or its name (see src/week_rules.py)
+
+        Raises:
+            ValueError: If end_year is before start_year
+        """
+        if end_year < start_year:
+            raise ValueError(f"end_year {end_year} is before start_year {start_year}")
+        self.rule = get_rule(rule)
+        self.start_year = start_year
+        self.end_year = end_year
+        self.first_ordinal = date(start_year, 1, 1).toordinal()
+
+        # Every day in the span numbered exactly as rule.fiscal_week numbers it;
+        # the year can be the calendar year before or after
+        years = []
+        weeks = []
+        for year in range(start_year, end_year + 1):
+            first_monday, table = self.rule.year_table(year)
+            offsets = np.arange(date(year, 1, 1).toordinal(), date(year, 12, 31).toordinal() + 1)
+            offsets -= first_monday
+            offsets //= 7
+            table_years = np.array([week.year for week in table])
+            table_weeks = np.array([week.week for week in table])
+            years.append(table_years[offsets])
+            weeks.append(table_weeks[offsets])
+        day_years = np.concatenate(years)
+        day_weeks = np.concatenate(weeks)
+        # One grid column per week, in date order: a new week starts wherever
+        # the numbering changes, so the WW1 the default rule wraps back to in
+        # late December gets its own column instead of adding to January's
+        starts = np.ones(len(day_years), dtype=bool)
+        starts[1:] = (day_years[1:] != day_years[:-1]) | (day_weeks[1:] != day_weeks[:-1])
+        self.day_slots = (np.cumsum(starts) - 1).astype(np.int32)
+        self.week_keys = list(zip(day_years[starts].tolist(), day_weeks[starts].tolist()))
+        self.num_slots = len(self.week_keys)
+
+        self.categories: List = []
+        self.category_index = {}
+        self.counts = np.zeros((0, self.num_slots), dtype=np.int64)
+        self.weights = None  # Float sums, once weights are added
+        self.out_of_range = 0  # Events outside the span, not counted
+        self.invalid = 0  # Input lines without a readable date (see aggregate_file)
+
+    def _row(self, key) -> int:
+        """Get the grid row of a category, adding a row for a new one."""
+        row = self.category_index.get(key)
+        if row is None:
+            row = self.category_index[key] = len(self.categories)
+            self.categories.append(key)
+        return row
+
+    def _category_rows(self, categories) -> np.ndarray:
+        """Map category keys to grid rows, adding rows for new keys."""
+        keys, inverse = np.unique(np.asarray(categories), return_inverse=True)
+        rows = np.array([self._row(key) for key in keys.tolist()], dtype=np.int64)
+        self._grow(len(self.categories))
+        return rows[inverse.reshape(-1)]
+
+    def _grow(self, num_rows: int):
+        extra = num_rows - len(self.counts)
+        if extra > 0:
+            self.counts = np.vstack([self.counts, np.zeros((extra, self.num_slots), dtype=np.int64)])
+            if self.weights is not None:
+                self.weights = np.vstack([self.weights, np.zeros((extra, self.num_slots))])
+
+    def add(self, dates, categories=None, weights=None) -> int:
+        """
+        Count a batch of events.
+
+        Args:
+            dates: numpy datetime64 array (any unit) or integer date ordinals
+            categories: Category key per event (strings or ints); all events
+                count under the category None if not given
+            weights: Number per event to sum, e.g. durations
+
+        Returns:
+            int: The number of events counted (events outside the span are skipped)
+        """
+        days = _as_ordinals(dates).reshape(-1)
+        days -= self.first_ordinal
+        inside = (days >= 0) & (days < len(self.day_slots))
+        num_inside = int(np.count_nonzero(inside))
+        self.out_of_range += len(days) - num_inside
+        if num_inside < len(days):
+            days = days[inside]
+
+        if categories is None:
+            row = self._row(None)
+            self._grow(len(self.categories))
+            flat = self.day_slots[days].astype(np.int64)
+            flat += row * self.num_slots
+        else:
+            rows = self._category_rows(categories)
+            if num_inside < len(inside):
+                rows = rows[inside]
+            flat = rows * self.num_slots
+            flat += self.day_slots[days]
+
+        size = self.counts.size
+        self.counts += np.bincount(flat, minlength=size).reshape(self.counts.shape)
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.float64).reshape(-1)
+            if num_inside < len(inside):
+                weights = weights[inside]
+            if self.weights is None:
+                self.weights = np.zeros(self.counts.shape)
+            self.weights += np.bincount(flat, weights, minlength=size).reshape(self.counts.shape)
+        return num_inside
+
+    def merge(self, other: 'WorkWeekReport') -> 'WorkWeekReport':
+        """
+        Add another report's counts to this one, matching categories by key.
+
+        Raises:
+            ValueError: If the reports cover different spans or rules
+        """
+        if (other.start_year, other.end_year, other.rule) != (self.start_year, self.end_year, self.rule):
+            raise ValueError("Only reports over the same years and rule can be merged")
+        rows = [self._row(key) for key in other.categories]
+        self._grow(len(self.categories))
+        self.counts[rows] += other.counts
+        if other.weights is not None:
+            if self.weights is None:
+                self.weights = np.zeros(self.counts.shape)
+            self.weights[rows] += other.weights
+        self.out_of_range += other.out_of_range
+        self.invalid += other.invalid
+        return self
+
+    def weeks(self) -> List[Tuple[int, int]]:
+        """
+        Get the (year, work week) of each column in date order. Under the
+        default rule a year can end with a second WW1, the week it wraps to.
+        """
+        return list(self.week_keys)
+
+    def rolling(self, window: int, values=None) -> np.ndarray:
+        """
+        Sum over the last window weeks, in week order.
+
+        Args:
+            window (int): Number of weeks per window (1 gives the weekly values)
+            values: Grid to sum (defaults to the counts)
+
+        Returns:
+            numpy.ndarray: One row per category, one column per week as in weeks()
+        """
+        if window < 1:
+            raise ValueError(f"Window must be at least 1 week, got {window}")
+        sums = np.cumsum(self.counts if values is None else values, axis=1)
+        sums[:, window:] = sums[:, window:] - sums[:, :-window]
+        return sums
+
+    def iter_rows(self, window: Optional[int] = None) -> Iterator[tuple]:
+        """
+        Generate one row per category and week: (year, work_week, category,
+        count[, weight][, rolling count over window weeks]).
+        """
+        columns = [self.counts]
+        if self.weights is not None:
+            columns.append(self.weights)
+        if window is not None:
+            columns.append(self.rolling(window))
+        weeks = self.weeks()
+        for row, category in enumerate(self.categories):
+            values = [column[row].tolist() for column in columns]
+            for week_idx, (year, week_num) in enumerate(weeks):
+                yield (year, week_num, '' if category is None else category,
+                       *(value[week_idx] for value in values))
+
+    def fields(self, window: Optional[int] = None) -> Tuple[str, ...]:
+        fields = ('year', 'work_week', 'category', 'count')
+        if self.weights is not None:
+            fields += ('weight',)
+        if window is not None:
+            fields += (f"count_{window}w",)
+        return fields
+
+    def write(self, out: TextIO, fmt: str = 'csv', window: Optional[int] = None) -> int:
+        """
+        Write the report as CSV, or as one JSON object.
+
+        Returns:
+            int: The number of rows written
+
+        Raises:
+            ValueError: If fmt is not supported
+        """
+        from src.export import format_csv, write_chunked
+
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported format {fmt!r}, expected one of {', '.join(FORMATS)}")
+        fields = self.fields(window)
+        if fmt == 'csv':
+            return write_chunked(out, format_csv(self.iter_rows(window), fields)) - 1
+        rows = [dict(zip(fields, row)) for row in self.iter_rows(window)]
+        json.dump({'rule': self.rule.name, 'start_year': self.start_year, 'end_year': self.end_year,
+                   'window': window, 'out_of_range': self.out_of_range, 'invalid': self.invalid,
+                   'rows': rows}, out)
+        out.write("\n")
+        return len(rows)
+
+
+class FileSpec(NamedTuple):
+    """What to aggregate from each line of a delimited file."""
+    start_year: int
+    end_year: int
+    rule: Optional[str]
+    date_column: int
+    category_column: Optional[int] = None
+    weight_column: Optional[int] = None
+    delimiter: str = ','
+
+
+def _parse_dates(values: List[str]) -> np.ndarray:
+    """Parse ISO date prefixes to datetime64[D]; unreadable dates become NaT."""
+    try:
+        return np.array([value[:10] for value in values], dtype='datetime64[D]')
+    except ValueError:
+        pass
+    dates = np.empty(len(values), dtype='datetime64[D]')
+    for i, value in enumerate(values):
+        if value[4:5] != '-':
+            value = f"{value[:4]}-{value[4:6]}-{value[6:8]}"
+        try:
+            dates[i] = np.datetime64(value[:10], 'D')
+        except ValueError:
+            dates[i] = np.datetime64('NaT')
+    return dates
+
+
+def _parse_numbers(values: List[str]) -> np.ndarray:
+    """Parse weights to float64; unreadable values count as 0."""
+    try:
+        return np.array(values, dtype=np.float64)
+    except ValueError:
+        pass
+    numbers = np.zeros(len(values))
+    for i, value in enumerate(values):
+        try:
+            numbers[i] = float(value)
+        except ValueError:
+            pass
+    return numbers
+
+
+def aggregate_lines(text: str, spec: FileSpec) -> WorkWeekReport:
+    """Aggregate a block of delimited lines into a new report."""
+    report = WorkWeekReport(spec.start_year, spec.end_year, spec.rule)
+    columns = [spec.date_column, spec.category_column, spec.weight_column]
+    wanted = [column for column in columns if column is not None]
+    values = [[] for _ in wanted]
+    needed = max(wanted)
+    for fields in csv.reader(text.splitlines(), delimiter=spec.delimiter):
+        if len(fields) > needed:
+            for column_values, column in zip(values, wanted):
+                column_values.append(fields[column].strip())
+        elif fields:
+            report.invalid += 1
+    if not values[0]:
+        return report
+    dates = _parse_dates(values[0])
+    valid = ~np.isnat(dates)
+    arrays = {'categories': None, 'weights': None}
+    column_values = iter(values[1:])
+    if spec.category_column is not None:
+        arrays['categories'] = np.array(next(column_values))
+    if spec.weight_column is not None:
+        arrays['weights'] = _parse_numbers(next(column_values))
+    if not valid.all():
+        report.invalid += int(np.count_nonzero(~valid))
+        dates = dates[valid]
+        arrays = {key: None if array is None else array[valid] for key, array in arrays.items()}
+    report.add(dates, **arrays)
+    return report
+
+
+def aggregate_file_range(path: str, start: int, end: int, spec: FileSpec) -> WorkWeekReport:
+    """Aggregate the lines between two byte offsets of a file (run in worker processes)."""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return aggregate_lines(data[start:end].decode('utf-8', 'replace'), spec)
+
+
+def aggregate_file(path: str, start_year: int, end_year: int, date_column: str,
+                   category_column: Optional[str] = None, weight_column: Optional[str] = None,
+                   delimiter: str = ',', rule=None, workers: Optional[int] = None,
+                   chunk_bytes: Optional[int] = None) -> WorkWeekReport:
+    """
+    Aggregate a CSV or log file with a header line, split into chunks across processes.
+
+    Args:
+        path (str): Input file
+        start_year (int): First calendar year counted
+        end_year (int): Last calendar year counted
+        date_column (str): Date or timestamp column name, or 0-based index
+        category_column (str): Column to group by, if any
+        weight_column (str): Numeric column to sum, if any
+        delimiter (str): Field separator
+        rule: Numbering rule name
+        workers (int): Worker processes; 1 aggregates in this process, None uses all CPUs
+        chunk_bytes (int): Approximate bytes per chunk (see src/tagger.py)
+
+    Returns:
+        WorkWeekReport: The merged report
+
+    Raises:
+        ValueError: If a column is not found
+    """
+    from src.tagger import CHUNK_BYTES, _map_in_order, find_column, split_lines
+
+    rule_name = get_rule(rule).name
+    workers = workers or os.cpu_count() or 1
+    report = WorkWeekReport(start_year, end_year, rule_name)
+    if os.path.getsize(path) == 0:
+        return report
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = data.find(b'\n') + 1 or len(data)
+        header = data[:start]
+        delimiter_bytes = delimiter.encode()
+        columns = [None if column is None else find_column(header, column, delimiter_bytes)
+                   for column in (date_column, category_column, weight_column)]
+        spec = FileSpec(start_year, end_year, rule_name, *columns, delimiter)
+        chunks = split_lines(data, start, chunk_bytes or CHUNK_BYTES)
+        if workers == 1:
+            for chunk_start, chunk_end in chunks:
+                report.merge(aggregate_lines(data[chunk_start:chunk_end].decode('utf-8', 'replace'), spec))
+            return report
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(workers) as pool:
+            # A few chunks per worker in flight, so memory does not grow with the file
+            for part in _map_in_order(pool, aggregate_file_range, path, chunks, spec, 2 * workers):
+                report.merge(part)
+    return report
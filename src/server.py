@@ -0,0 +1,253 @@
+"""
+Local HTTP/JSON work week service built on asyncio (standard library only).
+
+Endpoints:
+    GET  /ww?date=2025-03-14[&start=2024-12-30][&rule=iso]   one date
+    POST /ww/batch  {"dates": [...], "start": optional, "rule": optional}   many dates
+    GET  /range?year=2025&ww=37                    dates of a work week
+
+Without start or rule, dates are numbered from their own year's first Monday,
+as in the widget. rule selects a numbering rule from src/week_rules.py.
+Connections are kept alive between requests, and responses are kept in an
+LRU cache.
+
+Started with holiday files, /ww also lists the holidays on the date and
+/ww/batch flags the dates that are holidays. The files are re-checked in a
+worker thread every HOLIDAY_CHECK_S seconds and the response cache is cleared
+when they change.
+"""
+import asyncio
+import json
+from datetime import date
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from src.main import get_first_monday, get_work_week_number, get_work_week_ranges
+from src.week_rules import WeekRule, get_rule
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+RESPONSE_CACHE_SIZE = 1024
+MAX_CACHED_BODY = 64 * 1024  # Larger request bodies skip the response cache
+MAX_BODY = 16 * 1024 * 1024
+HOLIDAY_CHECK_S = 60
+
+_holidays = None  # HolidayIndex in use, if holiday files were given
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large'}
+
+
+class RequestError(Exception):
+    """A request the service cannot answer; carries the HTTP status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _parse_date(value) -> date:
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise RequestError(400, f"Invalid date {value!r}, expected YYYY-MM-DD")
+
+
+def _parse_rule(value) -> Optional[WeekRule]:
+    if not value:
+        return None
+    try:
+        return get_rule(value)
+    except (TypeError, ValueError) as e:
+        raise RequestError(400, str(e))
+
+
+def _work_week(current_date: date, start_date: Optional[date], rule: Optional[WeekRule]) -> int:
+    if rule is not None:
+        return rule.week_number(current_date)
+    if start_date is None:
+        start_date = get_first_monday(current_date.year)
+    return get_work_week_number(current_date, start_date)
+
+
+def _get_ww(query: dict) -> dict:
+    current_date = _parse_date(query.get('date'))
+    start_date = _parse_date(query['start']) if 'start' in query else None
+    rule = _parse_rule(query.get('rule'))
+    if rule is not None:
+        week = rule.fiscal_week(current_date)
+        response = {'date': current_date.isoformat(), 'year': week.year, 'work_week': week.week}
+    else:
+        response = {'date': current_date.isoformat(), 'year': current_date.year,
+                    'work_week': _work_week(current_date, start_date, None)}
+    if _holidays is not None:
+        response['holidays'] = _holidays.summaries(current_date)
+    return response
+
+
+def _post_batch(body: bytes) -> dict:
+    try:
+        request = json.loads(body)
+    except ValueError:
+        raise RequestError(400, "Request body must be JSON")
+    if not isinstance(request, dict) or not isinstance(request.get('dates'), list):
+        raise RequestError(400, 'Expected {"dates": [...]}')
+    start_date = _parse_date(request['start']) if request.get('start') else None
+    rule = _parse_rule(request.get('rule'))
+    dates = [_parse_date(value) for value in request['dates']]
+    response = {'work_weeks': [_work_week(current_date, start_date, rule) for current_date in dates]}
+    if _holidays is not None:
+        response['holidays'] = [_holidays.is_holiday(current_date) for current_date in dates]
+    return response
+
+
+def _get_range(query: dict) -> dict:
+    try:
+        year = int(query['year'])
+        week_num = int(query['ww'])
+        ranges = get_work_week_ranges(year, week_num)
+    except (KeyError, ValueError) as e:
+        raise RequestError(400, f"Expected year and ww (1-52): {e}")
+    return {'year': year, 'work_week': week_num,
+            'ranges': [{'start': week.start.isoformat(), 'end': week.end.isoformat(),
+                        'months': [list(month) for month in week.months]}
+                       for week in ranges]}
+
+
+def set_holidays(holidays):
+    """Answer from a new HolidayIndex (or None to leave holidays out)."""
+    global _holidays
+    _holidays = holidays
+    _cached_handle_request.cache_clear()
+
+
+def handle_request(method: str, target: str, body: bytes = b'') -> Tuple[int, bytes]:
+    """
+    Answer one request.
+
+    Args:
+        method (str): HTTP method
+        target (str): Request path and query string
+        body (bytes): Request body
+
+    Returns:
+        Tuple[int, bytes]: HTTP status and JSON response body
+    """
+    if len(body) <= MAX_CACHED_BODY:
+        return _cached_handle_request(method, target, body)
+    return _handle_request(method, target, body)
+
+
+@lru_cache(maxsize=RESPONSE_CACHE_SIZE)
+def _cached_handle_request(method: str, target: str, body: bytes) -> Tuple[int, bytes]:
+    return _handle_request(method, target, body)
+
+
+def _handle_request(method: str, target: str, body: bytes) -> Tuple[int, bytes]:
+    url = urlsplit(target)
+    query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+    routes = {('GET', '/ww'): lambda: _get_ww(query),
+              ('POST', '/ww/batch'): lambda: _post_batch(body),
+              ('GET', '/range'): lambda: _get_range(query)}
+    try:
+        route = routes.get((method, url.path))
+        if route is None:
+            if any(path == url.path for _, path in routes):
+                raise RequestError(405, f"{method} not allowed on {url.path}")
+            raise RequestError(404, f"No such endpoint {url.path}")
+        status, payload = 200, route()
+    except RequestError as e:
+        status, payload = e.status, {'error': str(e)}
+    except (ValueError, OverflowError) as e:
+        # Dates and weeks the date and rule code cannot represent, e.g. past 9999
+        status, payload = 400, {'error': str(e)}
+    return status, json.dumps(payload).encode()
+
+
+async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Serve HTTP/1.1 requests on one connection until the client closes it."""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                break
+            try:
+                method, target, version = request_line.decode('latin-1').split()
+            except ValueError:
+                break
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            try:
+                length = int(headers.get('content-length', 0))
+            except ValueError:
+                break
+            if length > MAX_BODY:
+                status, payload = 413, json.dumps({'error': 'Request body too large'}).encode()
+                keep_alive = False
+            else:
+                body = await reader.readexactly(length) if length else b''
+                status, payload = handle_request(method, target, body)
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' and (version == 'HTTP/1.1' or connection == 'keep-alive')
+
+            writer.write(f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                         "Content-Type: application/json\r\n"
+                         f"Content-Length: {len(payload)}\r\n"
+                         f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                         "\r\n".encode('latin-1') + payload)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                       unix_path: Optional[str] = None) -> asyncio.AbstractServer:
+    """Start listening on host:port, or on a Unix socket if unix_path is given."""
+    if unix_path is not None:
+        return await asyncio.start_unix_server(handle_connection, path=unix_path)
+    return await asyncio.start_server(handle_connection, host, port)
+
+
+async def watch_holidays(calendar, interval: float = HOLIDAY_CHECK_S):
+    """Reload a HolidayCalendar's changed files periodically, parsing off the event loop."""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval)
+        if await loop.run_in_executor(None, calendar.reload):
+            set_holidays(calendar.index)
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_path: Optional[str] = None,
+          holiday_paths: Sequence[str] = ()):
+    """Run the service until interrupted."""
+    async def run():
+        watcher = None
+        if holiday_paths:
+            from src.holidays import HolidayCalendar
+            calendar = HolidayCalendar(holiday_paths)
+            calendar.reload()
+            set_holidays(calendar.index)
+            watcher = asyncio.ensure_future(watch_holidays(calendar))
+        server = await start_server(host, port, unix_path)
+        async with server:
+            try:
+                await server.serve_forever()
+            finally:
+                if watcher is not None:
+                    watcher.cancel()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
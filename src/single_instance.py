@@ -0,0 +1,320 @@
+"""
+Single-instance support: one calendar window per user.
+
+The running widget listens on a local endpoint; a second launch sends it
+"show" and exits instead of starting another interpreter and Tk. Scripts can
+send navigation commands over the same channel (`run_app.py send next`).
+
+The endpoint is a Unix socket where the platform has them, in the user's
+runtime directory. Elsewhere (Windows) the widget listens on a loopback TCP
+port and writes the port to a file in the user's cache directory. Either way
+it is per user, so users of a shared terminal server each get their own
+window. WW_CALENDAR_INSTANCE overrides the socket (or port file) path.
+
+Taking the endpoint is the lock: a new instance first tries to bind it, and
+only if that fails asks the owner whether it is alive. That check, and
+replacing an endpoint left by a crashed instance, happen under a lock file
+next to the endpoint, so two launches at the same moment cannot both win.
+
+Commands are received on a listener thread and queued; the Tk thread runs
+them when it polls the server. The listener only wakes the Tk loop when a
+command arrives (the widget generates a virtual event, which tkinter hands
+to the Tk thread), so an idle window has no timer polling for commands.
+
+Commands are single lines, answered with "ok" or "error: <reason>":
+    show            raise the window and go to today
+    today           go to today
+    next [N]        forward N months (default 1)
+    prev [N]        back N months (default 1)
+    month YYYY-MM   show a month
+    week [YYYY] N   show the month of work week N
+    ping            check that the instance is running
+    quit            close the window
+"""
+import os
+import socket
+
+# A second launch imports only this module before exiting, so heavier imports
+# (typing, threading) are left out or deferred until a server starts
+
+USE_UNIX_SOCKET = hasattr(socket, 'AF_UNIX')
+CONNECT_TIMEOUT = 1.0  # Seconds to wait for a running instance to answer
+MAX_COMMAND = 256
+
+COMMANDS = ('show', 'today', 'next', 'prev', 'month', 'week', 'ping', 'quit')
+
+
+def get_instance_path() -> str:
+    """Get the socket path (or, without Unix sockets, the port file) for this user."""
+    path = os.environ.get('WW_CALENDAR_INSTANCE')
+    if path:
+        return path
+    if USE_UNIX_SOCKET:
+        base = os.environ.get('XDG_RUNTIME_DIR')
+        if not base:
+            import tempfile
+            base = tempfile.gettempdir()
+        return os.path.join(base, f"ww_calendar-{os.getuid()}.sock")
+    from src.first_paint import get_cache_dir
+    return os.path.join(get_cache_dir(), 'instance.port')
+
+
+def parse_command(line: str) -> tuple:
+    """
+    Parse a command line into its name and arguments.
+
+    Returns:
+        tuple: (name, args), e.g. ('next', (2,)), ('month', (2025, 3)) or
+        ('week', (None, 37)) when no year is given
+
+    Raises:
+        ValueError: If the line is not a valid command
+    """
+    words = line.split()
+    name, args = (words[0].lower(), words[1:]) if words else ('', [])
+    try:
+        if name in ('show', 'today', 'ping', 'quit') and not args:
+            return name, ()
+        if name in ('next', 'prev') and len(args) <= 1:
+            count = int(args[0]) if args else 1
+            if count >= 1:
+                return name, (count,)
+        if name == 'month' and len(args) == 1:
+            year, month = map(int, args[0].split('-'))
+            if 1 <= year <= 9999 and 1 <= month <= 12:
+                return name, (year, month)
+        if name == 'week' and 1 <= len(args) <= 2:
+            year = int(args[0]) if len(args) == 2 else None
+            week_num = int(args[-1].lower().removeprefix('ww'))
+            if 1 <= week_num <= 53 and (year is None or 1 <= year <= 9999):
+                return name, (year, week_num)
+    except ValueError:
+        pass
+    raise ValueError(f"Invalid command {line.strip()!r}, expected one of {', '.join(COMMANDS)}")
+
+
+def _connect(path: str, timeout: float) -> socket.socket:
+    if USE_UNIX_SOCKET:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        address = path
+    else:
+        with open(path) as f:
+            port = int(f.read())
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        address = ('127.0.0.1', port)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(address)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def send_command(line: str, path: str = None, timeout: float = CONNECT_TIMEOUT) -> str:
+    """
+    Send a command to the running instance.
+
+    Args:
+        line (str): The command, e.g. "next 2"
+        path (str): The instance endpoint (defaults to get_instance_path())
+        timeout (float): Seconds to wait for the connection and the reply
+
+    Returns:
+        str: The reply, "ok" or "error: <reason>"
+
+    Raises:
+        OSError: If no instance is running
+        ValueError: If the port file is corrupt
+    """
+    with _connect(path or get_instance_path(), timeout) as sock:
+        sock.sendall(line.strip().encode() + b"\n")
+        sock.shutdown(socket.SHUT_WR)
+        reply = b""
+        while chunk := sock.recv(MAX_COMMAND):
+            reply += chunk
+    return reply.decode(errors='replace').strip()
+
+
+def notify_running_instance(path: str = None) -> bool:
+    """Ask a running instance to show itself; False if there is none."""
+    try:
+        return send_command('show', path) == 'ok'
+    except (OSError, ValueError):
+        return False
+
+
+class _StartupLock:
+    """An exclusive lock on a file, held while a launch checks and takes the endpoint."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = None
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.file = open(self.path, 'a+b')
+        try:
+            if os.name == 'nt':
+                import msvcrt
+                self.file.seek(0)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1)  # Retries for up to 10 s
+            else:
+                import fcntl
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+        except OSError:
+            self.file.close()
+            raise
+        return self
+
+    def __exit__(self, *exc_info):
+        # The OS also drops the lock if the process dies holding it
+        if os.name == 'nt':
+            import msvcrt
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        self.file.close()
+
+
+class InstanceServer:
+    """Accepts commands for the running instance on a background thread."""
+
+    def __init__(self, path: str = None, wake=None):
+        """
+        Args:
+            path (str): The instance endpoint (defaults to get_instance_path())
+            wake: Called without arguments on the listener thread after a
+                command is queued, to make the Tk thread poll
+        """
+        self.path = path or get_instance_path()
+        self.wake = wake
+        self.sock = None
+        self.thread = None
+        self.received = None  # queue.Queue of (name, args) from the listener thread
+        self.commands = 0
+
+    def start(self) -> bool:
+        """
+        Take the endpoint and start listening.
+
+        Returns:
+            bool: False if another instance already owns the endpoint
+        """
+        import queue
+        import threading
+        
+        with _StartupLock(f"{self.path}.lock"):
+            sock = self._bind() if USE_UNIX_SOCKET else None
+            if sock is None:
+                # Taken (or, over TCP, unknown until asked): is its owner alive?
+                if self._is_alive():
+                    return False
+                if USE_UNIX_SOCKET:
+                    # Left behind by an instance that did not exit cleanly
+                    os.unlink(self.path)
+                    sock = self._bind()
+                else:
+                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                    sock.bind(('127.0.0.1', 0))
+                    os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                    with open(self.path, 'w') as f:
+                        f.write(str(sock.getsockname()[1]))
+            # Listen before the lock is released, so the next launch's check sees us
+            sock.listen(8)
+            self.sock = sock
+            self.received = queue.Queue()
+            self.thread = threading.Thread(target=self._serve, name='single-instance', daemon=True)
+            self.thread.start()
+        return True
+
+    def _bind(self):
+        """Bind the Unix socket; None if its file exists."""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.bind(self.path)
+        except OSError:
+            sock.close()
+            return None
+        return sock
+
+    def poll(self, dispatch) -> int:
+        """
+        Run the commands received since the last poll, on the calling (Tk) thread.
+
+        Args:
+            dispatch: Called as dispatch(name, args) for each command except ping
+
+        Returns:
+            int: The number of commands run
+        """
+        import queue
+        
+        count = 0
+        while self.received is not None:
+            try:
+                name, args = self.received.get_nowait()
+            except queue.Empty:
+                break
+            dispatch(name, args)
+            count += 1
+        self.commands += count
+        return count
+
+    def _is_alive(self) -> bool:
+        try:
+            return send_command('ping', self.path) == 'ok'
+        except (OSError, ValueError):
+            return False
+
+    def stop(self):
+        """Stop listening and release the endpoint."""
+        if self.sock is None:
+            return
+        # Unblock accept() with a connection, since closing a socket does not
+        # interrupt it on every platform
+        sock, self.sock = self.sock, None
+        try:
+            _connect(self.path, CONNECT_TIMEOUT).close()
+        except (OSError, ValueError):
+            pass
+        self.thread.join(CONNECT_TIMEOUT)
+        # Under the lock, so a launch that just found us gone keeps the endpoint it takes
+        with _StartupLock(f"{self.path}.lock"):
+            sock.close()
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    def _serve(self):
+        listener = self.sock
+        while self.sock is not None:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                break
+            with conn:
+                if self.sock is None:
+                    break
+                try:
+                    conn.settimeout(CONNECT_TIMEOUT)
+                    conn.sendall(self._handle(conn.makefile('rb').readline(MAX_COMMAND)))
+                except OSError:
+                    pass
+
+    def _handle(self, line: bytes) -> bytes:
+        try:
+            name, args = parse_command(line.decode(errors='replace'))
+        except ValueError as e:
+            return f"error: {e}\n".encode()
+        if name != 'ping':
+            self.received.put((name, args))
+            if self.wake is not None:
+                try:
+                    self.wake()
+                except Exception:
+                    pass  # E.g. the Tk loop is not running yet; the command waits for the next poll
+        return b"ok\n"
@@ -0,0 +1,219 @@
+"""
+Add a work week column to large CSV and log files.
+
+The input is memory-mapped and cut into chunks of whole lines. Each chunk is
+tagged in a worker process, which maps the file itself, so only the tagged
+output travels back; chunks are written in input order while later ones are
+still being tagged. Lines are handled as bytes: the date is taken from the
+first characters of the chosen field (YYYY-MM-DD or YYYYMMDD, optionally
+followed by a time) and looked up in a bounded per-process cache of date
+prefix to work week, so a date object is only built the first time a date is
+seen. Text that is not a date is never cached.
+"""
+import csv
+import mmap
+import os
+from collections import deque
+from datetime import date
+from functools import lru_cache
+from typing import BinaryIO, Iterator, NamedTuple, Optional, Tuple
+
+CHUNK_BYTES = 8 * 1024 * 1024
+WEEK_CACHE_SIZE = 8192  # Date prefixes remembered per process, about 22 years of days
+COLUMN_NAME = 'work_week'
+
+
+class TagOptions(NamedTuple):
+    """How to find the date in a line and what to append."""
+    column: int  # Index of the date field
+    delimiter: bytes = b','
+    rule: Optional[str] = None  # Numbering rule name; None for the widget's default
+
+
+class TagStats(NamedTuple):
+    lines: int
+    bytes_read: int
+    untagged: int  # Lines without a readable date
+
+
+@lru_cache(maxsize=WEEK_CACHE_SIZE)
+def _week_field(prefix: bytes, delimiter: bytes, rule: Optional[str]) -> bytes:
+    """
+    Get the field appended for an ISO date prefix: the delimiter and its work week.
+
+    Raises:
+        ValueError: If the prefix is not a date; lru_cache does not keep
+            exceptions, so the cache only ever holds dates
+    """
+    if prefix[4:5] == b'-':
+        day = date(int(prefix[0:4]), int(prefix[5:7]), int(prefix[8:10]))
+    else:
+        day = date(int(prefix[0:4]), int(prefix[4:6]), int(prefix[6:8]))
+    if rule is None:
+        from src.main import get_first_monday, get_work_week_number
+        week_num = get_work_week_number(day, get_first_monday(day.year))
+    else:
+        from src.week_rules import get_rule
+        week_num = get_rule(rule).week_number(day)
+    return delimiter + str(week_num).encode()
+
+
+def tag_lines(data: bytes, options: TagOptions) -> Tuple[bytes, int, int]:
+    """
+    Append the work week field to each line of a block of whole lines.
+
+    Args:
+        data (bytes): Lines ending in b'\\n' (the last one may have no newline)
+        options (TagOptions): Date field and delimiter
+
+    Returns:
+        Tuple[bytes, int, int]: The tagged lines, the number of lines and the
+        number left with an empty work week
+    """
+    column = options.column
+    delimiter = options.delimiter
+    rule = options.rule
+    # Dates seen in this block; freed with it, while _week_field keeps a bounded set
+    seen = {}
+    out = []
+    untagged = 0
+    lines = data.split(b'\n')
+    # Keep the block's ending: a file's last line may have no newline
+    newline_at_end = lines[-1] == b''
+    if newline_at_end:
+        lines.pop()
+    for line in lines:
+        if b'"' in line and delimiter == b',':
+            fields = next(csv.reader([line.decode('utf-8', 'replace')]), [])
+            field = fields[column].strip().encode() if column < len(fields) else b''
+        else:
+            fields = line.split(delimiter, column + 1)
+            field = fields[column].strip() if column < len(fields) else b''
+        prefix = field[:10] if field[4:5] == b'-' else field[:8]
+        tail = seen.get(prefix)
+        if tail is None:
+            try:
+                tail = seen[prefix] = _week_field(prefix, delimiter, rule)
+            except ValueError:
+                tail = delimiter
+                untagged += 1
+        if line[-1:] == b'\r':
+            out.append(line[:-1] + tail + b'\r')
+        else:
+            out.append(line + tail)
+    if newline_at_end:
+        out.append(b'')
+    return b'\n'.join(out), len(lines), untagged
+
+
+def tag_file_range(path: str, start: int, end: int, options: TagOptions) -> Tuple[bytes, int, int]:
+    """Tag the lines between two byte offsets of a file (run in worker processes)."""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return tag_lines(data[start:end], options)
+
+
+def split_lines(data, start: int, chunk_bytes: int = CHUNK_BYTES) -> Iterator[Tuple[int, int]]:
+    """Yield (start, end) offsets of chunks of about chunk_bytes that end at a line break."""
+    size = len(data)
+    while start < size:
+        end = data.find(b'\n', min(start + chunk_bytes, size) - 1)
+        end = size if end < 0 else end + 1
+        yield start, end
+        start = end
+
+
+def find_column(header: bytes, column: str, delimiter: bytes) -> int:
+    """
+    Resolve a column given by name or 0-based index.
+
+    Raises:
+        ValueError: If the header has no such column
+    """
+    if column.isdigit():
+        return int(column)
+    text = header.rstrip(b'\r\n').decode('utf-8', 'replace')
+    if len(delimiter) == 1:
+        names = next(csv.reader([text], delimiter=delimiter.decode()), [])
+    else:
+        names = text.split(delimiter.decode())
+    names = [name.strip() for name in names]
+    if column not in names:
+        raise ValueError(f"No column {column!r} in header: {', '.join(names)}")
+    return names.index(column)
+
+
+def tag_file(path: str, out: BinaryIO, column: str = '0', delimiter: str = ',',
+             header: bool = True, rule: Optional[str] = None, workers: Optional[int] = None,
+             chunk_bytes: int = CHUNK_BYTES, name: str = COLUMN_NAME) -> TagStats:
+    """
+    Write a copy of a file with a work week field appended to every line.
+
+    Args:
+        path (str): Input file
+        out (BinaryIO): Output file, opened in binary mode
+        column (str): Date column name (needs a header) or 0-based index
+        delimiter (str): Field separator, e.g. ',' or '\\t' or ' ' for logs
+        header (bool): The first line is a header; name is appended to it
+        rule (str): Numbering rule name (see src/week_rules.py)
+        workers (int): Worker processes; 1 tags in this process, None uses all CPUs
+        chunk_bytes (int): Approximate bytes per chunk
+        name (str): Header of the new column
+
+    Returns:
+        TagStats: Lines tagged, bytes read and lines without a date
+
+    Raises:
+        ValueError: If the column is not found
+    """
+    delimiter_bytes = delimiter.encode()
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(path)
+    if size == 0:
+        return TagStats(0, 0, 0)
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = 0
+        if header:
+            start = data.find(b'\n') + 1 or size
+            first_line = data[:start]
+            column_index = find_column(first_line, column, delimiter_bytes)
+            stripped = first_line.rstrip(b'\r\n')
+            out.write(stripped + delimiter_bytes + name.encode() + first_line[len(stripped):])
+        elif column.isdigit():  # A log file: give the field index
+            column_index = int(column)
+        else:
+            raise ValueError("A column name needs a header line; give a 0-based index instead")
+        options = TagOptions(column_index, delimiter_bytes, None if rule in (None, 'default') else rule)
+        chunks = split_lines(data, start, chunk_bytes)
+
+        if workers == 1:
+            return _write_results(out, (tag_lines(data[chunk_start:chunk_end], options)
+                                        for chunk_start, chunk_end in chunks), size)
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(workers) as pool:
+            results = _map_in_order(pool, tag_file_range, path, chunks, options, 2 * workers)
+            return _write_results(out, results, size)
+
+
+def _map_in_order(pool, task, path: str, chunks, options, in_flight: int):
+    """
+    Run task(path, start, end, options) for each chunk in the pool, yielding
+    results in input order with at most in_flight submitted and not yet yielded.
+    """
+    pending = deque()
+    for chunk_start, chunk_end in chunks:
+        pending.append(pool.submit(task, path, chunk_start, chunk_end, options))
+        if len(pending) >= in_flight:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _write_results(out: BinaryIO, results, size: int) -> TagStats:
+    lines = untagged = 0
+    for tagged, num_lines, num_untagged in results:
+        out.write(tagged)
+        lines += num_lines
+        untagged += num_untagged
+    return TagStats(lines, size, untagged)
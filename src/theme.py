@@ -0,0 +1,20 @@
+"""
+Colors and month block geometry shared by every view of the calendar.
+
+The widget, the canvas year view and the static HTML/SVG site draw the same
+MonthGrid; they take their cell colors and sizes from here so the three
+look alike. Nothing here imports tkinter.
+"""
+
+OTHER_MONTH_COLOR = 'lightgray'  # Days of the previous and next month
+TODAY_COLOR = 'lightblue'
+HOLIDAY_COLOR = 'mistyrose'  # Background of days covered by a holiday file event
+
+MAX_WEEKS = 6  # Most week rows a month can span
+MONTHS_PER_ROW = 3  # A quarter per row
+CELL_WIDTH = 30
+CELL_HEIGHT = 18
+TITLE_HEIGHT = 22
+MARGIN = 10
+BLOCK_WIDTH = 8 * CELL_WIDTH  # WW column and Mon-Sun
+BLOCK_HEIGHT = TITLE_HEIGHT + (1 + MAX_WEEKS) * CELL_HEIGHT  # Title, header row and the weeks
@@ -0,0 +1,286 @@
+"""
+Work week numbering rules.
+
+The calendar's own numbering (DefaultRule) counts Monday-Sunday weeks from the
+Monday of the week containing January 1st and wraps back to WW1 after WW52.
+Other sites number weeks differently: ISO-8601 weeks, fiscal years starting
+in another month with 52 or 53 weeks, and 4-4-5 style periods.
+
+Every rule is compiled once per calendar year into a table with one entry per
+Monday-Sunday week overlapping that year, so lookups after the first are a
+single index operation.
+"""
+from datetime import MAXYEAR, MINYEAR, date, timedelta
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+
+from src.main import _as_ordinals, get_first_monday, get_work_week_number
+
+RULE_NAMES = ('default', 'iso', '4-4-5', '4-5-4', '5-4-4', 'fiscal:MM-DD')
+_DAYS_PER_400_YEARS = 146097  # A whole number of weeks, so weekdays repeat too
+
+
+class FiscalWeek(NamedTuple):
+    """The week a date falls in under a rule."""
+    year: int  # The year the week is numbered in
+    week: int
+    period: Optional[int] = None  # Only for period rules such as 4-4-5
+    quarter: Optional[int] = None
+
+
+class WeekRule:
+    """Base class for numbering rules; subclasses implement compute_week."""
+
+    name = None
+
+    def __init__(self):
+        self._year_tables: Dict[int, Tuple[int, Tuple[FiscalWeek, ...]]] = {}
+        self._day_tables: Dict[int, bytes] = {}
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r})"
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.name == other.name
+
+    def __hash__(self):
+        return hash((type(self), self.name))
+
+    def compute_week(self, monday: date, year: int) -> FiscalWeek:
+        """
+        Number one Monday-Sunday week; only called while compiling a year.
+
+        Args:
+            monday (date): The Monday starting the week
+            year (int): The calendar year whose dates are being numbered
+
+        Returns:
+            FiscalWeek: The week under this rule
+        """
+        raise NotImplementedError
+
+    def year_table(self, year: int) -> Tuple[int, Tuple[FiscalWeek, ...]]:
+        """
+        Get the compiled table for a calendar year.
+
+        Returns:
+            Tuple[int, Tuple[FiscalWeek, ...]]: Ordinal of the Monday of the week
+            containing January 1st, and one entry per week from there to December 31st
+
+        Raises:
+            ValueError: If year is outside 1-9999, the years dates can have
+        """
+        table = self._year_tables.get(year)
+        if table is None:
+            if not MINYEAR <= year <= MAXYEAR:
+                raise ValueError(f"year {year} is out of range {MINYEAR}-{MAXYEAR}")
+            first_monday = get_first_monday(year)
+            num_weeks = (date(year, 12, 31) - first_monday).days // 7 + 1
+            weeks = tuple(self.compute_week(first_monday + timedelta(weeks=i), year)
+                          for i in range(num_weeks))
+            table = self._year_tables[year] = (first_monday.toordinal(), weeks)
+        return table
+
+    def fiscal_week(self, current_date: date) -> FiscalWeek:
+        """Get the week a date falls in."""
+        first_ordinal, weeks = self.year_table(current_date.year)
+        return weeks[(current_date.toordinal() - first_ordinal) // 7]
+
+    def week_number(self, current_date: date) -> int:
+        """Get the work week number of a date."""
+        return self.fiscal_week(current_date).week
+
+    def first_date(self, year: int, week_num: int) -> Optional[date]:
+        """
+        Find the earliest date numbered as week_num of year.
+
+        Returns:
+            date: The first matching date, or None if the year has no such week
+        """
+        # Week 1 of a year can start in December and its last weeks can end in January
+        for table_year in range(max(year - 1, MINYEAR), min(year + 1, MAXYEAR) + 1):
+            first_ordinal, weeks = self.year_table(table_year)
+            for week_idx, week in enumerate(weeks):
+                if week.year != year or week.week != week_num:
+                    continue
+                # The table only numbers the days of its own calendar year
+                for day_idx in range(7):
+                    day = date.fromordinal(first_ordinal + week_idx * 7 + day_idx)
+                    if day.year == table_year:
+                        return day
+        return None
+
+    def day_table(self, year: int) -> bytes:
+        """Get the week number of every day of a calendar year, one byte per day."""
+        table = self._day_tables.get(year)
+        if table is None:
+            first_ordinal, weeks = self.year_table(year)
+            start = date(year, 1, 1).toordinal()
+            end = date(year, 12, 31).toordinal()
+            table = self._day_tables[year] = bytes(
+                weeks[(ordinal - first_ordinal) // 7].week for ordinal in range(start, end + 1))
+        return table
+
+    def week_numbers(self, dates):
+        """
+        Get work week numbers for an array of dates, like get_work_week_numbers.
+
+        Args:
+            dates: A numpy datetime64 array or an integer array of date ordinals
+
+        Returns:
+            numpy.ndarray: uint8 array of work week numbers, same shape as dates
+        """
+        import numpy as np
+
+        ordinals = _as_ordinals(dates)
+        if ordinals.size == 0:
+            return np.zeros(ordinals.shape, dtype=np.uint8)
+        first_year = date.fromordinal(int(ordinals.min())).year
+        last_year = date.fromordinal(int(ordinals.max())).year
+        table = np.frombuffer(b"".join(self.day_table(year)
+                                       for year in range(first_year, last_year + 1)),
+                              dtype=np.uint8)
+        return table[ordinals - date(first_year, 1, 1).toordinal()]
+
+
+class DefaultRule(WeekRule):
+    """The calendar's own numbering: weeks from the year's first Monday, wrapping after 52."""
+
+    name = 'default'
+
+    def compute_week(self, monday: date, year: int) -> FiscalWeek:
+        return FiscalWeek(year, get_work_week_number(monday, get_first_monday(year)))
+
+
+class IsoRule(WeekRule):
+    """ISO-8601 weeks: week 1 contains the year's first Thursday; 52 or 53 weeks."""
+
+    name = 'iso'
+
+    def compute_week(self, monday: date, year: int) -> FiscalWeek:
+        iso_year, iso_week, _ = monday.isocalendar()
+        return FiscalWeek(iso_year, iso_week)
+
+
+class FiscalYearRule(WeekRule):
+    """
+    Fiscal years starting on the Monday of the week containing a month/day,
+    with 52 or 53 weeks and no wrapping. A fiscal year that starts after
+    January is named by the calendar year it ends in.
+    """
+
+    def __init__(self, start_month: int = 1, start_day: int = 1):
+        super().__init__()
+        date(2001, start_month, start_day)  # Raises ValueError for invalid days
+        self.start_month = start_month
+        self.start_day = start_day
+        self.name = f"fiscal:{start_month:02d}-{start_day:02d}"
+
+    def year_start_ordinal(self, fiscal_year: int) -> int:
+        """
+        Get the ordinal of the Monday starting week 1 of a fiscal year.
+
+        Also works when that Monday is before 0001-01-01 or after 9999-12-31:
+        the first and last dates there are can fall in such fiscal years.
+        """
+        year = fiscal_year - ((self.start_month, self.start_day) != (1, 1))
+        # Count from the same day 400 years earlier or later, which dates can hold
+        cycles = (MINYEAR - year + 399) // 400 if year < MINYEAR else min(0, (MAXYEAR - year) // 400)
+        start = date(year + cycles * 400, self.start_month, self.start_day)
+        return start.toordinal() - start.weekday() - cycles * _DAYS_PER_400_YEARS
+
+    def year_start(self, fiscal_year: int) -> date:
+        """
+        Get the Monday starting week 1 of a fiscal year.
+
+        Raises:
+            ValueError: If that Monday is before 0001-01-01 or after 9999-12-31
+        """
+        ordinal = self.year_start_ordinal(fiscal_year)
+        if not 1 <= ordinal <= date.max.toordinal():
+            raise ValueError(f"fiscal year {fiscal_year} of {self.name} starts out of range")
+        return date.fromordinal(ordinal)
+
+    def locate(self, monday: date) -> Tuple[int, int]:
+        """Get the (fiscal year, week) of the week starting on monday."""
+        ordinal = monday.toordinal()
+        fiscal_year = monday.year + ((self.start_month, self.start_day) != (1, 1))
+        while self.year_start_ordinal(fiscal_year) > ordinal:
+            fiscal_year -= 1
+        while self.year_start_ordinal(fiscal_year + 1) <= ordinal:
+            fiscal_year += 1
+        return fiscal_year, (ordinal - self.year_start_ordinal(fiscal_year)) // 7 + 1
+
+    def compute_week(self, monday: date, year: int) -> FiscalWeek:
+        return FiscalWeek(*self.locate(monday))
+
+
+class PeriodRule(FiscalYearRule):
+    """
+    4-4-5 style fiscal years: four 13-week quarters, each split into periods
+    of the given lengths. The 53rd week of a long year joins the last period.
+    """
+
+    def __init__(self, pattern: Tuple[int, ...] = (4, 4, 5), start_month: int = 1,
+                 start_day: int = 1):
+        if sum(pattern) != 13 or min(pattern) < 1:
+            raise ValueError(f"Period lengths must add up to 13 weeks, got {pattern}")
+        super().__init__(start_month, start_day)
+        self.pattern = tuple(pattern)
+        self.name = "-".join(map(str, self.pattern))
+        if (start_month, start_day) != (1, 1):
+            self.name += f":{start_month:02d}-{start_day:02d}"
+
+    def compute_week(self, monday: date, year: int) -> FiscalWeek:
+        fiscal_year, week_num = self.locate(monday)
+        quarter, quarter_week = divmod(min(week_num, 52) - 1, 13)
+        period = quarter * len(self.pattern) + 1
+        for length in self.pattern:
+            if quarter_week < length:
+                break
+            quarter_week -= length
+            period += 1
+        return FiscalWeek(fiscal_year, week_num, period, quarter + 1)
+
+
+DEFAULT_RULE = DefaultRule()
+_rules: Dict[str, WeekRule] = {'default': DEFAULT_RULE, 'iso': IsoRule()}
+
+
+def get_rule(spec: Union[str, WeekRule, None] = None) -> WeekRule:
+    """
+    Get a rule by name, reusing compiled tables for rules already in use.
+
+    Args:
+        spec: A WeekRule, None for the default rule, or a name: 'default', 'iso',
+            a period pattern like '4-4-5', or 'fiscal:MM-DD'; patterns also take
+            a fiscal year start, e.g. '4-4-5:10-01'
+
+    Returns:
+        WeekRule: The rule
+
+    Raises:
+        ValueError: If spec is not a WeekRule, None or a known rule name
+    """
+    if isinstance(spec, WeekRule):
+        return spec
+    if spec is None:
+        return DEFAULT_RULE
+    if not isinstance(spec, str):
+        raise ValueError(f"Work week rule must be a name, got {spec!r}")
+    rule = _rules.get(spec)
+    if rule is not None:
+        return rule
+
+    kind, _, start = spec.partition(':')
+    try:
+        start_month, start_day = (map(int, start.split('-')) if '-' in start
+                                  else (int(start or 1), 1))
+        if kind == 'fiscal':
+            rule = FiscalYearRule(start_month, start_day)
+        else:
+            rule = PeriodRule(tuple(int(length) for length in kind.split('-')),
+                              start_month, start_day)
+    except ValueError:
+        raise ValueError(f"Unknown work week rule {spec!r}, expected one of {', '.join(RULE_NAMES)}")
+    return _rules.setdefault(spec, rule)
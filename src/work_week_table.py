@@ -0,0 +1,171 @@
+"""
+Precomputed work week lookup tables.
+
+A table stores one work week number (one byte) per day over a span of years,
+indexed by date.toordinal() offset, so a lookup is a single index operation.
+Tables can be saved to a flat binary file and opened with mmap, which lets many
+short-lived processes share one copy through the OS page cache.
+
+get_work_week_number in src/main.py answers from these tables for the start
+dates it sees most, and from WW_TABLE_DIR's files when that is set.
+"""
+import mmap
+import os
+import struct
+from datetime import date, timedelta
+from functools import lru_cache
+
+from src.main import _calculate_work_week_number
+
+# magic, start ordinal (Monday of WW1), first ordinal, number of days
+_HEADER = struct.Struct('<4sqqq')
+_MAGIC = b'WWT1'
+
+DEFAULT_FIRST_YEAR = 1900
+DEFAULT_LAST_YEAR = 2200
+TABLE_CACHE_SIZE = 8
+
+
+class WorkWeekTable:
+    """Work week numbers for every day from first_ordinal on, for one start date."""
+
+    def __init__(self, start_date: date, first_ordinal: int, data):
+        self.start_date = start_date
+        self.first_ordinal = first_ordinal
+        self.data = data
+
+    def __len__(self):
+        return len(self.data)
+
+    def __contains__(self, current_date: date) -> bool:
+        return 0 <= current_date.toordinal() - self.first_ordinal < len(self.data)
+
+    @property
+    def first_date(self) -> date:
+        return date.fromordinal(self.first_ordinal)
+
+    @property
+    def last_date(self) -> date:
+        return date.fromordinal(self.first_ordinal + len(self.data) - 1)
+
+    def lookup(self, current_date: date) -> int:
+        """
+        Get the work week number for a date covered by the table.
+
+        Args:
+            current_date (date): The date to look up
+
+        Returns:
+            int: The work week number (1-52)
+
+        Raises:
+            KeyError: If the date is outside the table's span
+        """
+        offset = current_date.toordinal() - self.first_ordinal
+        if not 0 <= offset < len(self.data):
+            raise KeyError(current_date)
+        return self.data[offset]
+
+    def save(self, path: str):
+        """
+        Write the table to a flat binary file.
+        The file is written to a temporary name first and renamed into place, so
+        other processes never see a partially written table.
+        """
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, self.start_date.toordinal(),
+                                 self.first_ordinal, len(self.data)))
+            f.write(self.data)
+        os.replace(tmp_path, path)
+
+
+def build_work_week_table(start_date: date, first_year: int = DEFAULT_FIRST_YEAR,
+                          last_year: int = DEFAULT_LAST_YEAR) -> WorkWeekTable:
+    """
+    Precompute work week numbers for every day from Jan 1 of first_year to
+    Dec 31 of last_year.
+
+    Args:
+        start_date (date): The date to start counting from (WW1)
+        first_year (int): First year covered by the table
+        last_year (int): Last year covered by the table
+
+    Returns:
+        WorkWeekTable: The in-memory table
+    """
+    first_day = date(first_year, 1, 1)
+    num_days = date(last_year, 12, 31).toordinal() - first_day.toordinal() + 1
+
+    # Numbers change on Mondays and repeat every 52 weeks, so the table is
+    # one 364-day cycle from the Monday before first_day, repeated
+    skip = first_day.weekday()
+    week_num = _calculate_work_week_number(first_day, start_date)
+    cycle = b''.join(bytes([(week_num - 1 + i) % 52 + 1]) * 7 for i in range(52))
+    data = (cycle * ((skip + num_days) // len(cycle) + 1))[skip:skip + num_days]
+
+    return WorkWeekTable(start_date, first_day.toordinal(), data)
+
+
+def open_work_week_table(path: str) -> WorkWeekTable:
+    """
+    Open a table written by WorkWeekTable.save as a read-only memory map.
+
+    Args:
+        path (str): Path to the table file
+
+    Returns:
+        WorkWeekTable: A table whose data is backed by the mapped file
+
+    Raises:
+        ValueError: If the file is not a valid work week table
+    """
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mapped) < _HEADER.size:
+        raise ValueError(f"{path} is not a work week table")
+    magic, start_ordinal, first_ordinal, num_days = _HEADER.unpack_from(mapped)
+    if magic != _MAGIC or len(mapped) != _HEADER.size + num_days:
+        raise ValueError(f"{path} is not a work week table")
+    data = memoryview(mapped)[_HEADER.size:]
+    return WorkWeekTable(date.fromordinal(start_ordinal), first_ordinal, data)
+
+
+def get_work_week_table(start_date: date, first_year: int = DEFAULT_FIRST_YEAR,
+                        last_year: int = DEFAULT_LAST_YEAR, table_dir: str = None) -> WorkWeekTable:
+    """
+    Get the table for a start date, reusing one of the most recently used tables.
+
+    Start dates in the same week share a table. With table_dir, the table is
+    memory-mapped from a file in that directory, and built and saved there first
+    if it does not exist yet.
+
+    Args:
+        start_date (date): The date to start counting from (WW1)
+        first_year (int): First year covered by the table
+        last_year (int): Last year covered by the table
+        table_dir (str): Optional directory of shared table files
+
+    Returns:
+        WorkWeekTable: The cached table
+    """
+    monday = start_date - timedelta(days=start_date.weekday())
+    return _get_work_week_table(monday, first_year, last_year, table_dir)
+
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def _get_work_week_table(monday: date, first_year: int, last_year: int,
+                         table_dir: str) -> WorkWeekTable:
+    if table_dir is None:
+        return build_work_week_table(monday, first_year, last_year)
+
+    path = os.path.join(table_dir, f"ww_{monday.isoformat()}_{first_year}_{last_year}.bin")
+    try:
+        return open_work_week_table(path)
+    except (FileNotFoundError, ValueError):
+        pass
+    table = build_work_week_table(monday, first_year, last_year)
+    os.makedirs(table_dir, exist_ok=True)
+    table.save(path)
+    return open_work_week_table(path)
+
@@ -0,0 +1,239 @@
+"""
+Background jobs for the Tk widget.
+
+Slow work (building month grids, reloading holiday files) runs in a thread or
+process pool. Finished jobs are put on a thread-safe queue that the Tk main
+loop drains with a root.after timer, so results are only ever applied on the
+Tk thread. The timer runs only while jobs are outstanding.
+
+A job can be given a key: submitting another job with the same key cancels
+the older one, e.g. a month requested by a click that further clicks have
+already superseded. A cancelled job that had already started still runs to
+the end, but its result is dropped.
+"""
+import queue
+import sys
+import time
+import traceback
+from typing import Callable, Dict, Optional
+
+WORKER_THREADS = 2
+PUMP_MS = 10  # How often finished jobs are collected while any are outstanding
+
+
+class Job:
+    """A submitted call and its timings (seconds from the pool's clock)."""
+
+    __slots__ = ('func', 'args', 'kwargs', 'key', 'on_done', 'on_error', 'future',
+                 'submitted', 'started', 'finished', 'cancelled')
+
+    def __init__(self, func, args, kwargs, key, on_done, on_error, submitted: float):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.key = key
+        self.on_done = on_done
+        self.on_error = on_error
+        self.future = None
+        self.submitted = submitted
+        self.started = None
+        self.finished = None
+        self.cancelled = False
+
+
+def _run(func, args, kwargs):
+    """Run a job in a worker process, returning its timings with the result."""
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, started, time.perf_counter()
+
+
+class WorkerPool:
+    """Runs jobs off the Tk thread and hands their results back to it."""
+
+    def __init__(self, after, after_cancel, workers: int = WORKER_THREADS, processes: bool = False,
+                 pump_ms: int = PUMP_MS, clock=time.perf_counter):
+        """
+        Args:
+            after: Timer function like Tk's root.after(ms, callback), returning an id
+            after_cancel: Function cancelling a timer id, like root.after_cancel
+            workers (int): Worker threads or processes; 0 runs each job right
+                away on the calling thread, e.g. in tests
+            processes (bool): Use processes instead of threads; jobs must then
+                be picklable module-level functions and arguments
+            pump_ms (int): Delay between queue checks while jobs are outstanding
+            clock: Returns seconds, used for the latency stats; with processes
+                it must be time.perf_counter to compare with the workers' times
+        """
+        self.after = after
+        self.after_cancel = after_cancel
+        self.workers = workers
+        self.processes = processes
+        self.pump_ms = pump_ms
+        self.clock = clock
+        self.executor = None
+        self.results = queue.Queue()  # Finished or cancelled jobs, filled by worker threads
+        self.latest: Dict[object, Job] = {}  # key -> the job that supersedes earlier ones
+        self.pump_id = None
+        self.outstanding = 0  # Jobs submitted and not yet collected by pump()
+        self.max_outstanding = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.latency = [0.0, 0.0]  # Submit to result applied: total, max seconds
+        self.run_time = [0.0, 0.0]  # Time spent running in a worker: total, max seconds
+
+    def submit(self, func: Callable, *args, key=None, on_done: Optional[Callable] = None,
+               on_error: Optional[Callable] = None, **kwargs) -> Job:
+        """
+        Run func(*args, **kwargs) in the pool.
+
+        Args:
+            func: The work to do; it must not touch Tk
+            key: Cancels the previous job submitted with the same key, if any
+            on_done: Called with the result on the Tk thread
+            on_error: Called with the exception on the Tk thread; by default
+                the traceback is printed to stderr
+
+        Returns:
+            Job: The submitted job
+        """
+        job = Job(func, args, kwargs, key, on_done, on_error, self.clock())
+        self.submitted += 1
+        if key is not None:
+            self.cancel(key)
+            self.latest[key] = job
+        if self.workers == 0:
+            self._run_inline(job)
+            return job
+
+        if self.executor is None:
+            from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+            if self.processes:
+                self.executor = ProcessPoolExecutor(self.workers)
+            else:
+                self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix='ww-worker')
+        if self.processes:
+            job.future = self.executor.submit(_run, func, args, kwargs)
+        else:
+            job.future = self.executor.submit(self._run_thread, job)
+        self.outstanding += 1
+        self.max_outstanding = max(self.max_outstanding, self.outstanding)
+        # Called on the worker thread, or right away if the job already ended
+        job.future.add_done_callback(lambda future: self.results.put(job))
+        if self.pump_id is None:
+            self.pump_id = self.after(self.pump_ms, self.pump)
+        return job
+
+    def _run_thread(self, job: Job):
+        job.started = self.clock()
+        try:
+            return job.func(*job.args, **job.kwargs)
+        finally:
+            job.finished = self.clock()
+
+    def _run_inline(self, job: Job):
+        job.started = self.clock()
+        try:
+            result = job.func(*job.args, **job.kwargs)
+        except Exception as e:
+            job.finished = self.clock()
+            self._finish(job, None, e)
+        else:
+            job.finished = self.clock()
+            self._finish(job, result, None)
+
+    def cancel(self, key) -> bool:
+        """
+        Cancel the job submitted with a key, if it has not been applied yet.
+
+        Returns:
+            bool: Whether a job was cancelled
+        """
+        job = self.latest.pop(key, None)
+        if job is None or job.future is None:
+            return False
+        job.cancelled = True
+        job.future.cancel()  # Only stops a job that has not started
+        return True
+
+    def is_pending(self, key) -> bool:
+        """Check whether a job with this key is queued or running."""
+        return key in self.latest
+
+    def pump(self):
+        """Apply the results of finished jobs (Tk timer callback)."""
+        self.pump_id = None
+        while True:
+            try:
+                job = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.outstanding -= 1
+            if job.cancelled:
+                self.cancelled += 1
+                continue
+            error = job.future.exception()
+            result = None if error is not None else job.future.result()
+            if self.processes and error is None:
+                result, job.started, job.finished = result
+            self._finish(job, result, error)
+        if self.outstanding > 0:
+            self.pump_id = self.after(self.pump_ms, self.pump)
+
+    def _finish(self, job: Job, result, error: Optional[BaseException]):
+        if job.key is not None and self.latest.get(job.key) is job:
+            del self.latest[job.key]
+        if job.started is not None and job.finished is not None:
+            self._add_time(self.run_time, job.finished - job.started)
+        try:
+            if error is not None:
+                self.failed += 1
+                if job.on_error is not None:
+                    job.on_error(error)
+                else:
+                    traceback.print_exception(type(error), error, error.__traceback__, file=sys.stderr)
+            else:
+                self.completed += 1
+                if job.on_done is not None:
+                    job.on_done(result)
+        finally:
+            self._add_time(self.latency, self.clock() - job.submitted)
+
+    @staticmethod
+    def _add_time(stats, seconds: float):
+        stats[0] += seconds
+        if seconds > stats[1]:
+            stats[1] = seconds
+
+    def stats(self) -> dict:
+        """
+        Get the job counts, the current and largest queue depth, and the job
+        latency (submit to result applied) and run time in milliseconds.
+        """
+        finished = self.completed + self.failed
+        return {
+            'workers': self.workers,
+            'processes': self.processes,
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'cancelled': self.cancelled,
+            'queue_depth': self.outstanding,
+            'max_queue_depth': self.max_outstanding,
+            'latency_ms': {'mean': self.latency[0] * 1000 / finished if finished else 0.0,
+                           'max': self.latency[1] * 1000},
+            'run_ms': {'mean': self.run_time[0] * 1000 / finished if finished else 0.0,
+                       'max': self.run_time[1] * 1000},
+        }
+
+    def shutdown(self):
+        """Stop the pump and the workers; queued jobs are cancelled, results dropped."""
+        if self.pump_id is not None:
+            self.after_cancel(self.pump_id)
+            self.pump_id = None
+        self.latest.clear()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
@@ -0,0 +1,250 @@
+"""
+Scrollable multi-month view drawn on a single tk.Canvas.
+
+Months are laid out three to a row (a quarter per row) and drawn from the
+same MonthGrid model as the single-month view, as rectangle and text items
+instead of one Label per cell. Scrolling is virtualized: only the rows in
+view have canvas items. The canvas scrolls natively over a scroll region
+as tall as all rows; a row scrolled out of view hands its items to the row
+scrolling in, which moves and reconfigures them, so the item count, memory
+use and redraw time stay the same however far the view is scrolled.
+"""
+import calendar
+import tkinter as tk
+from src.clock import get_clock
+from src.month_grid import get_month_grid
+from src.theme import (BLOCK_HEIGHT, BLOCK_WIDTH, CELL_HEIGHT, CELL_WIDTH, HOLIDAY_COLOR, MARGIN,
+                       MAX_WEEKS, MONTHS_PER_ROW, OTHER_MONTH_COLOR, TITLE_HEIGHT, TODAY_COLOR)
+
+FIRST_YEAR = 1900
+LAST_YEAR = 2199
+VISIBLE_ROWS = 3
+
+ROW_HEIGHT = BLOCK_HEIGHT + MARGIN
+SCROLL_UNIT = CELL_HEIGHT  # Pixels per scroll unit (arrow click, wheel step)
+
+DAY_NAMES = ('WW', 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+FONT = ('Arial', 8)
+TITLE_FONT = ('Arial', 10, 'bold')
+
+
+class MonthBlock:
+    """Canvas items of one month position in a row."""
+
+    __slots__ = ('title', 'week_items', 'month', 'num_weeks')
+
+    def __init__(self, title, week_items):
+        self.title = title
+        self.week_items = week_items  # Per week row: WW text, then (rect, text) per day
+        self.month = None  # (year, month) shown
+        self.num_weeks = MAX_WEEKS  # Week rows not hidden
+
+
+class RowSlot:
+    """Canvas items for one row of months, reused as rows scroll in and out of view."""
+
+    __slots__ = ('tag', 'y', 'blocks', 'row')
+
+    def __init__(self, tag, blocks):
+        self.tag = tag
+        self.y = 0  # Canvas y of the row's top edge
+        self.blocks = blocks
+        self.row = None
+
+
+class YearView:
+    """A virtualized, vertically scrolling view of months on one Canvas."""
+
+    def __init__(self, master, rule=None, on_select=None, visible_rows: int = VISIBLE_ROWS,
+                 holidays=None, clock=None):
+        """
+        Args:
+            master: Parent widget
+            rule (WeekRule): Work week numbering rule (defaults to the widget's)
+            on_select: Called with (year, month) when a month title is clicked
+            visible_rows (int): Initial height in rows of months
+            holidays (HolidayIndex): Days to shade as holidays
+            clock: Where today's date is read from (see src/clock.py)
+        """
+        if rule is None:
+            from src.week_rules import get_rule
+            rule = get_rule()
+        self.rule = rule
+        self.on_select = on_select
+        self.holidays = holidays
+        self.clock = clock or get_clock()
+        self.width = MONTHS_PER_ROW * BLOCK_WIDTH + (MONTHS_PER_ROW + 1) * MARGIN
+        self.height = visible_rows * ROW_HEIGHT
+        self.canvas = tk.Canvas(master, width=self.width, height=self.height, bg='white',
+                                highlightthickness=0, yscrollincrement=1,
+                                scrollregion=(0, 0, self.width, self.num_rows * ROW_HEIGHT))
+        self.scrollbar = tk.Scrollbar(master, orient='vertical', command=self.yview)
+        self.canvas.pack(side='left', fill='both', expand=True)
+        self.scrollbar.pack(side='right', fill='y')
+
+        self.offset = 0  # Pixels scrolled from the top of the first row
+        self.slots = {}  # Row index -> RowSlot in view
+        self.free_slots = []
+        self.num_slots = 0
+
+        self.canvas.bind('<Configure>', self.on_resize)
+        self.canvas.bind('<MouseWheel>', self.on_mouse_wheel)
+        self.canvas.bind('<Button-4>', lambda event: self.scroll(-3))
+        self.canvas.bind('<Button-5>', lambda event: self.scroll(3))
+        today = self.clock.today()
+        self.scroll_to(today.year, today.month)
+
+    @property
+    def num_rows(self) -> int:
+        return (LAST_YEAR - FIRST_YEAR + 1) * 12 // MONTHS_PER_ROW
+
+    @property
+    def max_offset(self) -> int:
+        return max(0, self.num_rows * ROW_HEIGHT - self.height)
+
+    def scroll_to(self, year: int, month: int):
+        """Scroll so the row containing a month is at the top."""
+        row = ((year - FIRST_YEAR) * 12 + month - 1) // MONTHS_PER_ROW
+        self.set_offset(row * ROW_HEIGHT)
+
+    def scroll(self, units: int):
+        """Scroll by a number of scroll units (negative scrolls up)."""
+        self.set_offset(self.offset + units * SCROLL_UNIT)
+
+    def yview(self, command, value, unit=None):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, 'units' | 'pages')."""
+        if command == 'moveto':
+            self.set_offset(round(float(value) * self.num_rows * ROW_HEIGHT))
+        elif unit == 'pages':
+            self.set_offset(self.offset + int(value) * (self.height - SCROLL_UNIT))
+        else:
+            self.scroll(int(value))
+
+    def on_mouse_wheel(self, event):
+        """Scroll for a Windows/macOS mouse wheel event."""
+        self.scroll(-3 if event.delta > 0 else 3)
+
+    def on_resize(self, event):
+        """Fill a resized canvas with rows."""
+        if event.height != self.height:
+            self.height = event.height
+            self.set_offset(self.offset)
+
+    def set_offset(self, offset: int):
+        """Scroll to a pixel offset and redraw."""
+        self.offset = min(max(0, int(offset)), self.max_offset)
+        self.redraw()
+
+    def redraw(self):
+        """Scroll the canvas and give every row in view a slot; rows out of view release theirs."""
+        first_row = self.offset // ROW_HEIGHT
+        last_row = min((self.offset + self.height - 1) // ROW_HEIGHT, self.num_rows - 1)
+        for row in [row for row in self.slots if not first_row <= row <= last_row]:
+            self.free_slots.append(self.slots.pop(row))
+        for row in range(first_row, last_row + 1):
+            slot = self.slots.get(row)
+            if slot is None:
+                slot = self.slots[row] = self.free_slots.pop() if self.free_slots else self.create_slot()
+                self.fill_slot(slot, row)
+            y = row * ROW_HEIGHT
+            if y != slot.y:
+                self.canvas.move(slot.tag, 0, y - slot.y)
+                slot.y = y
+        # Spare slots wait above the scroll region, ready for the next rows
+        for slot in self.free_slots:
+            if slot.y != -ROW_HEIGHT:
+                self.canvas.move(slot.tag, 0, -ROW_HEIGHT - slot.y)
+                slot.y = -ROW_HEIGHT
+                slot.row = None
+        total = self.num_rows * ROW_HEIGHT
+        self.canvas.yview_moveto(self.offset / total)
+        self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.height) / total))
+
+    def create_slot(self) -> RowSlot:
+        """Create the canvas items for one row of months at y = 0."""
+        tag = f"row{self.num_slots}"
+        self.num_slots += 1
+        canvas = self.canvas
+        blocks = []
+        for block_idx in range(MONTHS_PER_ROW):
+            left = MARGIN + block_idx * (BLOCK_WIDTH + MARGIN)
+            title = canvas.create_text(left + BLOCK_WIDTH // 2, TITLE_HEIGHT // 2, text='',
+                                       font=TITLE_FONT, tags=(tag,))
+            block = MonthBlock(title, [])
+            canvas.tag_bind(title, '<Button-1>', lambda event, block=block: self.select(block))
+            for column, name in enumerate(DAY_NAMES):
+                canvas.create_text(left + column * CELL_WIDTH + CELL_WIDTH // 2,
+                                   TITLE_HEIGHT + CELL_HEIGHT // 2, text=name, font=FONT,
+                                   tags=(tag,))
+            for week_idx in range(MAX_WEEKS):
+                top = TITLE_HEIGHT + (week_idx + 1) * CELL_HEIGHT
+                items = [canvas.create_text(left + CELL_WIDTH // 2, top + CELL_HEIGHT // 2,
+                                            text='', font=FONT, tags=(tag,))]
+                for day_idx in range(7):
+                    x = left + (day_idx + 1) * CELL_WIDTH
+                    items.append((canvas.create_rectangle(x + 1, top + 1, x + CELL_WIDTH - 1,
+                                                          top + CELL_HEIGHT - 1, fill='white',
+                                                          outline='', tags=(tag,)),
+                                  canvas.create_text(x + CELL_WIDTH // 2, top + CELL_HEIGHT // 2,
+                                                     text='', font=FONT, tags=(tag,))))
+                block.week_items.append(items)
+            blocks.append(block)
+        return RowSlot(tag, blocks)
+
+    def fill_slot(self, slot: RowSlot, row: int):
+        """Show the months of a row in a slot's items."""
+        slot.row = row
+        for block_idx, block in enumerate(slot.blocks):
+            year, month_idx = divmod(row * MONTHS_PER_ROW + block_idx, 12)
+            self.fill_block(block, FIRST_YEAR + year, month_idx + 1)
+
+    def fill_block(self, block: MonthBlock, year: int, month: int):
+        """Show a month in a block's items."""
+        canvas = self.canvas
+        grid = get_month_grid(year, month, rule=self.rule)
+        today_cell = grid.today_cell(self.clock.today())
+        holiday_days = ()
+        if self.holidays:
+            holiday_days = self.holidays.covered_days(grid.first_ordinal,
+                                                      grid.first_ordinal + grid.num_weeks * 7 - 1)
+        canvas.itemconfigure(block.title, text=f"{calendar.month_name[month]} {year}")
+        for week_idx, items in enumerate(block.week_items):
+            if week_idx >= grid.num_weeks:
+                if week_idx < block.num_weeks:  # Hide rows the previous month used
+                    canvas.itemconfigure(items[0], text='')
+                    for rect, text in items[1:]:
+                        canvas.itemconfigure(rect, state='hidden')
+                        canvas.itemconfigure(text, text='')
+                continue
+            canvas.itemconfigure(items[0], text=f"WW{grid.week_nums[week_idx]}")
+            for day_idx, (rect, text) in enumerate(items[1:]):
+                if not grid.in_month[week_idx][day_idx]:
+                    bg_color = OTHER_MONTH_COLOR
+                elif (week_idx, day_idx) == today_cell:
+                    bg_color = TODAY_COLOR
+                elif grid.first_ordinal + week_idx * 7 + day_idx in holiday_days:
+                    bg_color = HOLIDAY_COLOR
+                else:
+                    bg_color = 'white'
+                canvas.itemconfigure(rect, fill=bg_color, state='normal')
+                canvas.itemconfigure(text, text=str(grid.days[week_idx][day_idx]))
+        block.month = (year, month)
+        block.num_weeks = grid.num_weeks
+
+    def refresh(self):
+        """Redraw the rows in view, e.g. after the date changed."""
+        for row, slot in self.slots.items():
+            self.fill_slot(slot, row)
+
+    def set_holidays(self, holidays):
+        """Shade the days of a new HolidayIndex."""
+        self.holidays = holidays
+        self.refresh()
+
+    def select(self, block: MonthBlock):
+        if self.on_select is not None and block.month is not None:
+            self.on_select(*block.month)
+
+    def item_count(self) -> int:
+        """Count the canvas items; constant once the view has been scrolled."""
+        return len(self.canvas.find_all())
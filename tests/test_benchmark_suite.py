@@ -0,0 +1,59 @@
+from benchmarks.suite import compare_results, main
+import json
+
+def results(**metrics):
+    return {'metadata': {}, 'results': {name: values for name, values in metrics.items()}}
+
+def test_compare_results():
+    """Test that only slowdowns past the threshold count as regressions."""
+    baseline = results(fast={'seconds': 1.0}, render={'seconds': 2.0, 'widget_ops': 40},
+                       removed={'seconds': 1.0})
+    current = results(fast={'seconds': 1.05}, render={'seconds': 1.0, 'widget_ops': 60},
+                      added={'seconds': 1.0})
+    rows = {(name, metric): (change, regressed)
+            for name, metric, _, _, change, regressed in compare_results(baseline, current, 10)}
+    assert rows == {('fast', 'seconds'): (rows[('fast', 'seconds')][0], False),
+                    ('render', 'seconds'): (-50.0, False),
+                    ('render', 'widget_ops'): (50.0, True)}
+
+def test_compare_command_exit_code(tmp_path, capsys):
+    """Test that compare exits non-zero on a regression."""
+    baseline = tmp_path / "baseline.json"
+    current = tmp_path / "current.json"
+    baseline.write_text(json.dumps(results(grid={'seconds': 1.0})))
+    current.write_text(json.dumps(results(grid={'seconds': 1.3})))
+    assert main(['compare', str(baseline), str(current), '--threshold', '50']) == 0
+    assert main(['compare', str(baseline), str(current), '--threshold', '20']) == 1
+    assert "REGRESSED" in capsys.readouterr().out
+
+def test_measure_first_paint(tmp_path):
+    """Test that a launch reports its first paint and leaves a snapshot for the next one."""
+    from benchmarks.bench_startup import measure_first_paint, startup_command
+    assert measure_first_paint(startup_command(), str(tmp_path)) > 0
+    assert (tmp_path / 'first_paint.json').exists()
+
+def test_soak_growth_limits():
+    """Test that only growth past a limit is reported."""
+    from benchmarks.soak import Limits, Sample, find_growth
+    samples = [Sample(100, 1000, None, 69, 1, 0), Sample(600, 900, None, 69, 3, 0),
+               Sample(1100, 1000 + 600 * 1024, None, 70, 2, 0)]
+    problems = find_growth(samples, Limits())
+    assert [problem.split()[0] for problem in problems] == ['traced_bytes', 'widgets']
+    assert find_growth(samples, Limits(traced_bytes=10**6, widgets=1)) == []
+
+def test_soak_run():
+    """Test a short soak run passing, and failing with the allocation sites shown."""
+    import os
+    import subprocess
+    import sys
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    command = [sys.executable, '-m', 'benchmarks.soak', '--cycles', '40', '--warmup', '20',
+               '--sample-every', '20', '--year-view-every', '10']
+    result = subprocess.run(command, cwd=root, capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "OK: no growth" in result.stdout
+    result = subprocess.run(command + ['--max-widgets', '-1', '--top', '3'], cwd=root,
+                            capture_output=True, text=True)
+    assert result.returncode == 1
+    assert "FAIL: widgets grew by 0" in result.stdout
+    assert "Top 3 allocation sites" in result.stdout
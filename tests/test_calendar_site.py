@@ -0,0 +1,133 @@
+from src.calendar_site import MANIFEST_FILE, build_site, load_manifest, year_span
+from src.holidays import Event, HolidayIndex
+from src.main import get_first_monday, get_work_week_number
+from datetime import date
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def holiday(year, month, day, summary, days=1):
+    start = date(year, month, day).toordinal()
+    return Event(start, start + days - 1, summary)
+
+HOLIDAYS = [holiday(2024, 7, 4, "Independence Day"), holiday(2025, 3, 14, "Pi <Day> & cake"),
+            holiday(2026, 12, 24, "Winter shutdown", days=9)]
+
+def read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+def mtimes(out_dir):
+    return {name: os.stat(os.path.join(out_dir, name)).st_mtime_ns
+            for name in os.listdir(out_dir) if name[:4].isdigit()}
+
+def test_year_pages(tmp_path):
+    """Test the HTML and SVG content of a year, holidays shaded and escaped."""
+    report = build_site(str(tmp_path), 2025, 2025, holidays=HolidayIndex(HOLIDAYS), title="Lab",
+                        workers=1)
+    assert list(report.rendered) == [2025] and report.skipped == []
+    page = read(tmp_path / "2025.html")
+    assert page.count('<table class="month">') == 12
+    assert "<title>Lab 2025</title>" in page and 'href="2025.svg"' in page
+    week_num = get_work_week_number(date(2025, 9, 8), get_first_monday(2025))
+    assert f'<tr><th class="ww">WW{week_num}</th><td>8</td>' in page
+    assert '<td class="holiday" title="Pi &lt;Day&gt; &amp; cake">14</td>' in page
+    assert "2025-03-14: Pi &lt;Day&gt; &amp; cake" in page
+    # The shutdown starting in December 2026 is outside 2025's grids; July 4th 2024 too
+    assert "Independence" not in page and "Winter shutdown" not in page
+    svg = read(tmp_path / "2025.svg")
+    assert svg.startswith("<svg ") and svg.count("mistyrose") == 1
+    assert "<title>Pi &lt;Day&gt; &amp; cake</title>" in svg
+    index = read(tmp_path / "index.html")
+    assert 'href="2025.html"' in index and "<title>Lab</title>" in index
+
+def test_year_span_covers_grids():
+    """Test that a year's span runs from the Monday before Jan 1 to the Sunday after Dec 31."""
+    first, last = year_span(2025)
+    assert date.fromordinal(first) == date(2024, 12, 30)
+    assert date.fromordinal(last) == date(2026, 1, 4)
+
+def test_incremental_rebuild(tmp_path):
+    """Test that only years whose inputs changed are rendered again."""
+    out_dir = str(tmp_path)
+    holidays = HolidayIndex(HOLIDAYS)
+    assert sorted(build_site(out_dir, 2023, 2027, holidays=holidays, workers=1).rendered) == \
+        [2023, 2024, 2025, 2026, 2027]
+    before = mtimes(out_dir)
+    report = build_site(out_dir, 2023, 2027, holidays=holidays, workers=1)
+    assert report.rendered == {} and report.skipped == [2023, 2024, 2025, 2026, 2027]
+    assert mtimes(out_dir) == before
+
+    # Renaming the 2025 holiday only touches 2025
+    changed = HolidayIndex(HOLIDAYS[:1] + [holiday(2025, 3, 14, "Pi Day")] + HOLIDAYS[2:])
+    assert list(build_site(out_dir, 2023, 2027, holidays=changed, workers=1).rendered) == [2025]
+    # The shutdown crosses into 2027's first grid week, so both years change
+    moved = HolidayIndex(list(changed.overlapping(0, date(2026, 1, 1).toordinal()))
+                         + [holiday(2026, 12, 23, "Winter shutdown", days=10)])
+    assert sorted(build_site(out_dir, 2023, 2027, holidays=moved, workers=1).rendered) == [2026, 2027]
+
+    os.remove(os.path.join(out_dir, "2024.svg"))
+    assert list(build_site(out_dir, 2023, 2027, holidays=moved, workers=1).rendered) == [2024]
+    assert len(build_site(out_dir, 2023, 2027, holidays=moved, workers=1, force=True).rendered) == 5
+
+@pytest.mark.parametrize("change", [dict(rule='iso'), dict(template="<p>$year $months</p>"),
+                                    dict(title="Other")])
+def test_global_inputs_rebuild_all(tmp_path, change):
+    """Test that the rule, template or title changing renders every year."""
+    build_site(str(tmp_path), 2024, 2026, workers=1)
+    report = build_site(str(tmp_path), 2024, 2026, workers=1, **change)
+    assert sorted(report.rendered) == [2024, 2025, 2026]
+    assert build_site(str(tmp_path), 2024, 2026, workers=1, **change).rendered == {}
+
+def test_build_in_parts(tmp_path):
+    """Test that building a range keeps the manifest entries of years outside it."""
+    build_site(str(tmp_path), 2020, 2021, workers=1)
+    build_site(str(tmp_path), 2022, 2022, workers=1)
+    assert sorted(load_manifest(str(tmp_path))['years']) == ['2020', '2021', '2022']
+    index = read(tmp_path / "index.html")
+    assert all(f'href="{year}.html"' in index for year in (2020, 2021, 2022))
+    # A corrupt manifest renders everything again instead of failing
+    (tmp_path / MANIFEST_FILE).write_text("{not json")
+    assert len(build_site(str(tmp_path), 2020, 2022, workers=1).rendered) == 3
+    with pytest.raises(ValueError):
+        build_site(str(tmp_path), 2022, 2020)
+    with pytest.raises(ValueError):
+        build_site(str(tmp_path), 2020, 2020, rule='weekly')
+
+def test_workers_same_output(tmp_path):
+    """Test that worker processes write the same files as rendering in-process."""
+    holidays = HolidayIndex(HOLIDAYS)
+    build_site(str(tmp_path / "one"), 2024, 2027, holidays=holidays, workers=1)
+    report = build_site(str(tmp_path / "two"), 2024, 2027, holidays=holidays, workers=2)
+    assert report.workers == 2 and sorted(report.rendered) == [2024, 2025, 2026, 2027]
+    names = sorted(os.listdir(tmp_path / "one"))
+    assert names == sorted(os.listdir(tmp_path / "two"))
+    for name in names:
+        if name != MANIFEST_FILE:  # Holds the render times
+            assert read(tmp_path / "one" / name) == read(tmp_path / "two" / name)
+
+def test_site_cli(tmp_path):
+    """Test the site command of run_app.py with holidays and a template."""
+    ics = tmp_path / "team.ics"
+    ics.write_text("BEGIN:VCALENDAR\r\nBEGIN:VEVENT\r\nDTSTART;VALUE=DATE:20250505\r\n"
+                   "SUMMARY:Offsite\r\nEND:VEVENT\r\nEND:VCALENDAR\r\n")
+    template = tmp_path / "page.html"
+    template.write_text("<h1>$title $year</h1>\n$months\n$holidays\n")
+    out_dir = tmp_path / "site"
+    command = [sys.executable, "run_app.py", "site", "-o", str(out_dir), "--start-year", "2025",
+               "--end-year", "2026", "--holidays", str(ics), "--template", str(template),
+               "--title", "Team", "--workers", "1"]
+    result = subprocess.run(command, cwd=ROOT, check=True, capture_output=True, text=True)
+    assert result.stdout.startswith("2025: ") and "2 years rendered, 0 unchanged" in result.stdout
+    page = read(out_dir / "2025.html")
+    assert page.startswith("<h1>Team 2025</h1>") and 'title="Offsite">5</td>' in page
+    manifest = json.loads(read(out_dir / MANIFEST_FILE))
+    assert manifest['title'] == "Team" and sorted(manifest['years']) == ['2025', '2026']
+    result = subprocess.run(command, cwd=ROOT, check=True, capture_output=True, text=True)
+    assert "0 years rendered, 2 unchanged" in result.stdout
+    result = subprocess.run(command[:6] + ["--end-year", "2024"], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 2 and "--end-year" in result.stderr
@@ -0,0 +1,262 @@
+import json
+from datetime import date
+import pytest
+tk = pytest.importorskip("tkinter")
+
+from src.calendar_widget import WorkWeekCalendarWidget
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep first-paint snapshots out of the user's cache directory."""
+    monkeypatch.setenv('WW_CALENDAR_CACHE_DIR', str(tmp_path))
+    return tmp_path
+
+@pytest.fixture
+def widget():
+    """Create a widget, skipping when no display is available."""
+    try:
+        app = WorkWeekCalendarWidget(workers=0)  # Months and holidays load in place
+    except tk.TclError as e:
+        pytest.skip(f"No display available: {e}")
+    app.root.withdraw()
+    yield app
+    app.root.destroy()
+
+def test_jump_to_week(widget):
+    """Test jumping straight to the month of a work week."""
+    widget.jump_to_week(2025, 37)
+    assert (widget.current_view.year, widget.current_view.month) == (2025, 9)
+    
+    # WW1 of 2025 starts in December 2024 but is shown in January 2025
+    widget.jump_to_week(2025, 1)
+    assert (widget.current_view.year, widget.current_view.month) == (2025, 1)
+
+def test_week_entry(widget):
+    """Test the work week entry box."""
+    widget.current_view = date(2025, 3, 1)
+    widget.week_entry.insert(0, "WW37")
+    widget.on_week_entry()
+    assert widget.current_view == date(2025, 9, 1)
+    assert widget.week_entry.get() == ""
+    
+    widget.week_entry.insert(0, "2023 ww52")
+    widget.on_week_entry()
+    assert widget.current_view == date(2023, 12, 1)
+    
+    # Invalid input leaves the view alone
+    widget.week_entry.delete(0, tk.END)
+    widget.week_entry.insert(0, "WW60")
+    widget.on_week_entry()
+    assert widget.current_view == date(2023, 12, 1)
+
+def test_navigation_reuses_cells(widget):
+    """Test that navigating reconfigures the same cells instead of recreating them."""
+    cells_before = widget.calendar_frame.winfo_children()
+    for _ in range(30):
+        widget.next_month()
+    for _ in range(30):
+        widget.previous_month()
+    assert widget.calendar_frame.winfo_children() == cells_before
+
+def test_calendar_cells(widget):
+    """Test the cell contents for January 2025."""
+    widget.current_view = date(2025, 1, 1)
+    widget.update_calendar()
+    assert widget.cells[0][0].cget('text') == "WW1"
+    # Mon Dec 30 and Tue Dec 31 come from the previous month
+    assert [cell.cget('text') for cell in widget.cells[0][1:]] == ['30', '31', '1', '2', '3', '4', '5']
+    assert widget.cells[0][1].cget('bg') == 'lightgray'
+    assert widget.visible_weeks == 5
+    assert widget.month_label.cget('text') == "January 2025"
+
+def test_day_change_moves_highlight(widget):
+    """Test that a date change only repaints the old and new today cells."""
+    widget.current_view = date(2025, 1, 1)
+    widget.update_calendar()
+    widget.on_day_change(date(2025, 1, 14), date(2025, 1, 15))
+    assert widget.cells[2][3].cget('bg') == 'lightblue'  # Wed Jan 15
+    assert widget.cells[2][2].cget('bg') == 'white'  # Tue Jan 14
+    
+    # Following today into a new month switches the view
+    widget.on_day_change(date(2025, 1, 31), date(2025, 2, 1))
+    assert widget.current_view == date.today()
+
+def test_today_from_clock():
+    """Test that the widget reads today's date from the clock it is given."""
+    from src.clock import FixedClock
+    clock = FixedClock(date(2030, 5, 31))
+    try:
+        app = WorkWeekCalendarWidget(workers=0, clock=clock)
+    except tk.TclError as e:
+        pytest.skip(f"No display available: {e}")
+    try:
+        app.root.withdraw()
+        assert app.month_label.cget('text') == "May 2030"
+        # Fri May 31, 2030 is the last cell of the fifth row
+        assert app.cell_values[4][5] == ('31', 'lightblue')
+        app.show_month(2025, 1)
+        clock.advance(1)
+        app.go_to_today()
+        assert app.month_label.cget('text') == "June 2030"
+        assert app.cell_values[0][6] == ('1', 'lightblue')
+    finally:
+        app.root.destroy()
+
+def test_first_paint_snapshot(widget):
+    """Test that a second widget paints the saved month before computing it."""
+    title = widget.month_label.cget('text')
+    cells = [row[:] for row in widget.cell_values]
+    
+    app = WorkWeekCalendarWidget()
+    try:
+        app.root.withdraw()
+        assert app.month_label.cget('text') == title
+        assert app.cell_values == cells
+        assert app.scheduler is None  # Started once Tk is idle
+        app.finish_startup()
+        assert app.cell_values == cells
+    finally:
+        app.root.destroy()
+
+def test_handle_command(widget):
+    """Test the navigation commands sent to a running instance."""
+    widget.handle_command('month', (2025, 3))
+    assert widget.current_view == date(2025, 3, 1)
+    widget.handle_command('next', (10,))
+    assert widget.current_view == date(2026, 1, 1)
+    widget.handle_command('prev', (1,))
+    assert widget.current_view == date(2025, 12, 1)
+    widget.handle_command('week', (None, 37))
+    assert widget.current_view == date(2025, 9, 1)
+    widget.handle_command('show', ())
+    assert (widget.current_view.year, widget.current_view.month) == (date.today().year, date.today().month)
+
+def pending_timers(root):
+    """The timer ids waiting in the Tk loop (the fake Tk keeps them in root.pending)."""
+    if hasattr(root, 'pending'):
+        return set(root.pending)
+    return set(root.tk.splitlist(root.tk.call('after', 'info')))
+
+def test_instance_commands_wake_widget(widget, tmp_path):
+    """Test that commands from other launches wake the widget, with no polling timer while idle."""
+    import threading
+    from src.single_instance import InstanceServer, send_command
+    path = str(tmp_path / 'instance')
+    server = InstanceServer(path)
+    assert server.start()
+    try:
+        idle = pending_timers(widget.root)
+        widget.watch_commands(server)
+        widget.root.update()  # Runs the one poll for commands sent before the main loop
+        if hasattr(widget.root, 'run_timers'):
+            widget.root.run_timers()
+        assert pending_timers(widget.root) == idle
+        
+        replies = []
+        sender = threading.Thread(target=lambda: replies.extend(
+            send_command(line, path) for line in ('month 2025-03', 'quit')))
+        sender.start()
+        widget.root.mainloop()  # Until the quit command (the fake Tk returns at once)
+        sender.join(10)
+        assert replies == ['ok', 'ok'] and server.commands == 2
+        assert widget.current_view == date(2025, 3, 1)
+        assert pending_timers(widget.root) == idle
+    finally:
+        server.stop()
+
+def test_profiling(widget, tmp_path):
+    """Test turning on profiling and saving the stats."""
+    widget.next_button.invoke()
+    assert widget.profiler is None
+    
+    widget.enable_profiling()
+    widget.next_button.invoke()
+    widget.previous_month()
+    path = widget.write_stats(str(tmp_path / 'stats.json'))
+    stats = json.loads(open(path).read())
+    assert stats['calls']['next_month']['count'] == 1
+    assert stats['calls']['update_calendar']['count'] == 2
+    assert stats['widgets'] > 50
+    
+    widget.disable_profiling()
+    assert 'update_calendar' not in vars(widget)
+
+def test_drag_coalesces_moves(widget):
+    """Test that motion events within a frame move the window once."""
+    class Event:
+        def __init__(self, x_root, y_root):
+            self.x_root = x_root
+            self.y_root = y_root
+    
+    widget.start_drag(Event(120, 60))
+    start = widget.window_pos
+    for i in range(1, 6):
+        widget.drag(Event(120 + i, 60 + 2 * i))
+    assert widget.drag_events == 5
+    assert widget.geometry_calls == 0
+    assert widget.drag_after_id is not None
+    
+    widget.end_drag()
+    assert widget.window_pos == (start[0] + 5, start[1] + 10)
+    assert widget.geometry_calls == 1
+    assert widget.drag_after_id is None
+
+def test_year_view(widget):
+    """Test opening the year view and picking a month in it."""
+    widget.current_view = date(2025, 3, 1)
+    widget.toggle_year_view()
+    assert widget.year_view is not None
+    block = widget.year_view.slots[min(widget.year_view.slots)].blocks[1]
+    assert block.month == (2025, 2)
+    widget.year_view.select(block)
+    assert widget.current_view == date(2025, 2, 1)
+    
+    widget.toggle_year_view()
+    assert widget.year_view is None and widget.year_window is None
+
+def test_holidays_shaded(widget):
+    """Test that holidays are shaded once loaded, and in the year view."""
+    from src.calendar_widget import HOLIDAY_COLOR
+    from src.holidays import Event, HolidayIndex
+    widget.show_month(2025, 12)
+    christmas = date(2025, 12, 25).toordinal()
+    widget.set_holidays(HolidayIndex([Event(christmas, christmas + 1, 'Christmas')]))
+    # Dec 1, 2025 is a Monday, so the 25th and 26th are Thu and Fri of the 4th row
+    assert widget.cell_values[3][4] == ('25', HOLIDAY_COLOR)
+    assert widget.cell_values[3][5] == ('26', HOLIDAY_COLOR)
+    assert widget.cell_values[3][6][1] != HOLIDAY_COLOR
+    
+    widget.toggle_year_view()
+    block = widget.year_view.slots[min(widget.year_view.slots)].blocks[2]
+    assert block.month == (2025, 12)
+    rect = block.week_items[3][4][0]
+    assert widget.year_view.canvas.itemcget(rect, 'fill') == HOLIDAY_COLOR
+    widget.toggle_year_view()
+
+def test_months_built_on_workers():
+    """Test that uncached months are built off the Tk thread and stale requests are dropped."""
+    import time
+    try:
+        app = WorkWeekCalendarWidget()
+    except tk.TclError as e:
+        pytest.skip(f"No display available: {e}")
+    try:
+        app.root.withdraw()
+        for year in (2101, 2102, 2103):  # Far from any month built so far
+            app.show_month(year, 6)
+        assert app.month_label.cget('text') != "June 2103"  # Not painted yet
+        deadline = time.monotonic() + 5
+        while app.workers.outstanding and time.monotonic() < deadline:
+            time.sleep(0.01)
+            app.workers.pump()
+        assert app.month_label.cget('text') == "June 2103"
+        stats = app.workers.stats()
+        assert stats['completed'] + stats['cancelled'] == stats['submitted']
+        assert stats['queue_depth'] == 0 and stats['max_queue_depth'] >= 2
+        
+        # The neighbours were prefetched, so stepping to them paints right away
+        app.next_month()
+        assert app.month_label.cget('text') == "July 2103"
+    finally:
+        app.workers.shutdown()
+        app.root.destroy()
@@ -0,0 +1,30 @@
+from src.clock import FixedClock, SystemClock, get_clock, set_clock, today, use_clock
+from datetime import date, datetime, timedelta
+
+def test_fixed_clock():
+    """Test setting, advancing and stepping a fixed clock."""
+    clock = FixedClock(date(2025, 12, 31))
+    assert clock.today() == clock.today() == date(2025, 12, 31)
+    assert clock.now() == datetime(2025, 12, 31)
+    clock.advance(hours=23, minutes=59)
+    assert clock.today() == date(2025, 12, 31)
+    clock.advance(minutes=1)
+    assert clock.today() == date(2026, 1, 1)
+    clock.set(datetime(2020, 2, 28, 12))
+    assert clock.now() == datetime(2020, 2, 28, 12)
+    
+    stepping = FixedClock(date(2020, 2, 28), step=timedelta(days=1))
+    assert [stepping.today() for _ in range(3)] == [date(2020, 2, 28), date(2020, 2, 29), date(2020, 3, 1)]
+
+def test_use_clock():
+    """Test swapping the default clock and restoring the system clock."""
+    assert isinstance(get_clock(), SystemClock)
+    with use_clock(FixedClock(date(1999, 12, 31))):
+        assert today() == date(1999, 12, 31)
+    assert isinstance(get_clock(), SystemClock)
+    previous = set_clock(FixedClock(date(2001, 1, 1)))
+    try:
+        assert today() == date(2001, 1, 1)
+    finally:
+        set_clock(previous)
+    assert today() == date.today()
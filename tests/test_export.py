@@ -0,0 +1,111 @@
+from src.main import get_first_monday, get_work_week_number
+from src.export import export_work_weeks, iter_day_rows, iter_week_rows
+from datetime import date
+import io
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_day_rows_match_work_week_number():
+    """Test that every exported day has the widget's work week number."""
+    rows = list(iter_day_rows(2020, 2030))
+    assert len(rows) == (date(2030, 12, 31) - date(2020, 1, 1)).days + 1
+    for day, weekday, year, week_num in rows:
+        current_date = date.fromisoformat(day)
+        assert weekday == current_date.strftime('%a')
+        assert year == current_date.year
+        assert week_num == get_work_week_number(current_date, get_first_monday(year))
+
+def test_week_rows():
+    """Test one row per week, including the wrapped week 53."""
+    rows = list(iter_week_rows(2023, 2025))
+    assert rows[0] == (2023, 1, '2022-12-26', '2023-01-01')
+    # 2023 has 53 weeks, the last one wraps back to WW1
+    assert (2023, 1, '2023-12-25', '2023-12-31') in rows
+    assert rows[53] == (2024, 1, '2024-01-01', '2024-01-07')
+    assert len(rows) == 53 + 52 + 52
+
+def test_export_formats():
+    """Test the CSV, JSON Lines and iCalendar outputs."""
+    out = io.StringIO()
+    assert export_work_weeks(out, 'csv', 2025, 2025) == 365
+    lines = out.getvalue().splitlines()
+    assert lines[0] == "date,weekday,year,work_week"
+    assert lines[-1] == "2025-12-31,Wed,2025,1"
+    
+    out = io.StringIO()
+    assert export_work_weeks(out, 'jsonl', 2025, 2025, per='week') == 52
+    first = json.loads(out.getvalue().splitlines()[0])
+    assert first == {'year': 2025, 'work_week': 1, 'start': '2024-12-30', 'end': '2025-01-05'}
+    
+    out = io.StringIO()
+    assert export_work_weeks(out, 'ics', 2025, 2025) == 52
+    ics = out.getvalue()
+    assert ics.startswith("BEGIN:VCALENDAR\r\n") and ics.endswith("END:VCALENDAR\r\n")
+    assert ics.count("BEGIN:VEVENT") == 52
+    assert "DTSTART;VALUE=DATE:20250908\r\nDTEND;VALUE=DATE:20250915\r\nSUMMARY:WW37\r\n" in ics
+    
+    with pytest.raises(ValueError):
+        export_work_weeks(io.StringIO(), 'xml', 2025, 2025)
+
+@pytest.mark.parametrize("name", ['iso', '4-4-5', 'fiscal:04-01'])
+def test_export_rule(name):
+    """Test that day and week rows follow the rule's scalar numbering."""
+    from src.week_rules import get_rule
+    rule = get_rule(name)
+    for day, weekday, year, week_num in iter_day_rows(2023, 2026, rule):
+        assert rule.fiscal_week(date.fromisoformat(day))[:2] == (year, week_num)
+    weeks = list(iter_week_rows(2023, 2026, rule))
+    assert weeks[0][2] == '2022-12-26' and weeks[-1][3] == '2026-12-27'
+    for year, week_num, start, end in weeks:
+        assert rule.fiscal_week(date.fromisoformat(start))[:2] == (year, week_num)
+    out = io.StringIO()
+    export_work_weeks(out, 'csv', 2026, 2026, rule=name)
+    assert out.getvalue().splitlines()[1] == "2026-01-01,Thu,%d,%d" % rule.fiscal_week(date(2026, 1, 1))[:2]
+
+def test_cli_rule_before_or_after_command():
+    """Test that --rule and --holidays apply whether given before or after the subcommand."""
+    import run_app
+    ics = os.path.join(ROOT, 'README.md')  # Any existing file passes the check
+    for argv in (['--rule', 'iso', 'export'], ['export', '--rule', 'iso'],
+                 ['--rule', 'iso', 'tag', ics], ['tag', ics, '--rule', 'iso'],
+                 ['--rule', 'iso', 'site', '-o', 'out'], ['site', '-o', 'out', '--rule', 'iso']):
+        assert run_app.parse_args(argv).rule == 'iso'
+    assert run_app.parse_args(['export']).rule == 'default'
+    assert run_app.parse_args(['--holidays', ics, 'serve']).holidays == [ics]
+    assert run_app.parse_args(['serve', '--holidays', ics]).holidays == [ics]
+    assert run_app.parse_args(['serve']).holidays is None
+
+def test_headless_export_cli(tmp_path):
+    """Test that run_app.py exports without creating a Tk window."""
+    output = tmp_path / "ww.csv"
+    code = ("import sys, run_app; "
+            f"run_app.main(['export', '--start-year', '2024', '--end-year', '2025', '-o', {str(output)!r}]); "
+            "assert 'tkinter' not in sys.modules")
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+    lines = output.read_text().splitlines()
+    assert len(lines) == 1 + 366 + 365
+
+def test_export_holidays():
+    """Test the holidays column of day and week rows, quoted for CSV."""
+    from src.holidays import Event, HolidayIndex
+    holidays = HolidayIndex([Event(date(2025, 1, 1).toordinal(), date(2025, 1, 2).toordinal(),
+                                   'New Year, observed'),
+                             Event(date(2025, 1, 2).toordinal(), date(2025, 1, 2).toordinal(), 'Bridge')])
+    out = io.StringIO()
+    assert export_work_weeks(out, 'csv', 2025, 2025, holidays=holidays) == 365
+    lines = out.getvalue().splitlines()
+    assert lines[0] == "date,weekday,year,work_week,holidays"
+    assert lines[1:4] == ['2025-01-01,Wed,2025,1,"New Year, observed"',
+                          '2025-01-02,Thu,2025,1,"New Year, observed; Bridge"',
+                          '2025-01-03,Fri,2025,1,']
+    
+    out = io.StringIO()
+    export_work_weeks(out, 'jsonl', 2025, 2025, per='week', holidays=holidays)
+    weeks = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert weeks[0]['holidays'] == 'New Year, observed; Bridge'
+    assert weeks[1]['holidays'] == ''
@@ -0,0 +1,34 @@
+from datetime import date
+
+from src.first_paint import load_snapshot, save_snapshot
+from src.month_grid import get_month_grid
+from src.week_rules import get_rule
+
+def test_snapshot_round_trip(tmp_path):
+    """Test that a saved month loads back with the same cells."""
+    path = str(tmp_path / 'first_paint.json')
+    grid = get_month_grid(2025, 3, rule=get_rule('default'))
+    save_snapshot(grid, 'default', 'March 2025', path)
+    
+    snapshot = load_snapshot(2025, 3, 'default', path)
+    assert snapshot.title == 'March 2025'
+    assert snapshot.num_weeks == grid.num_weeks
+    assert snapshot.days == list(grid.days)
+    assert snapshot.in_month == list(grid.in_month)
+    assert snapshot.week_nums == list(grid.week_nums)
+    for day in (date(2025, 2, 28), date(2025, 3, 1), date(2025, 3, 31), date(2025, 4, 6)):
+        assert snapshot.today_cell(day) == grid.today_cell(day)
+
+def test_snapshot_mismatch(tmp_path):
+    """Test that a snapshot of another month or rule is not used."""
+    path = str(tmp_path / 'first_paint.json')
+    save_snapshot(get_month_grid(2025, 3, rule=get_rule('iso')), 'iso', 'March 2025', path)
+    assert load_snapshot(2025, 4, 'iso', path) is None
+    assert load_snapshot(2025, 3, 'default', path) is None
+
+def test_snapshot_missing_or_corrupt(tmp_path):
+    """Test that an unreadable snapshot is treated as missing."""
+    path = tmp_path / 'first_paint.json'
+    assert load_snapshot(2025, 3, 'default', str(path)) is None
+    path.write_text('{"version": 1, "year"')
+    assert load_snapshot(2025, 3, 'default', str(path)) is None
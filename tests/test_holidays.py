@@ -0,0 +1,99 @@
+from src.holidays import Event, HolidayCalendar, HolidayIndex, iter_ics_events, read_ics_file
+from datetime import date
+import os
+import pytest
+
+ICS = """BEGIN:VCALENDAR\r
+VERSION:2.0\r
+BEGIN:VEVENT\r
+UID:new-year\r
+DTSTART;VALUE=DATE:20250101\r
+DTEND;VALUE=DATE:20250102\r
+SUMMARY:New Year\\, observed\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+DTSTART;VALUE=DATE:20251222\r
+DTEND;VALUE=DATE:20260102\r
+SUMMARY:Winter shut\r
+ down\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+DTSTART;TZID=Europe/Berlin:20250714T090000\r
+DTEND;TZID=Europe/Berlin:20250715T000000\r
+SUMMARY:Offsite\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+DTSTART;VALUE=DATE:20250301\r
+DURATION:P2W\r
+SUMMARY:Sabbatical\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+DTSTART:bad\r
+SUMMARY:Broken\r
+END:VEVENT\r
+END:VCALENDAR\r
+"""
+
+def ordinal(year, month, day):
+    return date(year, month, day).toordinal()
+
+def test_parse_events():
+    """Test all-day, timed, folded, escaped and duration events."""
+    events = sorted(iter_ics_events(ICS.splitlines(keepends=True)))
+    assert events == [
+        Event(ordinal(2025, 1, 1), ordinal(2025, 1, 1), 'New Year, observed', 'new-year'),
+        Event(ordinal(2025, 3, 1), ordinal(2025, 3, 14), 'Sabbatical'),
+        Event(ordinal(2025, 7, 14), ordinal(2025, 7, 14), 'Offsite'),
+        Event(ordinal(2025, 12, 22), ordinal(2026, 1, 1), 'Winter shutdown'),
+    ]
+
+def test_index_lookups():
+    """Test month, work week and single day lookups against the events."""
+    index = HolidayIndex(iter_ics_events(ICS.splitlines()))
+    assert [event.summary for event in index.events_in_month(2025, 12)] == ['Winter shutdown']
+    assert [event.summary for event in index.events_in_month(2026, 1)] == ['Winter shutdown']
+    assert index.events_in_month(2025, 2) == []
+    assert [event.summary for event in index.events_in_week(2025, 1)] == ['New Year, observed']
+    assert [event.summary for event in index.events_in_week(2025, 52)] == ['Winter shutdown']
+    # WW1 of 2026 starts on Dec 29, 2025
+    assert [event.summary for event in index.events_in_week(2026, 1)] == ['Winter shutdown']
+    assert [event.summary for event in index.events_in_week(2025, 11)] == ['Sabbatical']
+    assert index.is_holiday(date(2025, 12, 31))
+    assert not index.is_holiday(date(2025, 12, 21))
+    assert index.summaries(date(2025, 3, 10)) == ['Sabbatical']
+    assert index.covered_days(ordinal(2025, 3, 13), ordinal(2025, 3, 20)) == \
+        {ordinal(2025, 3, 13), ordinal(2025, 3, 14)}
+
+def test_long_events_and_batch():
+    """Test that long events are found and the batch check matches the scalar one."""
+    np = pytest.importorskip("numpy")
+    events = [Event(ordinal(2024, 1, 1), ordinal(2024, 12, 31), 'Leave'),
+              Event(ordinal(2025, 5, 1), ordinal(2025, 5, 2), 'Bridge'),
+              Event(ordinal(2025, 5, 2), ordinal(2025, 5, 3), 'Overlap')]
+    index = HolidayIndex(events)
+    assert index.events_in_month(2024, 7) == events[:1]
+    assert [event.summary for event in index.events_in_month(2025, 5)] == ['Bridge', 'Overlap']
+    days = np.arange(ordinal(2023, 12, 30), ordinal(2025, 5, 5))
+    expected = [index.is_holiday(date.fromordinal(int(day))) for day in days]
+    assert index.covered(days).tolist() == expected
+    assert index.covered(np.array(['2025-05-03', '2025-05-04'], dtype='datetime64[D]')).tolist() == \
+        [True, False]
+    assert HolidayIndex().covered(days).sum() == 0
+
+def test_reload_only_changed_files(tmp_path):
+    """Test that only files with a new modification time or size are parsed again."""
+    first = tmp_path / "a.ics"
+    second = tmp_path / "b.ics"
+    first.write_text(ICS)
+    second.write_text(ICS.replace('New Year', 'Founders Day'))
+    calendar = HolidayCalendar([str(first), str(second), str(tmp_path / "missing.ics")])
+    assert calendar.reload()
+    assert calendar.reloads == 3 and len(calendar.index) == 8
+    assert not calendar.reload()
+    assert calendar.reloads == 3
+
+    second.write_text(ICS.split('BEGIN:VEVENT')[0] + "END:VCALENDAR\r\n")
+    os.utime(second, ns=(0, 0))
+    assert calendar.reload()
+    assert calendar.reloads == 4 and len(calendar.index) == 4
+    assert read_ics_file(str(first)) == calendar.index.events
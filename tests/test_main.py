@@ -1,6 +1,8 @@
 from src.main import greet, get_work_week_calendar, get_work_week_number, get_current_work_week
+from src.main import get_work_week_numbers, get_first_monday, get_work_week_ranges, WorkingDayCalendar
 from datetime import date, timedelta
-from unittest.mock import patch
+from src.clock import FixedClock, use_clock
+import pytest
 
 def test_print_daily_work_weeks():
     """
@@ -121,22 +123,14 @@ def test_work_week_consistency_for_entire_year():
     # Print the calendar for visual inspection
     print_work_week_for_entire_year()
     
-    # Start from January 1st, 2025
-    current_date = date(2025, 1, 1)
-    year_end = date(2025, 12, 31)
-    
     # Get the first Monday of the year for direct calculation
     year_start = date(2025, 1, 1)
     first_monday = year_start - timedelta(days=year_start.weekday())
     
-    # Test every day of the year
-    while current_date <= year_end:
-        # Get work week number using get_current_work_week
-        with patch('src.main.date') as mock_date:
-            mock_date.today.return_value = current_date
-            mock_date.side_effect = lambda *args, **kw: date(*args, **kw)
-            current_week_str = get_current_work_week()
-            week_from_current = extract_week_number(current_week_str)
+    # A clock that moves one day forward each time get_current_work_week reads it
+    clock = FixedClock(year_start, step=timedelta(days=1))
+    for current_date in (year_start + timedelta(days=i) for i in range(365)):
+        week_from_current = extract_week_number(get_current_work_week(clock))
         
         # Get work week number directly using get_work_week_number
         week_from_direct = get_work_week_number(current_date, first_monday)
@@ -149,9 +143,7 @@ def test_work_week_consistency_for_entire_year():
         # Verify week number is within valid range (1-52)
         assert 1 <= week_from_current <= 52, \
             f"Invalid week number {week_from_current} for date {current_date}"
-        
-        # Move to next day
-        current_date += timedelta(days=1)
+    assert clock.today() == date(2026, 1, 1)
 
 def test_current_work_week():
     """Test the current work week function with various dates."""
@@ -164,14 +156,24 @@ def test_current_work_week():
     ]
     
     for test_date, expected_week in test_cases:
-        with patch('src.main.date') as mock_date_class:
-            mock_date_class.today.return_value = test_date
-            mock_date_class.side_effect = lambda *args, **kw: date(*args, **kw)
-            
+        # Read from the default clock, as the command line does
+        with use_clock(FixedClock(test_date)):
             result = get_current_work_week()
-            assert f"Work Week {expected_week}" in result
-            assert test_date.strftime('%Y-%m-%d') in result
-            assert str(test_date.year) in result
+        assert f"Work Week {expected_week}" in result
+        assert test_date.strftime('%Y-%m-%d') in result
+        assert str(test_date.year) in result
+
+def test_current_work_week_decade_sweep():
+    """Test every day of 2020-2029 against the batch calculation."""
+    np = pytest.importorskip("numpy")
+    days = np.arange('2020-01-01', '2030-01-01', dtype='datetime64[D]')
+    years = days.astype('datetime64[Y]').astype(int) + 1970
+    expected = np.concatenate([get_work_week_numbers(days[years == year], get_first_monday(year))
+                               for year in range(2020, 2030)])
+    clock = FixedClock(date(2020, 1, 1), step=timedelta(days=1))
+    for day, week_num in zip(days.tolist(), expected.tolist()):
+        assert get_current_work_week(clock) == \
+            f"Today is {day:%Y-%m-%d}, Work Week {week_num} of {day.year}"
 
 def test_work_week_calendar():
     """Test the work week calendar function."""
@@ -200,4 +202,133 @@ def test_work_week_calendar():
         assert f"WW{ww}" not in calendar_2025, f"Found week number {ww} which exceeds 52"
     
     # Test that it generates non-empty output
-    assert len(calendar_2025) > 100  # Calendar should be substantial in length 
\ No newline at end of file
+    assert len(calendar_2025) > 100  # Calendar should be substantial in length 
+
+def test_work_week_numbers_match_scalar():
+    """Test that the batch calculation agrees with get_work_week_number."""
+    np = pytest.importorskip("numpy")
+    first_monday = date(2024, 12, 30)
+    
+    # Cover several years on both sides of the start date
+    start = date(2020, 1, 1).toordinal()
+    ordinals = np.arange(start, start + 365 * 10, dtype=np.int64)
+    
+    week_nums = get_work_week_numbers(ordinals, first_monday)
+    assert week_nums.dtype == np.uint8
+    expected = [get_work_week_number(date.fromordinal(int(o)), first_monday) for o in ordinals]
+    assert week_nums.tolist() == expected
+    
+    # datetime64 input gives the same answer as ordinals
+    as_datetime64 = np.array([date.fromordinal(int(o)) for o in ordinals], dtype='datetime64[D]')
+    assert get_work_week_numbers(as_datetime64, first_monday).tolist() == expected
+    
+    # Input ordinals are left untouched
+    assert ordinals[0] == start
+
+def test_work_week_numbers_wrapping():
+    """Test that the batch calculation wraps week 53 back to 1."""
+    np = pytest.importorskip("numpy")
+    first_monday = date(2024, 12, 30)
+    dates = np.array(['2025-01-01', '2025-12-31', '2026-01-05'], dtype='datetime64[D]')
+    assert get_work_week_numbers(dates, first_monday).tolist() == [1, 1, 2]
+    
+    with pytest.raises(TypeError):
+        get_work_week_numbers(np.array([1.5, 2.5]), first_monday)
+
+def test_work_week_ranges():
+    """Test looking up the dates of a work week."""
+    assert get_first_monday(2025) == date(2024, 12, 30)
+    
+    # WW37 of 2025 is one Monday-Sunday week in September
+    (ww37,) = get_work_week_ranges(2025, 37)
+    assert (ww37.start, ww37.end) == (date(2025, 9, 8), date(2025, 9, 14))
+    assert ww37.months == ((2025, 9),)
+    
+    # WW1 of 2025 starts in December 2024
+    (ww1,) = get_work_week_ranges(2025, 1)
+    assert (ww1.start, ww1.end) == (date(2024, 12, 30), date(2025, 1, 5))
+    assert ww1.months == ((2024, 12), (2025, 1))
+    
+    # 2023 has 53 weeks, so its week 53 wraps to a second WW1
+    first, wrapped = get_work_week_ranges(2023, 1)
+    assert first.start == date(2022, 12, 26)
+    assert (wrapped.start, wrapped.end) == (date(2023, 12, 25), date(2023, 12, 31))
+    
+    with pytest.raises(ValueError):
+        get_work_week_ranges(2025, 53)
+
+def test_work_week_ranges_round_trip():
+    """Test that every day of a decade falls in a range for its work week."""
+    for year in range(2020, 2030):
+        first_monday = get_first_monday(year)
+        for week_num in range(1, 53):
+            for week in get_work_week_ranges(year, week_num):
+                for offset in range(7):
+                    day = week.start + timedelta(days=offset)
+                    assert get_work_week_number(day, first_monday) == week_num
+
+def naive_working_days(start, end, weekend=(5, 6), holidays=()):
+    """Count working days from start up to end one day at a time."""
+    days = (start + timedelta(days=i) for i in range((end - start).days))
+    return sum(1 for day in days if day.weekday() not in weekend and day not in holidays)
+
+def test_working_day_count():
+    """Test counting working days against a day-by-day count."""
+    holidays = {date(2025, 1, 1), date(2025, 12, 25), date(2025, 12, 27)}
+    calendar = WorkingDayCalendar(2024, 2026, holidays=holidays)
+    assert calendar.count(date(2025, 12, 22), date(2025, 12, 29)) == 4
+    assert calendar.count(date(2025, 12, 29), date(2025, 12, 22)) == -4
+    assert calendar.count(date(2026, 12, 31), date(2027, 1, 1)) == 1
+    assert not calendar.is_working_day(date(2025, 12, 25))
+    assert calendar.is_working_day(date(2025, 12, 24))
+    for start, end in ((date(2024, 1, 1), date(2026, 12, 31)), (date(2025, 3, 5), date(2025, 3, 6)),
+                       (date(2024, 12, 20), date(2025, 1, 13))):
+        assert calendar.count(start, end) == naive_working_days(start, end, holidays=holidays)
+    
+    # Friday-Saturday weekend
+    friday_saturday = WorkingDayCalendar(2025, 2025, weekend=(4, 5))
+    assert friday_saturday.count(date(2025, 3, 2), date(2025, 3, 9)) == 5
+    assert friday_saturday.is_working_day(date(2025, 3, 2))  # A Sunday
+    
+    with pytest.raises(ValueError):
+        calendar.count(date(2023, 12, 31), date(2024, 1, 5))
+    with pytest.raises(ValueError):
+        WorkingDayCalendar(2025, 2025, weekend=range(7))
+
+def test_working_day_add():
+    """Test stepping by working days, rolling non-working days in the direction of travel."""
+    calendar = WorkingDayCalendar(2025, 2025, holidays=[date(2025, 12, 25)])
+    assert calendar.add(date(2025, 12, 24), 1) == date(2025, 12, 26)
+    assert calendar.add(date(2025, 12, 26), -1) == date(2025, 12, 24)
+    assert calendar.add(date(2025, 12, 27), 0) == date(2025, 12, 29)
+    assert calendar.add(date(2025, 12, 27), -1) == date(2025, 12, 24)
+    assert calendar.add(date(2025, 3, 3), 10) == date(2025, 3, 17)
+    for n in range(-20, 21):
+        day = date(2025, 6, 15) + timedelta(days=n)
+        result = calendar.add(day, n)
+        assert calendar.is_working_day(result)
+        if n > 0:
+            assert calendar.count(day, result) == n
+    with pytest.raises(ValueError):
+        calendar.add(date(2025, 12, 30), 5)
+
+def test_working_days_batch():
+    """Test that the batch forms agree with numpy's business day functions."""
+    np = pytest.importorskip("numpy")
+    holidays = np.array(['2025-01-01', '2025-05-01', '2025-12-25'], dtype='datetime64[D]')
+    calendar = WorkingDayCalendar(2024, 2026, holidays=holidays.astype(object).tolist())
+    days = np.arange('2024-02-01', '2026-11-01', dtype='datetime64[D]')
+    assert calendar.working_days_mask(days).tolist() == \
+        np.is_busday(days, holidays=holidays).tolist()
+    assert calendar.count_many(days[:-30], days[30:]).tolist() == \
+        np.busday_count(days[:-30], days[30:], holidays=holidays).tolist()
+    for n in (-7, 0, 1, 23):
+        roll = 'backward' if n < 0 else 'forward'
+        expected = np.busday_offset(days[40:-40], n, roll=roll, holidays=holidays)
+        assert (calendar.add_many(days[40:-40], n) == expected).all()
+    ordinals = days[40:45].astype(np.int64) + date(1970, 1, 1).toordinal()
+    assert calendar.add_many(ordinals, 1).tolist() == \
+        [calendar.add(date.fromordinal(int(o)), 1).toordinal() for o in ordinals]
+    with pytest.raises(ValueError):
+        calendar.add_many(days[-3:], 60)
+
@@ -0,0 +1,53 @@
+from src.main import get_first_monday, get_work_week_number
+from src.month_grid import build_month_grid, get_month_grid, shift_month
+from datetime import date
+import calendar
+
+def test_month_grid_matches_monthcalendar():
+    """Test the grid layout against calendar.monthcalendar for a decade."""
+    for year in range(2020, 2030):
+        anchor = get_first_monday(year)
+        for month in range(1, 13):
+            grid = build_month_grid(year, month, anchor)
+            cal = calendar.monthcalendar(year, month)
+            assert grid.num_weeks == len(cal)
+            for week_idx, week in enumerate(cal):
+                for day_idx, day in enumerate(week):
+                    shown = grid.date_at(week_idx, day_idx)
+                    assert grid.days[week_idx][day_idx] == shown.day
+                    assert grid.in_month[week_idx][day_idx] == (day != 0)
+                    if day:
+                        assert shown == date(year, month, day)
+                first_day = next(day for day in week if day)
+                assert grid.week_nums[week_idx] == \
+                    get_work_week_number(date(year, month, first_day), anchor)
+
+def test_month_grid_neighbour_days():
+    """Test the days shown from the previous and next months."""
+    grid = get_month_grid(2025, 3)
+    # March 2025 starts on a Saturday and ends on a Monday
+    assert grid.days[0] == (24, 25, 26, 27, 28, 1, 2)
+    assert grid.in_month[0] == (False,) * 5 + (True, True)
+    assert grid.days[-1] == (31, 1, 2, 3, 4, 5, 6)
+    assert grid.week_nums == (9, 10, 11, 12, 13, 14)
+
+def test_today_cell():
+    """Test finding today's cell."""
+    grid = get_month_grid(2025, 1)
+    assert grid.today_cell(date(2025, 1, 1)) == (0, 2)
+    assert grid.today_cell(date(2025, 1, 31)) == (4, 4)
+    # Dec 31 is shown in the first row but belongs to another month
+    assert grid.cell_of(date(2024, 12, 31)) == (0, 1)
+    assert grid.today_cell(date(2024, 12, 31)) is None
+    assert grid.today_cell(date(2025, 3, 1)) is None
+
+def test_month_grid_cache():
+    """Test that grids are memoized per month and anchor."""
+    assert get_month_grid(2025, 6) is get_month_grid(2025, 6, date(2024, 12, 30))
+    assert get_month_grid(2025, 6, date(2025, 1, 6)) is not get_month_grid(2025, 6)
+
+def test_shift_month():
+    """Test stepping across year boundaries."""
+    assert shift_month(2025, 1, -1) == (2024, 12)
+    assert shift_month(2025, 12, 1) == (2026, 1)
+    assert shift_month(2025, 6, -18) == (2023, 12)
@@ -0,0 +1,86 @@
+import json
+
+from src.profiling import Profiler, count_widgets
+
+class Handlers:
+    def __init__(self):
+        self.renders = 0
+    
+    def render(self):
+        self.renders += 1
+    
+    def step(self):
+        self.render()
+        return 'stepped'
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        self.now += 0.5
+        return self.now
+
+def test_instrument_and_remove():
+    """Test that calls are counted and timed only while instrumented."""
+    handlers = Handlers()
+    profiler = Profiler(ring_size=3, clock=FakeClock())
+    profiler.instrument(handlers, ('render', 'step'))
+    profiler.instrument(handlers, ('render',))  # Instrumenting again is a no-op
+    
+    assert handlers.step() == 'stepped'
+    for _ in range(3):
+        handlers.render()
+    assert handlers.renders == 4
+    assert profiler.calls['render'] == [4, 2.0, 0.5]
+    assert profiler.calls['step'][0] == 1
+    assert [name for name, _, _ in profiler.recent] == ['render'] * 3  # Oldest dropped
+    
+    profiler.remove()
+    handlers.render()
+    assert 'render' not in vars(handlers)
+    assert profiler.calls['render'][0] == 4
+
+def test_snapshot(tmp_path):
+    """Test the JSON stats snapshot."""
+    handlers = Handlers()
+    profiler = Profiler(clock=FakeClock())
+    profiler.instrument(handlers, ('render',), 'view.')
+    handlers.render()
+    
+    path = tmp_path / 'stats' / 'stats.json'
+    profiler.write_snapshot(str(path), widgets=12)
+    stats = json.loads(path.read_text())
+    assert stats['widgets'] == 12
+    assert stats['calls']['view.render'] == {'count': 1, 'total_ms': 500.0, 'max_ms': 500.0,
+                                             'mean_ms': 500.0}
+    assert stats['recent'][0]['name'] == 'view.render'
+
+def test_capture(tmp_path):
+    """Test profiling the next calls with cProfile."""
+    handlers = Handlers()
+    profiler = Profiler()
+    profiler.instrument(handlers, ('render',))
+    path = str(tmp_path / 'renders.prof')
+    profiler.capture('render', 2, path)
+    
+    handlers.render()
+    assert profiler.capture_profile is not None
+    handlers.render()
+    assert profiler.capture_profile is None
+    assert 'render' in open(path + '.txt').read()
+    
+    handlers.render()  # Timed again after the capture
+    assert profiler.calls['render'][0] == 1
+    assert handlers.renders == 3
+
+def test_count_widgets():
+    """Test counting a widget tree."""
+    class Widget:
+        def __init__(self, *children):
+            self.children = children
+        
+        def winfo_children(self):
+            return list(self.children)
+    
+    assert count_widgets(Widget(Widget(), Widget(Widget()))) == 4
@@ -0,0 +1,91 @@
+from src.refresh_scheduler import DayChangeScheduler, MAX_SLEEP_MS, MIDNIGHT_MARGIN_MS
+from datetime import date, datetime, timedelta
+
+class FakeTimers:
+    """Stand-in for Tk's after/after_cancel with a controllable wall and monotonic clock."""
+    def __init__(self, now: datetime):
+        self.wall = now
+        self.mono = 0.0
+        self.pending = {}
+        self.next_id = 0
+    
+    def after(self, ms, callback):
+        self.next_id += 1
+        self.pending[self.next_id] = (ms, callback)
+        return self.next_id
+    
+    def after_cancel(self, timer_id):
+        del self.pending[timer_id]
+    
+    def advance(self, seconds, wall_jump=0.0):
+        """Let time pass, firing the pending timer if it is due."""
+        self.wall += timedelta(seconds=seconds + wall_jump)
+        self.mono += seconds
+        (timer_id, (ms, callback)), = self.pending.items()
+        if ms / 1000 <= seconds:
+            del self.pending[timer_id]
+            callback()
+
+def make_scheduler(now):
+    timers = FakeTimers(now)
+    changes = []
+    scheduler = DayChangeScheduler(timers.after, timers.after_cancel,
+                                   lambda old, new: changes.append((old, new)),
+                                   now=lambda: timers.wall, monotonic=lambda: timers.mono)
+    scheduler.start()
+    return scheduler, timers, changes
+
+def test_sleeps_until_midnight():
+    """Test that the scheduler sleeps until just after midnight."""
+    scheduler, timers, changes = make_scheduler(datetime(2025, 3, 14, 23, 30))
+    (ms, _), = timers.pending.values()
+    assert ms == 30 * 60 * 1000 + MIDNIGHT_MARGIN_MS
+    
+    timers.advance(30 * 60 + 1)
+    assert changes == [(date(2025, 3, 14), date(2025, 3, 15))]
+    assert scheduler.wakeups == 1
+    
+    # Sleeps are capped during the day
+    (ms, _), = timers.pending.values()
+    assert ms == MAX_SLEEP_MS
+
+def test_few_wakeups_per_day():
+    """Test that a full day costs at most one wakeup per hour and one date change."""
+    scheduler, timers, changes = make_scheduler(datetime(2025, 3, 14, 0, 0, 1))
+    for _ in range(24):
+        timers.advance(3600)
+    assert scheduler.wakeups == 24
+    assert changes == [(date(2025, 3, 14), date(2025, 3, 15))]
+
+def test_clock_jump_reschedules():
+    """Test that a wall clock jump (e.g. resume from suspend) is noticed on check."""
+    scheduler, timers, changes = make_scheduler(datetime(2025, 3, 14, 20, 0))
+    # Suspended overnight: only 10 monotonic seconds pass, but the wall clock moves 13 hours
+    timers.advance(10, wall_jump=13 * 3600)
+    assert scheduler.check()
+    assert scheduler.clock_jumps == 1
+    assert changes == [(date(2025, 3, 14), date(2025, 3, 15))]
+    
+    # The new wakeup is computed from the new time
+    (ms, _), = timers.pending.values()
+    assert ms == MAX_SLEEP_MS
+    assert not scheduler.check()
+
+def test_idle_resume_caught_by_cap():
+    """Test that a date change during suspend is shown within MAX_SLEEP_MS without any check()."""
+    scheduler, timers, changes = make_scheduler(datetime(2025, 3, 14, 20, 0))
+    # The 4-hour sleep to midnight is capped, and suspend stops the timer's clock
+    (ms, _), = timers.pending.values()
+    assert ms == MAX_SLEEP_MS
+    timers.advance(0, wall_jump=13 * 3600)
+    assert changes == []
+    # Nobody touches the window: the capped timer still fires, an hour after resume
+    timers.advance(MAX_SLEEP_MS / 1000)
+    assert changes == [(date(2025, 3, 14), date(2025, 3, 15))]
+    assert scheduler.wakeups == 1 and scheduler.clock_jumps == 1
+
+def test_stop():
+    """Test that stop cancels the pending wakeup."""
+    scheduler, timers, changes = make_scheduler(datetime(2025, 3, 14, 12, 0))
+    scheduler.stop()
+    assert timers.pending == {}
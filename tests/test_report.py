@@ -0,0 +1,175 @@
+from src.main import get_first_monday, get_work_week_number
+from datetime import date, timedelta
+from collections import Counter
+from itertools import groupby
+import io
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.report import WorkWeekReport, aggregate_file
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def week_of(day):
+    """The (year, work week) a report counts a day in, as the widget numbers it."""
+    return (day.year, get_work_week_number(day, get_first_monday(day.year)))
+
+def counts_by_week(rows):
+    """Add up report rows by (year, work week, category); a wrapped WW1 joins its year's first."""
+    counts = Counter()
+    for year, week_num, category, count, *_ in rows:
+        counts[(year, week_num, category)] += count
+    return {key: count for key, count in counts.items() if count}
+
+def random_days(num, seed=0):
+    rng = np.random.default_rng(seed)
+    ordinals = rng.integers(date(2019, 1, 1).toordinal(), date(2022, 12, 31).toordinal() + 1, num)
+    return ordinals
+
+def test_counts_match_loop():
+    """Test counts per week and category against counting one event at a time."""
+    ordinals = random_days(5000)
+    categories = np.array(['a', 'b', 'c'])[np.arange(5000) % 3]
+    report = WorkWeekReport(2019, 2022)
+    assert report.add(ordinals, categories) == 5000
+    expected = Counter()
+    for ordinal, category in zip(ordinals.tolist(), categories.tolist()):
+        expected[(*week_of(date.fromordinal(ordinal)), category)] += 1
+    assert counts_by_week(report.iter_rows()) == dict(expected)
+    # Every week of the span appears once per category
+    assert len(list(report.iter_rows())) == 3 * len(report.weeks())
+
+def test_weights_and_out_of_range():
+    """Test weight sums, datetime64 input and events outside the span."""
+    report = WorkWeekReport(2025, 2025)
+    dates = np.array(['2025-01-06T10:00', '2025-01-07T11:30', '2024-12-31T00:00', '2026-01-01T00:00'],
+                     dtype='datetime64[m]')
+    assert report.add(dates, weights=[1.5, 2.0, 100.0, 100.0]) == 2
+    assert report.out_of_range == 2
+    rows = list(report.iter_rows())
+    assert rows[1] == (2025, 2, '', 2, 3.5)
+    # Dec 29-31, 2025 wrap to WW1: numbered as the widget does, but their own week
+    assert report.weeks()[0] == (2025, 1) and report.weeks()[-2:] == [(2025, 52), (2025, 1)]
+    report.add([date(2025, 12, 30).toordinal()])
+    rows = list(report.iter_rows(window=4))
+    assert rows[0][3] == 0 and rows[-1][3] == 1
+    # Not in a rolling window of January's weeks
+    assert [row[5] for row in rows[:4]] == [0, 2, 2, 2] and rows[-1][5] == 1
+
+def test_iso_weeks_spill_into_other_years():
+    """Test that days numbered in the ISO year before or after get their own columns."""
+    report = WorkWeekReport(2021, 2021, 'iso')
+    report.add([date(2021, 1, 1).toordinal(), date(2021, 1, 4).toordinal()])
+    rows = [row for row in report.iter_rows() if row[3]]
+    assert [row[:2] for row in rows] == [(2020, 53), (2021, 1)]
+
+@pytest.mark.parametrize("name", ['default', 'iso', '4-4-5', 'fiscal:04-01'])
+def test_weeks_match_scalar_rule(name):
+    """Test that every day is counted in the (year, week) rule.fiscal_week gives it."""
+    from src.week_rules import get_rule
+    rule = get_rule(name)
+    first, last = date(2019, 1, 1).toordinal(), date(2022, 12, 31).toordinal()
+    report = WorkWeekReport(2019, 2022, name)
+    report.add(np.arange(first, last + 1))
+    # Runs of days the rule numbers alike, in date order
+    weeks = [rule.fiscal_week(date.fromordinal(ordinal))[:2] for ordinal in range(first, last + 1)]
+    expected = [(week, len(list(run))) for week, run in groupby(weeks)]
+    assert [(row[:2], row[3]) for row in report.iter_rows()] == expected
+    # The last year dates can have
+    report = WorkWeekReport(9999, 9999, name)
+    assert report.add([date(9999, 12, 31).toordinal()]) == 1
+    assert [row[:2] for row in report.iter_rows() if row[3]] == [rule.fiscal_week(date(9999, 12, 31))[:2]]
+
+def test_merge_equals_single_pass():
+    """Test that partial reports merge into the report of all events."""
+    ordinals = random_days(3000, seed=1)
+    codes = np.arange(3000) % 4
+    weights = np.linspace(0, 1, 3000)
+    whole = WorkWeekReport(2019, 2022)
+    whole.add(ordinals, codes, weights)
+    merged = WorkWeekReport(2019, 2022)
+    for start in range(0, 3000, 700):
+        part = WorkWeekReport(2019, 2022)
+        part.add(ordinals[start:start + 700][::-1], codes[start:start + 700][::-1],
+                 weights[start:start + 700][::-1])
+        merged.merge(part)
+    assert merged.categories == whole.categories
+    assert (merged.counts == whole.counts).all()
+    assert merged.weights == pytest.approx(whole.weights)
+    with pytest.raises(ValueError):
+        merged.merge(WorkWeekReport(2019, 2022, 'iso'))
+
+def test_rolling():
+    """Test rolling window sums against summing the weekly counts."""
+    report = WorkWeekReport(2024, 2025)
+    report.add(random_days(2000, seed=2))
+    weekly = report.rolling(1)[0]
+    rolling = report.rolling(4)[0]
+    for i in range(len(weekly)):
+        assert rolling[i] == weekly[max(0, i - 3):i + 1].sum()
+    with pytest.raises(ValueError):
+        report.rolling(0)
+
+def test_write_formats():
+    """Test the CSV and JSON output."""
+    report = WorkWeekReport(2025, 2025)
+    report.add([date(2025, 3, 14).toordinal()] * 2, ['x', 'y'])
+    out = io.StringIO()
+    assert report.write(out, 'csv', window=2) == 2 * 53
+    lines = out.getvalue().splitlines()
+    assert lines[0] == "year,work_week,category,count,count_2w"
+    assert "2025,11,x,1,1" in lines and "2025,12,x,0,1" in lines
+    out = io.StringIO()
+    report.write(out, 'json')
+    result = json.loads(out.getvalue())
+    assert result['rule'] == 'default' and len(result['rows']) == 106
+    assert result['rows'][10] == {'year': 2025, 'work_week': 11, 'category': 'x', 'count': 1}
+    with pytest.raises(ValueError):
+        report.write(out, 'xml')
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_aggregate_file(tmp_path, workers):
+    """Test aggregating a CSV file in chunks, with bad lines counted as invalid."""
+    path = tmp_path / "events.csv"
+    days = [date(2024, 1, 1) + timedelta(days=i * 5 % 700) for i in range(1500)]
+    lines = [f"{i},{day}T08:00:00Z,{'ok' if i % 3 else 'fail'},{i % 10}\n" for i, day in enumerate(days)]
+    lines[7:7] = ["99,never,ok,1\n", "short\n"]
+    path.write_text("id,when,status,ms\n" + "".join(lines))
+    report = aggregate_file(str(path), 2024, 2025, 'when', 'status', 'ms',
+                            workers=workers, chunk_bytes=2000)
+    assert report.invalid == 2
+    assert report.counts.sum() == 1500
+    assert report.weights.sum() == sum(i % 10 for i in range(1500))
+    expected = Counter((*week_of(day), 'ok' if i % 3 else 'fail') for i, day in enumerate(days))
+    assert counts_by_week(report.iter_rows()) == dict(expected)
+    with pytest.raises(ValueError):
+        aggregate_file(str(path), 2024, 2025, 'timestamp')
+
+def test_report_cli(tmp_path):
+    """Test the report command of run_app.py."""
+    path = tmp_path / "in.csv"
+    path.write_text("when,host\n2025-09-08,a\n2025-09-09,a\n2025-09-15,b\n")
+    result = subprocess.run([sys.executable, "run_app.py", "report", str(path), "--column", "when",
+                             "--category", "host", "--start-year", "2025", "--workers", "1",
+                             "--format", "json"], cwd=ROOT, check=True, capture_output=True, text=True)
+    rows = [row for row in json.loads(result.stdout)['rows'] if row['count']]
+    assert [(row['work_week'], row['category'], row['count']) for row in rows] == [(37, 'a', 2), (38, 'b', 1)]
+    # Without a console (the frozen build) there is no stdout to write to
+    code = ("import sys; sys.stdout = None; import run_app; "
+            f"run_app.main(['report', {str(path)!r}])")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 2 and "-o/--output is required" in result.stderr
+
+def test_report_cli_without_numpy(tmp_path):
+    """Test that report exits with a usage error where numpy is left out, as in the frozen build."""
+    path = tmp_path / "in.csv"
+    path.write_text("when\n2025-09-08\n")
+    code = ("import sys; sys.modules['numpy'] = None; import run_app; "
+            f"run_app.main(['report', {str(path)!r}])")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 2 and "report needs numpy" in result.stderr
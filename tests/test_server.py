@@ -0,0 +1,108 @@
+from src.server import handle_request, start_server
+import asyncio
+from datetime import date
+import json
+import pytest
+
+def request(method, target, body=b''):
+    status, payload = handle_request(method, target, body)
+    return status, json.loads(payload)
+
+def test_single_date():
+    """Test the single date endpoint."""
+    assert request('GET', '/ww?date=2025-03-14') == \
+        (200, {'date': '2025-03-14', 'year': 2025, 'work_week': 11})
+    assert request('GET', '/ww?date=2025-12-31')[1]['work_week'] == 1
+    assert request('GET', '/ww?date=2025-01-06&start=2025-01-06')[1]['work_week'] == 1
+    assert request('GET', '/ww?date=2025-12-31&rule=iso') == \
+        (200, {'date': '2025-12-31', 'year': 2026, 'work_week': 1})
+    assert request('GET', '/ww?date=2025-13-01')[0] == 400
+    assert request('GET', '/ww?date=2025-01-01&rule=nope')[0] == 400
+
+def test_batch():
+    """Test the batch endpoint."""
+    body = json.dumps({'dates': ['2025-01-01', '2025-03-14', '2025-12-31']}).encode()
+    assert request('POST', '/ww/batch', body) == (200, {'work_weeks': [1, 11, 1]})
+    body = json.dumps({'dates': ['2025-12-31', '2020-12-31'], 'rule': 'iso'}).encode()
+    assert request('POST', '/ww/batch', body) == (200, {'work_weeks': [1, 53]})
+    assert request('POST', '/ww/batch', b'{"dates": 3}')[0] == 400
+    assert request('POST', '/ww/batch', b'not json')[0] == 400
+    for rule in (123, [1], True, 'weekly'):
+        body = json.dumps({'dates': ['2025-01-01'], 'rule': rule}).encode()
+        status, payload = request('POST', '/ww/batch', body)
+        assert status == 400 and 'rule' in payload['error']
+
+def test_range():
+    """Test the reverse (work week to dates) endpoint."""
+    status, payload = request('GET', '/range?year=2025&ww=37')
+    assert status == 200
+    assert payload['ranges'] == [{'start': '2025-09-08', 'end': '2025-09-14', 'months': [[2025, 9]]}]
+    assert len(request('GET', '/range?year=2023&ww=1')[1]['ranges']) == 2
+    assert request('GET', '/range?year=2025&ww=60')[0] == 400
+
+@pytest.mark.parametrize("day", ['0001-01-01', '9999-12-31'])
+@pytest.mark.parametrize("rule", ['', 'iso', 'fiscal:04-01', '4-4-5'])
+def test_edge_years(day, rule):
+    """Test dates in the first and last years dates can have, under every rule."""
+    status, payload = request('GET', f'/ww?date={day}&rule={rule}')
+    assert status == 200 and payload['date'] == day
+    body = json.dumps({'dates': [day], 'rule': rule}).encode()
+    assert request('POST', '/ww/batch', body) == (200, {'work_weeks': [payload['work_week']]})
+    year = int(day[:4])
+    assert request('GET', f'/range?year={year}&ww=1')[0] == 200
+
+def test_out_of_range_is_bad_request():
+    """Test that years and weeks past the date range get a 400, not a dropped connection."""
+    for target in ('/range?year=10000&ww=1', '/range?year=0&ww=1',
+                   '/range?year=99999999999999999999&ww=1'):
+        status, payload = request('GET', target)
+        assert status == 400 and payload['error']
+
+def test_unknown_routes():
+    """Test 404 and 405 responses."""
+    assert request('GET', '/nope')[0] == 404
+    assert request('POST', '/ww')[0] == 405
+
+def test_keep_alive_connection():
+    """Test several requests over one kept-alive connection."""
+    async def run():
+        server = await start_server('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        replies = []
+        for target, status in (('/ww?date=2025-01-01', 200), ('/range?year=99999999999999999999&ww=1', 400),
+                               ('/ww?date=2025-03-14', 200)):
+            writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+            await writer.drain()
+            assert (await reader.readline()).startswith(f"HTTP/1.1 {status}".encode())
+            headers = {}
+            while (line := await reader.readline()) != b"\r\n":
+                name, _, value = line.decode().partition(':')
+                headers[name.lower()] = value.strip()
+            assert headers['connection'] == 'keep-alive'
+            replies.append(json.loads(await reader.readexactly(int(headers['content-length']))))
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return replies
+    
+    replies = asyncio.run(run())
+    assert [reply.get('work_week') for reply in replies] == [1, None, 11]
+    assert 'error' in replies[1]
+
+def test_holidays():
+    """Test that holidays are reported once holiday files are loaded."""
+    from src.holidays import Event, HolidayIndex
+    from src.server import set_holidays
+    day = date(2025, 12, 25).toordinal()
+    assert 'holidays' not in request('GET', '/ww?date=2025-12-25')[1]
+    set_holidays(HolidayIndex([Event(day, day + 1, 'Christmas')]))
+    try:
+        assert request('GET', '/ww?date=2025-12-25')[1]['holidays'] == ['Christmas']
+        assert request('GET', '/ww?date=2025-12-27&rule=iso')[1]['holidays'] == []
+        body = json.dumps({'dates': ['2025-12-24', '2025-12-26']}).encode()
+        assert request('POST', '/ww/batch', body)[1] == \
+            {'work_weeks': [52, 52], 'holidays': [False, True]}
+    finally:
+        set_holidays(None)
+    assert 'holidays' not in request('GET', '/ww?date=2025-12-25')[1]
@@ -0,0 +1,117 @@
+import subprocess
+import sys
+import time
+import pytest
+
+from src import single_instance
+from src.single_instance import InstanceServer, notify_running_instance, parse_command, send_command
+
+@pytest.fixture(params=['unix', 'tcp'])
+def instance_path(request, tmp_path, monkeypatch):
+    """An endpoint path for each transport the platform supports."""
+    if request.param == 'unix':
+        if not single_instance.USE_UNIX_SOCKET:
+            pytest.skip("No Unix sockets on this platform")
+        return str(tmp_path / 'instance.sock')
+    monkeypatch.setattr(single_instance, 'USE_UNIX_SOCKET', False)
+    return str(tmp_path / 'instance.port')
+
+def test_parse_command():
+    """Test parsing commands and rejecting bad ones."""
+    assert parse_command('show') == ('show', ())
+    assert parse_command('next') == ('next', (1,))
+    assert parse_command(' PREV 3\n') == ('prev', (3,))
+    assert parse_command('month 2025-03') == ('month', (2025, 3))
+    assert parse_command('week 37') == ('week', (None, 37))
+    assert parse_command('week 2026 ww37') == ('week', (2026, 37))
+    for line in ('', 'jump', 'next 0', 'next x', 'month 2025-13', 'week 54', 'show now'):
+        with pytest.raises(ValueError):
+            parse_command(line)
+
+def test_commands_reach_running_instance(instance_path):
+    """Test that commands from another client are dispatched and acknowledged."""
+    received = []
+    server = InstanceServer(instance_path)
+    assert server.start()
+    try:
+        assert send_command('ping', instance_path) == 'ok'
+        assert notify_running_instance(instance_path)
+        assert send_command('next 2', instance_path) == 'ok'
+        assert send_command('bogus', instance_path).startswith('error:')
+        # Queued until the Tk thread polls
+        assert received == []
+        assert server.poll(lambda name, args: received.append((name, args))) == 2
+        assert received == [('show', ()), ('next', (2,))]
+        assert server.poll(received.append) == 0 and server.commands == 2
+        
+        # A second instance sees the first and does not take over
+        assert not InstanceServer(instance_path).start()
+    finally:
+        server.stop()
+    assert not notify_running_instance(instance_path)
+
+def test_stale_endpoint_is_replaced(tmp_path):
+    """Test that a socket left by a crashed instance does not block startup."""
+    if not single_instance.USE_UNIX_SOCKET:
+        pytest.skip("No Unix sockets on this platform")
+    import socket
+    path = str(tmp_path / 'instance.sock')
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()  # The file stays, but nothing listens
+    
+    server = InstanceServer(path)
+    assert server.start()
+    try:
+        assert send_command('ping', path) == 'ok'
+    finally:
+        server.stop()
+
+def test_simultaneous_launches(instance_path):
+    """Test that exactly one of several launches at once takes the endpoint."""
+    import threading
+    if single_instance.USE_UNIX_SOCKET:
+        import socket
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(instance_path)
+        stale.close()  # Every launch finds the endpoint taken, but nobody answers
+    servers = [InstanceServer(instance_path) for _ in range(6)]
+    started = {}
+    barrier = threading.Barrier(len(servers))
+    def launch(server):
+        barrier.wait()
+        started[server] = server.start()
+    threads = [threading.Thread(target=launch, args=(server,)) for server in servers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+    try:
+        assert sorted(started.values()) == [False] * 5 + [True]
+        assert send_command('ping', instance_path) == 'ok'
+    finally:
+        for server in servers:
+            server.stop()
+
+def test_second_launch_exits_quickly(tmp_path, monkeypatch):
+    """Test that launching run_app.py while an instance runs only notifies it."""
+    path = str(tmp_path / 'instance')
+    monkeypatch.setenv('WW_CALENDAR_INSTANCE', path)
+    received = []
+    server = InstanceServer(path)
+    assert server.start()
+    try:
+        started = time.perf_counter()
+        subprocess.run([sys.executable, 'run_app.py'], check=True, timeout=30)
+        elapsed = time.perf_counter() - started
+        server.poll(lambda name, args: received.append(name))
+        assert received == ['show']
+        assert elapsed < 5  # Interpreter start plus one round trip; no Tk
+        
+        result = subprocess.run([sys.executable, 'run_app.py', 'send', 'week', '2026', '37'],
+                                capture_output=True, text=True, timeout=30)
+        assert result.returncode == 0 and result.stdout.strip() == 'ok'
+        server.poll(lambda name, args: received.append(name))
+        assert received == ['show', 'week']
+    finally:
+        server.stop()
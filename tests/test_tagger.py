@@ -0,0 +1,122 @@
+from src.main import get_first_monday, get_work_week_number
+from src.tagger import TagOptions, split_lines, tag_file, tag_lines
+from datetime import date, timedelta
+import io
+import os
+import subprocess
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_tag_lines():
+    """Test date formats, quoted fields, CRLF endings and lines without a date."""
+    data = (b'1,"Smith, J",2025-03-14T10:00:00Z\r\n'
+            b'2,Lee,20251231\n'
+            b'3,Kim,not a date\n'
+            b'4,Ng,2025-02-30\n'
+            b'5,Ito\n'
+            b'6,Ali,2020-12-31 23:59')
+    tagged, lines, untagged = tag_lines(data, TagOptions(2))
+    assert tagged.split(b'\n') == [b'1,"Smith, J",2025-03-14T10:00:00Z,11\r', b'2,Lee,20251231,1',
+                                   b'3,Kim,not a date,', b'4,Ng,2025-02-30,', b'5,Ito,',
+                                   b'6,Ali,2020-12-31 23:59,1']
+    assert (lines, untagged) == (6, 3)
+    assert tag_lines(b'2020-12-31\n', TagOptions(0, rule='iso'))[0] == b'2020-12-31,53\n'
+
+@pytest.mark.parametrize("ending", [b"\n", b"\r\n", b""])
+def test_tag_file_keeps_last_line_ending(tmp_path, ending):
+    """Test that a file whose last line has no newline is tagged without adding one."""
+    path = tmp_path / "in.csv"
+    path.write_bytes(b"when" + (ending or b"\n") + b"2025-03-14" + ending)
+    out = io.BytesIO()
+    tag_file(str(path), out, workers=1)
+    assert out.getvalue() == b"when,work_week" + (ending or b"\n") + b"2025-03-14,11" + ending
+    # A header-only file keeps its ending too
+    path.write_bytes(b"when" + ending)
+    out = io.BytesIO()
+    tag_file(str(path), out, workers=1)
+    assert out.getvalue() == b"when,work_week" + ending
+
+def test_week_cache_is_bounded():
+    """Test that the date cache has a size limit and never holds text that is not a date."""
+    from src.tagger import WEEK_CACHE_SIZE, _week_field
+    _week_field.cache_clear()
+    data = b''.join(b'%d,msg-%07d\n' % (i, i) for i in range(20000))
+    data += b''.join(b'%d,%s\n' % (i, (date(2000, 1, 1) + timedelta(days=i)).isoformat().encode())
+                     for i in range(WEEK_CACHE_SIZE + 100))
+    tagged, lines, untagged = tag_lines(data, TagOptions(1))
+    assert (lines, untagged) == (20000 + WEEK_CACHE_SIZE + 100, 20000)
+    info = _week_field.cache_info()
+    assert info.maxsize == WEEK_CACHE_SIZE and info.currsize == WEEK_CACHE_SIZE
+    assert tagged.split(b'\n')[-2].endswith(b',%d' % get_work_week_number(
+        date(2000, 1, 1) + timedelta(days=WEEK_CACHE_SIZE + 99), get_first_monday(2022)))
+
+def test_split_lines():
+    """Test that chunks end on line breaks and cover the data."""
+    data = b''.join(b'line %d\n' % i for i in range(100))
+    chunks = list(split_lines(data, 0, 50))
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(data)
+    assert all(data[end - 1:end] == b'\n' for _, end in chunks)
+    assert all(a[1] == b[0] for a, b in zip(chunks, chunks[1:]))
+
+def test_chunks_in_flight_are_bounded():
+    """Test that no more than in_flight chunks are submitted ahead of the results consumed."""
+    from concurrent.futures import Future
+    from src.tagger import _map_in_order
+    
+    class InlinePool:
+        def __init__(self):
+            self.submitted = 0
+        def submit(self, task, *args):
+            self.submitted += 1
+            future = Future()
+            future.set_result(task(*args))
+            return future
+    pool = InlinePool()
+    chunks = ((start, start + 1) for start in range(100))
+    results = _map_in_order(pool, lambda path, start, end, options: start, 'f', chunks, None, 4)
+    for consumed, start in enumerate(results, 1):
+        assert start == consumed - 1
+        assert pool.submitted - consumed < 4
+    assert pool.submitted == 100
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_tag_file_keeps_order(tmp_path, workers):
+    """Test that tagged lines come out in input order, with or without workers."""
+    path = tmp_path / "events.csv"
+    days = [date(2020, 1, 1) + timedelta(days=i * 7 % 3000) for i in range(2000)]
+    path.write_text("id,when\n" + "".join(f"{i},{day}T08:00\n" for i, day in enumerate(days)))
+    out = io.BytesIO()
+    stats = tag_file(str(path), out, column='when', workers=workers, chunk_bytes=1000)
+    assert (stats.lines, stats.untagged) == (2000, 0)
+    lines = out.getvalue().decode().splitlines()
+    assert lines[0] == "id,when,work_week"
+    for i, (line, day) in enumerate(zip(lines[1:], days)):
+        assert line == f"{i},{day}T08:00,{get_work_week_number(day, get_first_monday(day.year))}"
+
+def test_tag_log_without_header(tmp_path):
+    """Test tagging a space separated log by field index."""
+    path = tmp_path / "app.log"
+    path.write_bytes(b"2025-03-14 10:00:01 INFO started\n2025-12-31 23:59:59 WARN done\n")
+    out = io.BytesIO()
+    tag_file(str(path), out, column='0', delimiter=' ', header=False, workers=1)
+    assert out.getvalue() == (b"2025-03-14 10:00:01 INFO started 11\n"
+                              b"2025-12-31 23:59:59 WARN done 1\n")
+    with pytest.raises(ValueError):
+        tag_file(str(path), io.BytesIO(), column='when', header=False)
+
+def test_tag_cli(tmp_path):
+    """Test the tag command of run_app.py."""
+    path = tmp_path / "in.tsv"
+    output = tmp_path / "out.tsv"
+    path.write_text("when\tvalue\n2025-09-08\t1\n")
+    subprocess.run([sys.executable, "run_app.py", "tag", str(path), "--column", "when",
+                    "--delimiter", "\\t", "--workers", "1", "-o", str(output)], cwd=ROOT, check=True)
+    assert output.read_text() == "when\tvalue\twork_week\n2025-09-08\t1\t37\n"
+    
+    # Without a console (the frozen build) there is no stdout to write to
+    code = ("import sys; sys.stdout = None; import run_app; "
+            f"run_app.main(['tag', {str(path)!r}, '--column', 'when', '--delimiter', '\\\\t'])")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 2 and "-o/--output is required" in result.stderr
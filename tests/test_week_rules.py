@@ -0,0 +1,110 @@
+from src.main import get_first_monday, get_work_week_number
+from src.month_grid import build_month_grid, get_month_grid
+from src.week_rules import DEFAULT_RULE, FiscalWeek, get_rule
+from datetime import date, timedelta
+import pytest
+
+def days(first: date, last: date):
+    current_date = first
+    while current_date <= last:
+        yield current_date
+        current_date += timedelta(days=1)
+
+def test_default_rule_matches_widget_numbering():
+    """Test that the default rule numbers every day like the widget does."""
+    rule = get_rule()
+    assert rule is DEFAULT_RULE
+    for current_date in days(date(2000, 1, 1), date(2040, 12, 31)):
+        expected = get_work_week_number(current_date, get_first_monday(current_date.year))
+        assert rule.fiscal_week(current_date) == FiscalWeek(current_date.year, expected)
+
+def test_iso_rule():
+    """Test ISO-8601 weeks, including 53-week years."""
+    rule = get_rule('iso')
+    for current_date in days(date(2015, 1, 1), date(2030, 12, 31)):
+        iso_year, iso_week, _ = current_date.isocalendar()
+        assert rule.fiscal_week(current_date) == FiscalWeek(iso_year, iso_week)
+    assert rule.week_number(date(2020, 12, 31)) == 53
+    assert rule.first_date(2026, 1) == date(2025, 12, 29)
+    assert rule.first_date(2025, 53) is None
+
+def test_fiscal_year_rule():
+    """Test fiscal years starting in October, named by the year they end in."""
+    rule = get_rule('fiscal:10-01')
+    # Oct 1 2025 is a Wednesday, so FY2026 starts on Monday Sep 29 2025
+    assert rule.fiscal_week(date(2025, 9, 28)) == FiscalWeek(2025, 52)
+    assert rule.fiscal_week(date(2025, 9, 29)) == FiscalWeek(2026, 1)
+    assert rule.fiscal_week(date(2026, 3, 14)) == FiscalWeek(2026, 24)
+    assert rule.first_date(2026, 1) == date(2025, 9, 29)
+    
+    # Without a start date, weeks count from the first Monday and do not wrap
+    assert get_rule('fiscal:01-01').fiscal_week(date(2023, 12, 25)) == FiscalWeek(2023, 53)
+
+def test_period_rules():
+    """Test 4-4-5 and 4-5-4 periods and quarters."""
+    rule = get_rule('4-4-5')
+    first_monday = date(2024, 12, 30)
+    periods = [rule.fiscal_week(first_monday + timedelta(weeks=i)).period for i in range(52)]
+    assert periods[:14] == [1] * 4 + [2] * 4 + [3] * 5 + [4]
+    assert periods[-5:] == [12] * 5
+    assert rule.fiscal_week(date(2025, 6, 30)) == FiscalWeek(2025, 27, 7, 3)
+    
+    # The 53rd week of 2023 joins the last period
+    assert rule.fiscal_week(date(2023, 12, 25)) == FiscalWeek(2023, 53, 12, 4)
+    
+    rule = get_rule('4-5-4')
+    assert rule.fiscal_week(date(2025, 2, 3)).period == 2
+    assert rule.fiscal_week(date(2025, 3, 10)).period == 3
+
+def test_get_rule():
+    """Test rule lookup by name."""
+    assert get_rule('iso') is get_rule('iso')
+    assert get_rule('4-4-5:10-01').fiscal_week(date(2025, 9, 29)) == FiscalWeek(2026, 1, 1, 1)
+    for name in ('weird', '4-4-4', 'fiscal:13-01', 'fiscal:02-30'):
+        with pytest.raises(ValueError):
+            get_rule(name)
+
+def test_rule_month_grid():
+    """Test month grids numbered by a rule."""
+    # The last row of December 2025 is ISO week 1 of 2026
+    assert get_month_grid(2025, 12, rule=get_rule('iso')).week_nums[-1] == 1
+    # The default rule gives the same grid as the widget's anchor
+    for month in range(1, 13):
+        assert build_month_grid(2012, month, rule=DEFAULT_RULE).week_nums == \
+            build_month_grid(2012, month, get_first_monday(2012)).week_nums
+
+def test_rule_week_numbers():
+    """Test the batch lookup against the scalar one."""
+    np = pytest.importorskip("numpy")
+    start = date(2019, 1, 1).toordinal()
+    ordinals = np.arange(start, start + 365 * 8)
+    for name in ('default', 'iso', '4-4-5', 'fiscal:10-01'):
+        rule = get_rule(name)
+        expected = [rule.week_number(date.fromordinal(int(o))) for o in ordinals]
+        assert rule.week_numbers(ordinals).tolist() == expected
+    assert get_rule().week_numbers(np.array([], dtype='datetime64[D]')).size == 0
+
+@pytest.mark.parametrize("name", ['default', 'iso', 'fiscal:04-01', 'fiscal:01-01', '4-4-5', '4-5-4:10-01'])
+def test_rules_at_date_limits(name):
+    """Test that every rule numbers the first and last weeks dates can have."""
+    rule = get_rule(name)
+    for first, last in ((date.min, date.min + timedelta(days=400)),
+                        (date.max - timedelta(days=400), date.max)):
+        previous = None
+        for ordinal in range(first.toordinal(), last.toordinal() + 1):
+            current_date = date.fromordinal(ordinal)
+            week = rule.fiscal_week(current_date)
+            if previous is not None and current_date.weekday() == 0:
+                # Weeks run on one at a time, or start a new year at week 1
+                assert (week.year, week.week) in ((previous.year, previous.week + 1), (week.year, 1))
+            elif previous is not None:
+                assert week.week == previous.week  # The default rule's year changes on Jan 1
+            previous = week
+            assert rule.first_date(week.year, week.week) <= current_date
+        assert build_month_grid(first.year, first.month, rule=rule).week_nums
+        assert build_month_grid(last.year, last.month, rule=rule).week_nums
+    # The fiscal year containing 9999-12-31 may start in 9999 but end in 10000
+    assert get_rule('fiscal:04-01').fiscal_week(date.max) == FiscalWeek(10000, 40)
+    assert get_rule('fiscal:04-01').fiscal_week(date.min) == FiscalWeek(1, 41)
+    with pytest.raises(ValueError):
+        rule.year_table(10000)
@@ -0,0 +1,79 @@
+import src.main
+from src.main import TABLE_AFTER_CALCULATIONS, _calculate_work_week_number, get_work_week_number
+from src.work_week_table import (TABLE_CACHE_SIZE, build_work_week_table, open_work_week_table,
+                                 get_work_week_table)
+from datetime import date, timedelta
+import pytest
+
+@pytest.fixture
+def no_tables(monkeypatch):
+    """Start get_work_week_number without tables or counts."""
+    monkeypatch.setattr(src.main, '_tables', type(src.main._tables)())
+    monkeypatch.setattr(src.main, '_calculations', {})
+    return src.main._tables
+
+def test_table_matches_direct_calculation():
+    """Test that every day in the table agrees with the direct calculation."""
+    first_monday = date(2024, 12, 30)
+    table = build_work_week_table(first_monday, 2020, 2030)
+    
+    assert table.first_date == date(2020, 1, 1)
+    assert table.last_date == date(2030, 12, 31)
+    
+    current_date = table.first_date
+    while current_date <= table.last_date:
+        assert table.lookup(current_date) == _calculate_work_week_number(current_date, first_monday)
+        current_date += timedelta(days=1)
+    
+    with pytest.raises(KeyError):
+        table.lookup(date(2031, 1, 1))
+
+def test_saved_table_is_memory_mapped(tmp_path):
+    """Test that a saved table reads back the same through mmap."""
+    first_monday = date(2024, 12, 30)
+    table = build_work_week_table(first_monday, 2024, 2026)
+    path = str(tmp_path / "ww.bin")
+    table.save(path)
+    
+    mapped = open_work_week_table(path)
+    assert mapped.start_date == first_monday
+    assert mapped.first_ordinal == table.first_ordinal
+    assert bytes(mapped.data) == table.data
+    assert mapped.lookup(date(2025, 12, 31)) == 1
+    
+    (tmp_path / "bad.bin").write_bytes(b"not a table at all, just some bytes")
+    with pytest.raises(ValueError):
+        open_work_week_table(str(tmp_path / "bad.bin"))
+
+def test_table_cache(tmp_path):
+    """Test that tables are shared per week and written to the table directory."""
+    # Any start date in the same week gives the same table
+    assert get_work_week_table(date(2025, 1, 1)) is get_work_week_table(date(2024, 12, 30))
+    
+    table = get_work_week_table(date(2025, 1, 1), 2025, 2025, table_dir=str(tmp_path))
+    assert len(list(tmp_path.iterdir())) == 1
+    assert table.lookup(date(2025, 3, 14)) == 11
+
+def test_get_work_week_number_uses_tables(no_tables):
+    """Test that start dates used often are answered from tables, inside and outside their span."""
+    first_monday = date(2024, 12, 30)
+    for i in range(TABLE_AFTER_CALCULATIONS - 1):
+        assert get_work_week_number(date(2025, 3, 14), first_monday) == 11
+    assert first_monday not in no_tables
+    assert get_work_week_number(date(2025, 12, 31), first_monday) == 1
+    assert first_monday in no_tables
+    for day in (date(1900, 1, 1), date(2025, 12, 31), date(2200, 12, 31), date(1899, 12, 31),
+                date(2300, 6, 1), date.min, date.max):
+        assert get_work_week_number(day, first_monday) == _calculate_work_week_number(day, first_monday)
+
+def test_table_lru(no_tables, tmp_path, monkeypatch):
+    """Test that only the most recently used start dates keep a table, shared through WW_TABLE_DIR."""
+    monkeypatch.setenv('WW_TABLE_DIR', str(tmp_path))
+    starts = [date(2000 + i, 1, 1) for i in range(TABLE_CACHE_SIZE + 2)]
+    for start in starts:
+        for _ in range(TABLE_AFTER_CALCULATIONS):
+            get_work_week_number(date(2025, 3, 14), start)
+        get_work_week_number(date(2025, 3, 14), starts[0])  # Keep using the first one
+    assert list(no_tables) == starts[3:] + [starts[0]]  # starts[1] and [2] were evicted
+    assert len(list(tmp_path.iterdir())) == len(starts)
+    assert isinstance(no_tables[starts[0]].data, memoryview)  # Mapped from the shared file
@@ -0,0 +1,89 @@
+from src.workers import WorkerPool
+import threading
+import time
+import pytest
+
+class Timers:
+    """Collects root.after calls; run() fires the due pump like the Tk main loop would."""
+    def __init__(self):
+        self.pending = {}
+        self.next_id = 0
+    
+    def after(self, ms, func, *args):
+        self.next_id += 1
+        self.pending[self.next_id] = (func, args)
+        return self.next_id
+    
+    def after_cancel(self, timer_id):
+        self.pending.pop(timer_id, None)
+    
+    def run_until_idle(self, timeout=5):
+        deadline = time.monotonic() + timeout
+        while self.pending and time.monotonic() < deadline:
+            time.sleep(0.005)
+            for timer_id in list(self.pending):
+                func, args = self.pending.pop(timer_id)
+                func(*args)
+
+@pytest.fixture
+def timers():
+    return Timers()
+
+def test_results_applied_by_pump(timers):
+    """Test that results are only applied when the pump runs, on the calling thread."""
+    pool = WorkerPool(timers.after, timers.after_cancel, workers=2)
+    applied = []
+    pool.submit(sum, [1, 2, 3], on_done=lambda result: applied.append((result, threading.get_ident())))
+    pool.submit(pow, 2, 10, on_done=lambda result: applied.append((result, threading.get_ident())))
+    assert len(timers.pending) == 1  # One pump timer for both jobs
+    assert applied == []
+    timers.run_until_idle()
+    assert sorted(applied) == [(6, threading.get_ident()), (1024, threading.get_ident())]
+    stats = pool.stats()
+    assert (stats['submitted'], stats['completed'], stats['queue_depth'], stats['max_queue_depth']) == (2, 2, 0, 2)
+    assert stats['latency_ms']['max'] >= stats['run_ms']['max'] >= 0
+    assert not timers.pending  # The pump stops once nothing is outstanding
+    pool.shutdown()
+
+def test_stale_jobs_cancelled(timers):
+    """Test that a newer job with the same key cancels queued and running ones."""
+    pool = WorkerPool(timers.after, timers.after_cancel, workers=1)
+    release = threading.Event()
+    applied = []
+    running = pool.submit(release.wait, 5, key='month', on_done=lambda _: applied.append('running'))
+    queued = pool.submit(str, 'queued', key='month', on_done=applied.append)
+    assert pool.is_pending('month')
+    latest = pool.submit(str, 'latest', key='month', on_done=applied.append)
+    release.set()
+    timers.run_until_idle()
+    assert applied == ['latest']
+    assert running.cancelled and queued.cancelled and queued.future.cancelled()
+    assert not pool.is_pending('month') and latest.future.done()
+    assert pool.stats()['cancelled'] == 2
+    assert not pool.cancel('month')
+    pool.shutdown()
+
+def test_errors_and_inline(timers):
+    """Test error reporting, and running jobs in place with workers=0."""
+    errors = []
+    pool = WorkerPool(timers.after, timers.after_cancel, workers=2)
+    pool.submit(int, 'x', on_error=errors.append)
+    timers.run_until_idle()
+    assert isinstance(errors[0], ValueError) and pool.stats()['failed'] == 1
+    pool.shutdown()
+    
+    inline = WorkerPool(timers.after, timers.after_cancel, workers=0)
+    results = []
+    inline.submit(sum, [4, 5], on_done=results.append)
+    inline.submit(int, 'y', on_error=errors.append)
+    assert results == [9] and len(errors) == 2 and not timers.pending
+
+def test_process_pool(timers):
+    """Test running jobs in worker processes."""
+    pool = WorkerPool(timers.after, timers.after_cancel, workers=1, processes=True)
+    results = []
+    pool.submit(sum, range(1000), on_done=results.append)
+    timers.run_until_idle(timeout=30)
+    assert results == [499500]
+    assert pool.stats()['run_ms']['max'] > 0
+    pool.shutdown()
@@ -0,0 +1,61 @@
+import pytest
+tk = pytest.importorskip("tkinter")
+
+from src.year_view import MONTHS_PER_ROW, ROW_HEIGHT, SCROLL_UNIT, YearView
+
+@pytest.fixture
+def view():
+    """Create a year view, skipping when no display is available."""
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        pytest.skip(f"No display available: {e}")
+    root.withdraw()
+    yield YearView(root)
+    root.destroy()
+
+def shown_months(view):
+    return sorted(block.month for slot in view.slots.values() for block in slot.blocks)
+
+def test_scroll_to(view):
+    """Test that the rows in view show consecutive months from the requested one."""
+    view.scroll_to(2025, 5)
+    months = shown_months(view)
+    assert months[0] == (2025, 4)  # The row holding May starts with April
+    assert len(months) == len(view.slots) * MONTHS_PER_ROW
+    assert view.canvas.itemcget(view.slots[min(view.slots)].blocks[0].title, 'text') == "April 2025"
+
+def test_scrolling_keeps_item_count(view):
+    """Test that scrolling across decades reuses the same canvas items."""
+    view.scroll_to(2000, 1)
+    view.scroll(ROW_HEIGHT // SCROLL_UNIT)
+    items = view.item_count()
+    for _ in range(40):
+        view.yview('scroll', 1, 'pages')
+    assert view.item_count() == items
+    assert shown_months(view)[0][0] > 2010
+    
+    view.yview('moveto', 0.0)
+    assert shown_months(view)[0] == (1900, 1)
+    view.yview('moveto', 1.0)
+    assert shown_months(view)[-1] == (2199, 12)
+    assert view.item_count() == items
+
+def test_month_cells(view):
+    """Test the cells drawn for a month, including hidden week rows."""
+    view.scroll_to(2021, 2)  # February 2021 starts on a Monday and spans 4 weeks
+    block = next(block for slot in view.slots.values() for block in slot.blocks
+                 if block.month == (2021, 2))
+    assert block.num_weeks == 4
+    ww_text, (rect, text) = block.week_items[0][0], block.week_items[0][1]
+    assert view.canvas.itemcget(ww_text, 'text') == "WW6"
+    assert view.canvas.itemcget(text, 'text') == "1"
+    assert view.canvas.itemcget(block.week_items[4][1][0], 'state') == 'hidden'
+
+def test_select_month(view):
+    """Test that clicking a month title reports the month."""
+    selected = []
+    view.on_select = lambda year, month: selected.append((year, month))
+    view.scroll_to(2025, 7)
+    view.select(view.slots[min(view.slots)].blocks[0])
+    assert selected == [(2025, 7)]